@@ -9,8 +9,24 @@ from inspyred.ec import terminators
 from inspyred.ec import evaluators
 import subprocess
 import pandas as pd
-from io import StringIO
 from multiprocessing import Pool
+from jvm_evaluation import CLASS_PATH, EvaluationServerPool
+from game_backend import driver_config, make_backend
+from farm import Broker
+from fitness_cache import FitnessCache, canonical_genome
+from tournament_results import parse_tournament_output
+from pairwise_results import PairwiseResults, swap_sides
+from worker_pool import MatchCostModel, WorkerPool
+from pairings import round_robin_pairings, sparse_pairings
+from rating import batched_elo_update, bradley_terry, score_matrices
+from math import log
+from checkpoint import (CheckpointObserver, ResumedEvaluator, cache_counters, load_checkpoint, restore_cache_counters,
+                        resume_state)
+from supervision import FailureTracker, SupervisionPolicy, run_java, supervised_call
+from seeding import match_seed, seed_arguments, seeded_payload
+from population import lexico_order, plus_replacement, rank_selection, save_population, to_array
+from results_log import ResultsLog
+import sys
 #end_imports
 
 class LexicoFitness(float):
@@ -60,60 +76,12 @@ class LexicoFitness(float):
         return f"({self.victorias}, {self.tiempo_victoria}, {self.tiempo_derrota})"
 
 
-def load_tournament_games_from_df(df):
-    """
-    Extrae los datos de partidas desde un DataFrame de torneo.
-    
-    Args:
-        df (pd.DataFrame): DataFrame completo del torneo
-        
-    Returns:
-        pd.DataFrame: DataFrame con solo los datos de las partidas
-        
-    Raises:
-        ValueError: Si no se encuentra la estructura esperada del DataFrame
-    """
-    # Convertir DataFrame a líneas de texto para procesar
-    lines = []
-    for index, row in df.iterrows():
-        # Convertir la fila a string, manejando valores NaN
-        row_str = '\t'.join(str(val) if pd.notna(val) else '' for val in row.values)
-        lines.append(row_str + '\n')
-    
-    # Buscar la línea de headers y el inicio de estadísticas
-    header_line_idx = None
-    stats_start_idx = None
-    
-    for i, line in enumerate(lines):
-        stripped_line = line.strip()
-        
-        # Buscar headers de columnas
-        if header_line_idx is None and all(col in line for col in ['iteration', 'map', 'ai1', 'ai2']):
-            header_line_idx = i
-        
-        # Buscar inicio de estadísticas
-        elif stripped_line == "Wins:":
-            stats_start_idx = i
-            break
-    
-    if header_line_idx is None:
-        raise ValueError("No se encontró la línea de headers en el DataFrame")
-    
-    # Extraer líneas de datos de partidas
-    end_idx = stats_start_idx if stats_start_idx else len(lines)
-    data_lines = lines[header_line_idx:end_idx]
-    
-    # Crear DataFrame optimizado
-    csv_content = ''.join(data_lines)
-    return pd.read_csv(StringIO(csv_content), sep='\t')
-
-
 def meantime_to_win(df_games, id_ia):
     """
     Calcula el tiempo medio de victoria de un agente específico.
     
     Args:
-        df_games: DataFrame con las partidas del torneo
+        df_games: partidas del torneo en columnas (ver tournament_results.parse_tournament_output)
         id_ia: ID del agente para el cual calcular el tiempo medio de victoria
         
     Returns:
@@ -121,16 +89,16 @@ def meantime_to_win(df_games, id_ia):
     """
     # Filtrar partidas donde el agente id_ia participa y gana
     # El agente puede estar como ai1 o ai2, y gana cuando winner coincide con su posición
-    victories = df_games[
+    victories = (
         ((df_games['ai1'] == id_ia) & (df_games['winner'] == 0)) |  # gana como ai1
         ((df_games['ai2'] == id_ia) & (df_games['winner'] == 1))    # gana como ai2
-    ]
+    )
     
-    if len(victories) == 0:
+    if not victories.any():
         return float('inf')  # No hay victorias
     
     # Calcular el tiempo medio de victoria
-    mean_victory_time = victories['time'].mean()
+    mean_victory_time = float(df_games['time'][victories].mean())
     
     return mean_victory_time
 
@@ -140,7 +108,7 @@ def meantime_to_lose(df_games, id_ia):
     Calcula el tiempo medio de derrota de un agente específico.
     
     Args:
-        df_games: DataFrame con las partidas del torneo
+        df_games: partidas del torneo en columnas (ver tournament_results.parse_tournament_output)
         id_ia: ID del agente para el cual calcular el tiempo medio de derrota
         
     Returns:
@@ -148,16 +116,16 @@ def meantime_to_lose(df_games, id_ia):
     """
     # Filtrar partidas donde el agente id_ia participa y pierde
     # El agente puede estar como ai1 o ai2, y pierde cuando winner NO coincide con su posición
-    defeats = df_games[
+    defeats = (
         ((df_games['ai1'] == id_ia) & (df_games['winner'] == 1)) |  # pierde como ai1
         ((df_games['ai2'] == id_ia) & (df_games['winner'] == 0))    # pierde como ai2
-    ]
+    )
     
-    if len(defeats) == 0:
+    if not defeats.any():
         return 0  # No hay derrotas
     
     # Calcular el tiempo medio de derrota
-    mean_defeat_time = defeats['time'].mean()
+    mean_defeat_time = float(df_games['time'][defeats].mean())
     
     return mean_defeat_time
 
@@ -167,7 +135,7 @@ def count_total_wins(df_games, id_ia):
     Calcula el número total de victorias de un agente específico.
     
     Args:
-        df_games: DataFrame con las partidas del torneo
+        df_games: partidas del torneo en columnas (ver tournament_results.parse_tournament_output)
         id_ia: ID del agente para el cual calcular las victorias totales
         
     Returns:
@@ -175,12 +143,12 @@ def count_total_wins(df_games, id_ia):
     """
     # Filtrar partidas donde el agente id_ia participa y gana
     # El agente puede estar como ai1 o ai2, y gana cuando winner coincide con su posición
-    victories = df_games[
+    victories = (
         ((df_games['ai1'] == id_ia) & (df_games['winner'] == 0)) |  # gana como ai1
         ((df_games['ai2'] == id_ia) & (df_games['winner'] == 1))    # gana como ai2
-    ]
+    )
     
-    return len(victories)
+    return int(victories.sum())
 
 
 def count_total_ties(df_games, id_ia):
@@ -188,7 +156,7 @@ def count_total_ties(df_games, id_ia):
     Calcula el número total de empates de un agente específico.
     
     Args:
-        df_games: DataFrame con las partidas del torneo
+        df_games: partidas del torneo en columnas (ver tournament_results.parse_tournament_output)
         id_ia: ID del agente para el cual calcular los empates totales
         
     Returns:
@@ -196,12 +164,12 @@ def count_total_ties(df_games, id_ia):
     """
     # Filtrar partidas donde el agente id_ia participa y hay empate (winner = -1 o 2)
     # Nota: Verificar en MicroRTS cómo se codifican los empates
-    ties = df_games[
+    ties = (
         ((df_games['ai1'] == id_ia) | (df_games['ai2'] == id_ia)) & 
         (df_games['winner'] == -1)  # Asumiendo que -1 indica empate
-    ]
+    )
     
-    return len(ties)
+    return int(ties.sum())
 
 
 def update_elo_ratings(elo_player1, elo_player2, result, k_factor=32):
@@ -241,79 +209,311 @@ def generate_agent(random, args):
     return agent
 
 
+def match_result(i, j, games, summary):
+    """
+    Calcula el resultado de un enfrentamiento a partir de los registros del torneo 1vs1.
+    
+    Args:
+        i, j: índices de los agentes en el torneo de la generación
+        games (dict): partidas del torneo CoEvEvaluationGame en columnas de NumPy
+        summary (dict): resumen del torneo (None si no llegó a terminar)
+        
+    Returns:
+        dict: resultado del enfrentamiento con victorias, empates y tiempos
+    """
+    # Sin resumen el torneo no terminó: el enfrentamiento se da por fallido
+    if summary is None:
+        return failed_match_result(i, j)
+
+    # Contar victorias y empates para ambos agentes en este enfrentamiento
+    wins_i = count_total_wins(games, 0)  # AI i juega como AI 0 en el torneo
+    wins_j = count_total_wins(games, 1)  # AI j juega como AI 1 en el torneo
+    ties_i = count_total_ties(games, 0)
+    ties_j = count_total_ties(games, 1)
+    
+    # Calcular tiempos de victoria y derrota
+    victory_time_i = meantime_to_win(games, 0)
+    defeat_time_i = meantime_to_lose(games, 0)
+    victory_time_j = meantime_to_win(games, 1)
+    defeat_time_j = meantime_to_lose(games, 1)
+    
+    return {
+        'i': i, 'j': j,
+        'wins_i': wins_i, 'wins_j': wins_j,
+        'ties_i': ties_i, 'ties_j': ties_j,
+        'victory_time_i': victory_time_i, 'defeat_time_i': defeat_time_i,
+        'victory_time_j': victory_time_j, 'defeat_time_j': defeat_time_j,
+        'success': True
+    }
+
+
+def failed_match_result(i, j):
+    """Resultado vacío para un enfrentamiento que no se pudo completar."""
+    return {
+        'i': i, 'j': j,
+        'wins_i': 0, 'wins_j': 0,
+        'ties_i': 0, 'ties_j': 0,
+        'victory_time_i': float('inf'), 'defeat_time_i': 0,
+        'victory_time_j': float('inf'), 'defeat_time_j': 0,
+        'success': False
+    }
+
+
 def play_match(args):
     """
     Ejecuta un enfrentamiento individual entre dos agentes.
     
     Args:
-        args: tupla (i, j, agent_i, agent_j, class_path, folder_name)
+        args: tupla (i, j, agent_i, agent_j, class_path, folder_name[, policy[, seed]]); con una
+            SupervisionPolicy el enfrentamiento tiene límite de tiempo (evaluation_timeout) y
+            reintentos, y el resultado lleva sus contadores en 'supervision'; con una semilla
+            los dos MyAgent juegan de forma reproducible (ver seeding.py)
         
     Returns:
         dict: resultado del enfrentamiento con victorias, empates y tiempos
     """
-    i, j, agent_i, agent_j, class_path, folder_name = args
+    i, j, agent_i, agent_j, class_path, folder_name = args[:6]
+    policy = args[6] if len(args) > 6 else None
+    seed = args[7] if len(args) > 7 else None
     
     # print(f"Ejecutando: AI {i} vs AI {j} -> {folder_name}")
     
-    # Generar nombre único para el archivo usando solo timestamp y enfrentamiento
-    timestamp = int(time() * 1000000)
-    unique_filename = f"./resultados/{folder_name}/tournament_{i}vs{j}_{timestamp}.csv"
-    
-    # Preparar parámetros para el torneo 1vs1 (21 parámetros total)
-    game_params = agent_i + agent_j + [unique_filename]  # 10 + 10 + 1 = 21 parámetros
+    # Preparar parámetros para el torneo 1vs1; con "-" los resultados se emiten por stdout
+    game_params = agent_i + agent_j + ['-']
+    command = ['java', '-cp', class_path, 'tournament.CoEvEvaluationGame'] + [str(param) for param in game_params] + \
+        seed_arguments(seed)
+    if policy is not None:
+        parsed, outcome = supervised_call(lambda: parse_tournament_output(run_java(command, policy.evaluation_timeout)),
+                                          accept=lambda parsed: parsed[1] is not None,
+                                          retries=policy.retries, backoff=policy.backoff)
+        result = match_result(i, j, *parsed) if parsed is not None else failed_match_result(i, j)
+        result['supervision'] = outcome
+        return result
     
     # Ejecutar CoEvEvaluationGame
-    result_file = subprocess.run(['java', '-cp', class_path, 'tournament.CoEvEvaluationGame'] + 
-                               [str(param) for param in game_params], 
-                               capture_output=True, text=True)
+    result = subprocess.run(command, capture_output=True, text=True)
     
     try:
-        # Procesar resultado del torneo 1vs1 - leer desde archivo
-        df = pd.read_csv(unique_filename)
-        # Eliminar archivo temporal después de leerlo
-        os.remove(unique_filename)
-        
-        games_df = load_tournament_games_from_df(df)
-        
-        # Contar victorias y empates para ambos agentes en este enfrentamiento
-        wins_i = count_total_wins(games_df, 0)  # AI i juega como AI 0 en el torneo
-        wins_j = count_total_wins(games_df, 1)  # AI j juega como AI 1 en el torneo
-        ties_i = count_total_ties(games_df, 0)
-        ties_j = count_total_ties(games_df, 1)
-        
-        # Calcular tiempos de victoria y derrota
-        victory_time_i = meantime_to_win(games_df, 0)
-        defeat_time_i = meantime_to_lose(games_df, 0)
-        victory_time_j = meantime_to_win(games_df, 1)
-        defeat_time_j = meantime_to_lose(games_df, 1)
-        
-        return {
-            'i': i, 'j': j,
-            'wins_i': wins_i, 'wins_j': wins_j,
-            'ties_i': ties_i, 'ties_j': ties_j,
-            'victory_time_i': victory_time_i, 'defeat_time_i': defeat_time_i,
-            'victory_time_j': victory_time_j, 'defeat_time_j': defeat_time_j,
-            'success': True
-        }
+        # Procesar resultado del torneo 1vs1 directamente desde el canal de registros
+        return match_result(i, j, *parse_tournament_output(result.stdout))
     except Exception as e:
         # print(f"Error en enfrentamiento AI {i} vs AI {j}: {e}")
-        return {
-            'i': i, 'j': j,
-            'wins_i': 0, 'wins_j': 0,
-            'ties_i': 0, 'ties_j': 0,
-            'victory_time_i': float('inf'), 'defeat_time_i': 0,
-            'victory_time_j': float('inf'), 'defeat_time_j': 0,
-            'success': False
-        }
+        return failed_match_result(i, j)
+
+
+def play_match_server(match, evaluation_server):
+    """
+    Ejecuta un enfrentamiento en una de las JVM persistentes del EvaluationServerPool.
+    
+    Args:
+        match: tupla (i, j, agent_i, agent_j, class_path, folder_name[, policy[, seed]]) como en play_match
+        evaluation_server (EvaluationServerPool): JVMs persistentes del experimento
+        
+    Returns:
+        dict: resultado del enfrentamiento con victorias, empates y tiempos
+    """
+    i, j, agent_i, agent_j = match[:4]
+    policy = match[6] if len(match) > 6 else None
+    payload = seeded_payload({'type': 'match',
+                              'agent1': [str(param) for param in agent_i],
+                              'agent2': [str(param) for param in agent_j]},
+                             match[7] if len(match) > 7 else None)
+    if policy is not None:
+        parsed, outcome = supervised_call(
+            lambda: parse_tournament_output(evaluation_server.request(payload, policy.evaluation_timeout)['records']),
+            accept=lambda parsed: parsed[1] is not None, retries=policy.retries, backoff=policy.backoff)
+        result = match_result(i, j, *parsed) if parsed is not None else failed_match_result(i, j)
+        result['supervision'] = outcome
+        return result
+    try:
+        response = evaluation_server.request(payload)
+        return match_result(i, j, *parse_tournament_output(response['records']))
+    except Exception as e:
+        return failed_match_result(i, j)
+
+
+def timed_play_match_server(match, evaluation_server):
+    """play_match_server que devuelve también la duración del enfrentamiento en segundos."""
+    start = time()
+    result = play_match_server(match, evaluation_server)
+    return result, time() - start
+
+
+def match_cache_key(agent_i, agent_j):
+    """
+    Genomas en orden canónico para la caché de enfrentamientos.
+    
+    Returns:
+        tuple: (genomas ordenados, True si el orden es el inverso de (agent_i, agent_j))
+    """
+    swapped = canonical_genome(agent_j) < canonical_genome(agent_i)
+    return ([agent_j, agent_i] if swapped else [agent_i, agent_j]), swapped
+
+
+def run_matches(matches, args, mp_processes):
+    """
+    Ejecuta en paralelo la lista de enfrentamientos.
+    
+    Si args contiene una FitnessCache ('fitness_cache') los enfrentamientos ya jugados
+    entre los mismos genomas se toman de ella sin lanzar partidas. Los demás se ejecutan
+    en las JVM persistentes de args['evaluation_server'] si existe o, si no, en el
+    WorkerPool del experimento (args['worker_pool']) o en un Pool de procesos que lanza
+    un java por enfrentamiento. Con args['match_cost_model'] los enfrentamientos se
+    envían de mayor a menor duración esperada y se registra lo que tardó cada uno.
+    
+    Returns:
+        list: resultados de play_match en el mismo orden que matches
+    """
+    fitness_cache = args.get('fitness_cache') if args else None
+    failure_tracker = args.get('failure_tracker') if args else None
+    results = [None] * len(matches)
+    pending = []
+    for idx, match in enumerate(matches):
+        # Los enfrentamientos con genomas en cuarentena no se juegan
+        if failure_tracker is not None and failure_tracker.is_quarantined(match[2], match[3]):
+            failure_tracker.skip()
+            results[idx] = failed_match_result(match[0], match[1])
+            continue
+        if fitness_cache is not None:
+            i, j, agent_i, agent_j = match[:4]
+            genomes, swapped = match_cache_key(agent_i, agent_j)
+            cached = fitness_cache.get('match', genomes)
+            if cached is not None:
+                result = swap_sides(cached) if swapped else cached
+                result.update({'i': i, 'j': j, 'success': True})
+                results[idx] = result
+                continue
+        pending.append(idx)
+
+    pending_matches = [matches[idx] for idx in pending]
+    evaluation_server = args.get('evaluation_server') if args else None
+    worker_pool = args.get('worker_pool') if args else None
+    cost_model = args.get('match_cost_model') if args else None
+    costs = [cost_model.estimate(match[2], match[3]) for match in pending_matches] if cost_model else None
+    durations = None
+    if evaluation_server is not None:
+        order = sorted(range(len(pending_matches)), key=lambda k: costs[k], reverse=True) if costs else \
+            range(len(pending_matches))
+        timed = evaluation_server.map(lambda k: timed_play_match_server(pending_matches[k], evaluation_server), order)
+        played = [None] * len(pending_matches)
+        durations = [0.0] * len(pending_matches)
+        for k, (result, duration) in zip(order, timed):
+            played[k], durations[k] = result, duration
+    elif worker_pool is not None:
+        played, durations = worker_pool.map(play_match, pending_matches, costs)
+    elif pending_matches:
+        with Pool(processes=mp_processes) as pool:
+            played = pool.map(play_match, pending_matches)
+    else:
+        played = []
+
+    if cost_model is not None and durations is not None:
+        for match, result, duration in zip(pending_matches, played, durations):
+            if result['success']:
+                cost_model.update(match[2], match[3], duration)
+
+    for idx, result in zip(pending, played):
+        outcome = result.pop('supervision', None)
+        if failure_tracker is not None:
+            failure_tracker.record(matches[idx][2:4], outcome, not result['success'])
+        results[idx] = result
+        if fitness_cache is not None and result['success']:
+            genomes, swapped = match_cache_key(matches[idx][2], matches[idx][3])
+            stored = {key: value for key, value in result.items() if key not in ('i', 'j', 'success')}
+            fitness_cache.put('match', genomes, swap_sides(stored) if swapped else stored)
+
+    return results
+
+
+def collect_match_results(all_candidates, pairs, args, mp_processes, class_path, folder_name):
+    """
+    Resultados de los enfrentamientos (i, j) de pairs entre all_candidates.
+    
+    Con una PairwiseResults en args['pairwise_results'] solo se juegan las parejas de
+    genomas que aún no están en la matriz (las que incluyen algún genoma nuevo); el resto
+    se reutiliza. Sin ella se juegan todas, como antes.
+    
+    Returns:
+        list: resultados de play_match en el mismo orden que pairs
+    """
+    pairwise_results = args.get('pairwise_results') if args else None
+    policy = args.get('supervision') if args else None
+    base_seed = args.get('game_seed') if args else None
+
+    def match(i, j):
+        return (i, j, all_candidates[i], all_candidates[j], class_path, folder_name, policy,
+                match_seed(base_seed, all_candidates[i], all_candidates[j]))
+
+    if pairwise_results is None:
+        matches = [match(i, j) for i, j in pairs]
+        return run_matches(matches, args, mp_processes)
+
+    to_play = pairwise_results.missing_pairs(all_candidates, pairs)
+    matches = [match(i, j) for i, j in to_play]
+    played = run_matches(matches, args, mp_processes)
+
+    failed = {}
+    for match, result in zip(matches, played):
+        pairwise_results.put(match[2], match[3], result)
+        if not result['success']:
+            failed[(result['i'], result['j'])] = result
+    pairwise_results.played += len(matches)
+    pairwise_results.reused += len(pairs) - len(matches)
+
+    results = []
+    for i, j in pairs:
+        result = pairwise_results.get(i, j, all_candidates[i], all_candidates[j])
+        results.append(result if result is not None else failed.get((i, j), failed_match_result(i, j)))
+    return results
+
+
+def schedule_pairs(all_candidates, ratings, args, scale=None):
+    """
+    Parejas (i, j) que se tienen en cuenta en el torneo de esta generación.
+    
+    Con args['pairing'] == 'round_robin' (por defecto) son todas. Con un esquema disperso
+    ('swiss', 'k_random', 'active') son las parejas ya jugadas que están en la matriz de
+    resultados (no cuestan nada) más, como mucho, args['match_budget'] parejas nuevas
+    elegidas por el esquema.
+    
+    Args:
+        all_candidates (list): genomas de padres + hijos
+        ratings (list): rating actual de cada agente
+        args (dict): argumentos de la evolución
+        scale (float): escala del modelo logístico del esquema 'active'
+    
+    Returns:
+        list: parejas (i, j) con i < j
+    """
+    nAIs = len(all_candidates)
+    pairing = args.get('pairing', 'round_robin') if args else 'round_robin'
+    if pairing == 'round_robin':
+        return round_robin_pairings(nAIs)
+
+    pairwise_results = args.get('pairwise_results')
+    known = []
+    if pairwise_results is not None:
+        known = [(i, j) for i, j in round_robin_pairings(nAIs)
+                 if (all_candidates[i], all_candidates[j]) in pairwise_results]
+    counts = [0] * nAIs
+    for i, j in known:
+        counts[i] += 1
+        counts[j] += 1
+
+    new_pairs = sparse_pairings(pairing, ratings, args['_ec']._random, budget=args.get('match_budget'),
+                                k=args.get('pairing_k', 4), counts=counts, exclude=known, scale=scale)
+    return known + new_pairs
+
+
+# Con supervisión, fracción mínima de sus enfrentamientos programados que ha de terminar un
+# agente; por debajo recibe el fitness de evaluación fallida en lugar de extrapolar los pocos
+# resultados que tiene (un genoma que tumba la JVM no debe salir beneficiado)
+MIN_PLAYED_FRACTION = 0.5
 
 
 def evaluate_agents(candidates, args=None):
     fitness = []
-    class_path = 'bin/' +\
-      ':lib/hamcrest-all-1.3.jar:' +\
-      'lib/jdom.jar:lib/junit-4.12.jar:' +\
-      'lib/minimal-json-0.9.4.jar:lib/weka.jar:' +\
-      'lib/MicroRTS.jar'
+    class_path = CLASS_PATH
     
     # Obtener el nombre de la carpeta desde args
     folder_name = args.get('folder_name', 'CoEvGA') if args else 'CoEvGA'
@@ -334,23 +534,35 @@ def evaluate_agents(candidates, args=None):
     all_candidates = parent_candidates + candidates
     nAIs = len(all_candidates)
 
+    # Las parejas con genomas que ya no están en la población no se volverán a usar
+    if args and args.get('pairwise_results') is not None:
+        args['pairwise_results'].retain(all_candidates)
+    if args and args.get('match_cost_model') is not None:
+        args['match_cost_model'].retain(all_candidates)
+
     # Inicializar fitness acumulado para cada agente (padres + nuevos)
     accumulated_wins = [0] * nAIs
     accumulated_ties = [0] * nAIs
     victory_times = [[] for _ in range(nAIs)]
     defeat_times = [[] for _ in range(nAIs)]
     
-    # Preparar lista de enfrentamientos
-    matches = []
-    for i in range(nAIs):
-        for j in range(i + 1, nAIs):  # Solo desde i+1 para evitar duplicados
-            matches.append((i, j, all_candidates[i], all_candidates[j], class_path, folder_name))
+    # Preparar lista de enfrentamientos (todas las parejas, o un subconjunto con emparejamiento disperso)
+    sparse = args is not None and args.get('pairing', 'round_robin') != 'round_robin'
+    supervised = args is not None and args.get('supervision') is not None
+    ratings = [float(p.fitness) if p.fitness is not None else 0.0 for p in parents]
+    mean_rating = sum(ratings) / len(ratings) if ratings else 0.0
+    ratings += [mean_rating] * len(candidates)
+    pairs = schedule_pairs(all_candidates, ratings, args)
+    matches_scheduled = [0] * nAIs
+    for i, j in pairs:
+        matches_scheduled[i] += 1
+        matches_scheduled[j] += 1
+    matches_played = [0] * nAIs
     
-    # print(f"Ejecutando {len(matches)} enfrentamientos en paralelo...")
+    # print(f"Ejecutando {len(pairs)} enfrentamientos en paralelo...")
     
-    # Paralelización de enfrentamientos
-    with Pool(processes=mp_processes) as pool:
-        results = pool.map(play_match, matches)
+    # Paralelización de enfrentamientos (solo los que no están ya en la matriz de resultados)
+    results = collect_match_results(all_candidates, pairs, args, mp_processes, class_path, folder_name)
     
     # Procesar resultados de todos los enfrentamientos
     for result in results:
@@ -362,6 +574,8 @@ def evaluate_agents(candidates, args=None):
             accumulated_wins[j] += result['wins_j']
             accumulated_ties[i] += result['ties_i']
             accumulated_ties[j] += result['ties_j']
+            matches_played[i] += 1
+            matches_played[j] += 1
             
             # Acumular tiempos
             if result['victory_time_i'] != float('inf'):
@@ -384,6 +598,16 @@ def evaluate_agents(candidates, args=None):
         total_wins = accumulated_wins[id_ia]
         total_ties = accumulated_ties[id_ia]
         ind_fitness = total_wins + (total_ties * 0.5)
+        if supervised and matches_played[id_ia] < MIN_PLAYED_FRACTION * matches_scheduled[id_ia]:
+            all_fitness.append(LexicoFitness(0, float('inf'), 0))
+            print(f"AI {id_ia} FINAL: {matches_played[id_ia]}/{matches_scheduled[id_ia]} enfrentamientos "
+                  f"terminados, evaluación fallida")
+            continue
+        if sparse and matches_played[id_ia]:
+            # Con emparejamiento disperso cada agente juega un número distinto de enfrentamientos:
+            # se escala la media por enfrentamiento al total de un round-robin completo para poder
+            # compararlos (sin él, los enfrentamientos fallidos cuentan como 0, como siempre)
+            ind_fitness = ind_fitness / matches_played[id_ia] * (nAIs - 1)
         
         # Calcular tiempos medios
         avg_victory_time = sum(victory_times[id_ia]) / len(victory_times[id_ia]) if victory_times[id_ia] else float('inf')
@@ -411,11 +635,7 @@ def evaluate_agents(candidates, args=None):
 
 
 def evaluate_agents_elo(candidates, args=None):
-    class_path = 'bin/' +\
-      ':lib/hamcrest-all-1.3.jar:' +\
-      'lib/jdom.jar:lib/junit-4.12.jar:' +\
-      'lib/minimal-json-0.9.4.jar:lib/weka.jar:' +\
-      'lib/MicroRTS.jar'
+    class_path = CLASS_PATH
     
     # Obtener el nombre de la carpeta desde args
     folder_name = args.get('folder_name', 'CoEvELO') if args else 'CoEvELO'
@@ -435,6 +655,12 @@ def evaluate_agents_elo(candidates, args=None):
     # Combinar padres y nuevos candidatos para el torneo
     all_candidates = parent_candidates + candidates
     nAIs = len(all_candidates)
+
+    # Las parejas con genomas que ya no están en la población no se volverán a usar
+    if args and args.get('pairwise_results') is not None:
+        args['pairwise_results'].retain(all_candidates)
+    if args and args.get('match_cost_model') is not None:
+        args['match_cost_model'].retain(all_candidates)
     
     # Inicializar ratings ELO: padres con su fitness actual, nuevos con 1200
     elo_ratings = []
@@ -447,8 +673,12 @@ def evaluate_agents_elo(candidates, args=None):
             # Nuevos candidatos empiezan con 1200
             elo_ratings.append(1200.0)
     
-    # Generar TODOS los emparejamientos de TODAS las rondas de una vez
-    all_rounds = generate_all_round_pairings(nAIs)
+    # Generar TODOS los emparejamientos de TODAS las rondas de una vez; con emparejamiento
+    # disperso, las parejas elegidas forman una única ronda
+    if args and args.get('pairing', 'round_robin') != 'round_robin':
+        all_rounds = [schedule_pairs(all_candidates, elo_ratings, args, scale=400 / log(10))]
+    else:
+        all_rounds = generate_all_round_pairings(nAIs)
     num_rounds = len(all_rounds)
     
     # Obtener todos los enfrentamientos únicos
@@ -461,13 +691,9 @@ def evaluate_agents_elo(candidates, args=None):
     # print(f"Ejecutando TODOS los {total_matches} enfrentamientos únicos en paralelo...")
     
     # ===== FASE 1: EJECUTAR TODOS LOS ENFRENTAMIENTOS =====
-    all_matches = []
-    for i, j in all_unique_matches:
-        all_matches.append((i, j, all_candidates[i], all_candidates[j], class_path, folder_name))
-    
-    # Ejecutar TODOS los enfrentamientos en paralelo de una sola vez
-    with Pool(processes=mp_processes) as pool:
-        all_results = pool.map(play_match, all_matches)
+    # Ejecutar en paralelo de una sola vez los que no están ya en la matriz de resultados
+    all_results = collect_match_results(all_candidates, list(all_unique_matches), args, mp_processes,
+                                        class_path, folder_name)
     
     # Crear matriz de resultados para acceso rápido
     results_matrix = {}
@@ -478,7 +704,30 @@ def evaluate_agents_elo(candidates, args=None):
     
     # print(f"Completados todos los enfrentamientos. Simulando torneo por rondas...")
     
-    # ===== FASE 2: SIMULAR TORNEO RONDA POR RONDA =====
+    # ===== FASE 2: CALCULAR LOS RATINGS =====
+    rating_solver = args.get('rating_solver', 'sequential') if args else 'sequential'
+    if rating_solver == 'bradley_terry':
+        # Ajuste global sobre todos los resultados de la generación (incluidos los reutilizados)
+        score, games = score_matrices(nAIs, all_results)
+        ratings, errors = bradley_terry(score, games)
+        elo_ratings = [float(rating) for rating in ratings]
+        args['rating_errors'] = [float(error) for error in errors]
+        all_rounds = []
+    elif rating_solver == 'batched':
+        # Cada ronda se aplica como un lote: el resultado no depende del orden dentro de la ronda
+        for round_matches in all_rounds:
+            batch = [(i, j) for i, j in round_matches
+                     if results_matrix[(min(i, j), max(i, j))]['success']]
+            scores = []
+            for i, j in batch:
+                result = results_matrix[(min(i, j), max(i, j))]
+                total_games = result['wins_i'] + result['wins_j'] + result['ties_i']
+                scores.append((result['wins_i'] + 0.5 * result['ties_i']) / total_games if total_games else 0.5)
+            if batch:
+                elo_ratings = [float(rating) for rating in batched_elo_update(elo_ratings, batch, scores)]
+        all_rounds = []
+
+    # Por defecto ('sequential'): simular el torneo ronda por ronda
     for round_num, round_matches in enumerate(all_rounds):
         print(f"\n--- RONDA {round_num + 1}/{num_rounds} ---")
         print(f"Procesando {len(round_matches)} enfrentamientos de la ronda {round_num + 1}...")
@@ -527,7 +776,10 @@ def evaluate_agents_elo(candidates, args=None):
     final_ranking = sorted(enumerate(elo_ratings), key=lambda x: x[1], reverse=True)
     print("Ranking final:")
     for pos, (agent_id, elo) in enumerate(final_ranking, 1):
-        print(f"  {pos}. AI {agent_id}: {elo:.1f}")
+        if rating_solver == 'bradley_terry':
+            print(f"  {pos}. AI {agent_id}: {elo:.1f} ± {args['rating_errors'][agent_id]:.1f}")
+        else:
+            print(f"  {pos}. AI {agent_id}: {elo:.1f}")
     
     # Actualizar fitness de los padres y retornar fitness de nuevos candidatos
     fitness = []
@@ -610,89 +862,299 @@ def my_uniform_mutation_variator(random, candidates, args):
         mutants.append(mutant)
     return mutants
 
-def run_coev_experiment(use_elo_evaluation=True, generations=50, pop_size=10, mp_processes=32):
-    # Generar y guardar la seed para replicabilidad
-    seed_value = int(time())
+def run_coev_experiment(use_elo_evaluation=True, generations=50, pop_size=10, mp_processes=32, use_jvm_server=False,
+                        fitness_cache_path=None, reuse_match_results=True, pairing='round_robin', match_budget=None,
+                        pairing_k=4, rating_solver='sequential', supervision=None, farm=None, game_backend=None,
+                        array_population=False, game_seed=None, results_log=False, text_results=True, resume=None):
+    # Parámetros del experimento: se guardan en el checkpoint para reanudarlo con la misma configuración
+    experiment = dict(use_elo_evaluation=use_elo_evaluation, generations=generations, pop_size=pop_size,
+                      mp_processes=mp_processes, use_jvm_server=use_jvm_server, fitness_cache_path=fitness_cache_path,
+                      reuse_match_results=reuse_match_results, pairing=pairing, match_budget=match_budget,
+                      pairing_k=pairing_k, rating_solver=rating_solver, supervision=supervision, farm=farm,
+                      game_backend=game_backend, array_population=array_population, game_seed=game_seed,
+                      results_log=results_log, text_results=text_results)
+
+    # Al reanudar (resume = carpeta de resultados) se conservan la seed, la carpeta y el estado del Random
+    checkpoint = load_checkpoint(resume) if resume is not None else None
+
+    # Generar y guardar la seed para replicabilidad (con game_seed el experimento entero es reproducible)
+    seed_value = (int(time()) if game_seed is None else game_seed) if checkpoint is None else checkpoint['settings']['seed']
     rand = Random()
     rand.seed(seed_value)
+    if checkpoint is not None:
+        rand.setstate(checkpoint['random_state'])
     ea = ec.GA(rand)
     ea.selector = ec.selectors.rank_selection
     ea.terminator = [terminators.evaluation_termination, terminators.time_termination]
     ea.observer = ec.observers.file_observer
     ea.replacer = ec.replacers.plus_replacement 
     ea.variator = [ec.variators.uniform_crossover, my_uniform_mutation_variator]
+    # Con array_population la selección y el reemplazo ordenan la población con np.lexsort (ver population.py)
+    if array_population:
+        ea.selector = rank_selection
+        ea.replacer = plus_replacement
 
     # Configuración del experimento
     evaluation_type = "ELO" if use_elo_evaluation else "GA"
     evaluator_function = evaluate_agents_elo if use_elo_evaluation else evaluate_agents
 
     # Crear carpeta única para esta ejecución
-    timestamp = datetime.now().strftime("%m%d%Y-%H%M%S")
+    timestamp = datetime.now().strftime("%m%d%Y-%H%M%S") if checkpoint is None else checkpoint['settings']['timestamp']
     folder_name = f"CoEv{evaluation_type}_{timestamp}"
     results_folder = f"./resultados/{folder_name}"
     os.makedirs(results_folder, exist_ok=True)
 
+    # Con results_log la población de cada generación se añade a un registro binario (ver
+    # results_log.py; el ELO o las victorias van en 'victorias'); con text_results=False no se
+    # escriben además los inspyred-statistics-file e inspyred-individuals-file
+    if not text_results and not results_log:
+        raise ValueError("text_results=False necesita results_log para guardar los resultados")
+    results_logger = None
+    if results_log:
+        results_logger = ResultsLog(f"{results_folder}/results-log-{timestamp}.bin",
+                                    after_generation=checkpoint['num_generations'] if checkpoint is not None else None)
+
     evaluations = pop_size * generations
 
-    inicio = time()
+    # Con use_jvm_server los enfrentamientos se ejecutan en JVMs persistentes
+    evaluation_server = None
+    if use_jvm_server:
+        evaluation_server = EvaluationServerPool(mp_processes)
+    # Con farm ('host:puerto') los enfrentamientos van a los trabajadores de farm.py conectados al broker
+    if farm is not None:
+        evaluation_server = Broker.from_address(farm)
+    # Con game_backend ('replay' u otro objeto con la interfaz de EvaluationServerPool) los
+    # enfrentamientos no los juega MicroRTS (ver game_backend.py)
+    if game_backend is not None:
+        evaluation_server = make_backend(game_backend, mp_processes)
+    if evaluation_server is not None:
+        evaluation_server.start()
+
+    # Configuración del enfrentamiento (mapas, iteraciones): contexto de la caché y del modelo de coste
+    match_config = driver_config('CoEvEvaluationGame', evaluation_server)
+    if game_seed is not None:
+        # Enfrentamientos con semilla (ver seeding.py): la caché no los mezcla con los que no la llevan
+        match_config = dict(match_config, game_seed=game_seed)
+
+    # Caché de resultados de enfrentamientos compartida entre generaciones y ejecuciones
+    fitness_cache = None
+    if fitness_cache_path is not None:
+        fitness_cache = FitnessCache(fitness_cache_path, match_config)
+
+    # Matriz de resultados por pareja de genomas: los enfrentamientos entre padres no se repiten
+    pairwise_results = PairwiseResults() if reuse_match_results else None
+
+    # Sin JVM persistentes, un único Pool para todo el experimento; en ambos casos los
+    # enfrentamientos se envían de mayor a menor duración esperada
+    match_cost_model = MatchCostModel(match_config['maps'], games_per_map=match_config['iterations'] * 2)
+    worker_pool = None
+    if evaluation_server is None:
+        worker_pool = WorkerPool(mp_processes, log_path=f"{results_folder}/worker-pool-log-{timestamp}.csv")
+
+    # Con supervision (SupervisionPolicy) cada enfrentamiento tiene límite de tiempo y reintentos; los
+    # fallos se contabilizan por generación y los genomas que fallan contra varios rivales quedan en cuarentena
+    failure_tracker = None
+    if supervision is not None:
+        if checkpoint is not None and 'failure_tracker' in checkpoint['extra']:
+            failure_tracker = checkpoint['extra']['failure_tracker']
+        else:
+            failure_tracker = FailureTracker(supervision.quarantine_after,
+                                             report_path=f"{results_folder}/failure-report-{timestamp}.csv")
+
+    # Checkpoint atómico en cada generación (población, Random, contadores, tiempo, matriz de resultados y caché)
+    def extra_state():
+        extra = {}
+        if pairwise_results is not None:
+            extra['pairwise_results'] = pairwise_results
+        extra['match_cost_model'] = match_cost_model
+        if fitness_cache is not None:
+            extra['cache_counters'] = cache_counters(fitness_cache)
+        if failure_tracker is not None:
+            extra['failure_tracker'] = failure_tracker
+        return extra
+
+    seeds = [
+        # agentes GABotsLit
+        [0.8236764429411386, 0.3421385248489114, 0.03804993858450434, 5, 12, 0.6771749205448041, 0.10525102343194481, 0.9302053416800453, 0.4498789212944384, 0.44761875467539647, "GABotsLit"],
+        [0.12297458178514886, 0.6892306869658429, 0.7148493268065897, 6, 14, 0.8592884890421564, 0.5742506862351809, 0.5004585268846088, 0.4516465027404083, 0.016439674148995054, "GABotsLit"],
+        [0.2852493952791957, 0.030117081355244824, 0.5725553409674055, 6, 17, 0.2861725587415407, 0.9271914077457131, 0.2664893851232498, 0.5158698667832745, 0.30820488364743004, "GABotsLit"],
+        [0.24828854117733912, 0.8999707242482075, 0.7263712750326307, 1, 19, 0.8089887021281921, 0.44300790338559803, 0.5108326262050714, 0.226295668792857, 0.9835853623793082, "GABotsLit"],
+        [0.965954342890369, 0.4145858805797874, 0.5024027405763758, 8, 17, 0.6860722488962545, 0.9487061328399283, 0.03804765977886704, 0.11268153953011151, 0.20435247897995978, "GABotsLit"],
+        # agentes CoEvELO
+        [0.16846696454019505, 0.9633468064642499, 0.789097289541181, 2, 19, 0.8795128759915216, 0.9204724802858336, 0.3887979788155116, 0.8242883235207035, 0.6129754483818649, "CoEvELO"],
+        [0.956636271863732, 0.2579380498672741, 0.6393568712921733, 7, 17, 0.023178269925433037, 0.1866656204511874, 0.8990435733515699, 0.6637621419651777, 0.7502877068361935, "CoEvELO"],
+        [0.8466639164968095, 0.2786706656361061, 0.030620401970831934, 7, 18, 0.0600575737756297, 0.8293527663885787, 0.5109352989009032, 0.7824192308453812, 0.5438145140559759, "CoEvELO"],
+        [0.9291443488886724, 0.7502030751695131, 0.7437527057678102, 2, 2, 0.511100935792232, 0.7213028361032197, 0.5590256083711386, 0.2615184431104183, 0.7774327843360552, "CoEvELO"],
+        [0.10373467819859672, 0.961272247785899, 0.8833467825088809, 6, 7, 0.3245942883610985, 0.9685604724645657, 0.6039455496315845, 0.13132116016646456, 0.6308930758328315, "CoEvELO"],
+        # coev GA
+        [0.5296680302038603, 0.7913396501236944, 0.1484756029295331, 6, 1, 0.6141293126585077, 0.7893003170753544, 0.27548353980645435, 0.1367370822796239, 0.32084294928487345, "CoEvGA"],
+        [0.4859717980626773, 0.6061377722530442, 0.7690359014217759, 5, 2, 0.5359423083410759, 0.2502058625939866, 0.21263002112864848, 0.9258892735541014, 0.8120464407808758, "CoEvGA"],
+        [0.9609987620355505, 0.20610609964580984, 0.507066433589285, 4, 4, 0.9707413947048525, 0.3705438550855966, 0.19917051121690899, 0.18188515852994291, 0.1173103447579249, "CoEvGA"],
+        [0.18243372802157765, 0.018896528679374525, 0.8960905257877619, 5, 11, 0.9502573366218408, 0.608636223992721, 0.3560660179061693, 0.3398173646106416, 0.2635904919086409, "CoEvGA"],
+        [0.3390729325360927, 0.1305158934195393, 0.06912474831286741, 8, 2, 0.7841551494600603, 0.8182534032606329, 0.7844896246021426, 0.4211679057584541, 0.7454018349476341, "CoEvGA"]
+    ]
+    observers = ([ea.observer] if text_results else []) + ([failure_tracker] if failure_tracker is not None else []) + \
+        ([results_logger] if results_logger is not None else [])
+    generation_offset, evaluation_offset, elapsed_offset = 0, 0, 0.0
+    resume_args = {}
+    max_evaluations = evaluations
+    max_time = 300000
+    if checkpoint is not None:
+        # La población guardada entra como semillas con su fitness: no se vuelve a jugar nada
+        state = resume_state(resume, observers)
+        observers = state['observers']
+        generation_offset = state['num_generations']
+        evaluation_offset = state['num_evaluations'] - len(state['seeds'])
+        elapsed_offset = state['elapsed']
+        resume_args = dict(state['file_args'], num_selected=pop_size)
+        seeds = state['seeds']
+        pop_size = min(pop_size, len(seeds))
+        max_evaluations = evaluations - evaluation_offset
+        max_time -= elapsed_offset
+        if pairwise_results is not None and 'pairwise_results' in state['extra']:
+            pairwise_results = state['extra']['pairwise_results']
+        match_cost_model = state['extra']['match_cost_model']
+        if fitness_cache is not None and 'cache_counters' in state['extra']:
+            restore_cache_counters(fitness_cache, state['extra']['cache_counters'])
+        evaluator_function = ResumedEvaluator(evaluator_function, state['fitness'])
+        print(f"Reanudando {folder_name} en la generación {generation_offset} "
+              f"({state['num_evaluations']} evaluaciones, {elapsed_offset:.0f}s)")
+    checkpointer = CheckpointObserver(results_folder, {'experiment': experiment, 'seed': seed_value, 'timestamp': timestamp},
+                                      extra_state=extra_state, generation_offset=generation_offset,
+                                      evaluation_offset=evaluation_offset, elapsed_offset=elapsed_offset)
+    ea.observer = observers + [checkpointer]
+
+    inicio = time() - elapsed_offset   # al reanudar cuenta también el tiempo ya empleado
     final_pop = ea.evolve(generator=generate_agent,
                           evaluator=evaluator_function,
                           pop_size=pop_size,
-                          seeds = [
-                              # agentes GABotsLit
-                              [0.8236764429411386, 0.3421385248489114, 0.03804993858450434, 5, 12, 0.6771749205448041, 0.10525102343194481, 0.9302053416800453, 0.4498789212944384, 0.44761875467539647, "GABotsLit"],
-                              [0.12297458178514886, 0.6892306869658429, 0.7148493268065897, 6, 14, 0.8592884890421564, 0.5742506862351809, 0.5004585268846088, 0.4516465027404083, 0.016439674148995054, "GABotsLit"],
-                              [0.2852493952791957, 0.030117081355244824, 0.5725553409674055, 6, 17, 0.2861725587415407, 0.9271914077457131, 0.2664893851232498, 0.5158698667832745, 0.30820488364743004, "GABotsLit"],
-                              [0.24828854117733912, 0.8999707242482075, 0.7263712750326307, 1, 19, 0.8089887021281921, 0.44300790338559803, 0.5108326262050714, 0.226295668792857, 0.9835853623793082, "GABotsLit"],
-                              [0.965954342890369, 0.4145858805797874, 0.5024027405763758, 8, 17, 0.6860722488962545, 0.9487061328399283, 0.03804765977886704, 0.11268153953011151, 0.20435247897995978, "GABotsLit"],
-                              # agentes CoEvELO
-                              [0.16846696454019505, 0.9633468064642499, 0.789097289541181, 2, 19, 0.8795128759915216, 0.9204724802858336, 0.3887979788155116, 0.8242883235207035, 0.6129754483818649, "CoEvELO"],
-                              [0.956636271863732, 0.2579380498672741, 0.6393568712921733, 7, 17, 0.023178269925433037, 0.1866656204511874, 0.8990435733515699, 0.6637621419651777, 0.7502877068361935, "CoEvELO"],
-                              [0.8466639164968095, 0.2786706656361061, 0.030620401970831934, 7, 18, 0.0600575737756297, 0.8293527663885787, 0.5109352989009032, 0.7824192308453812, 0.5438145140559759, "CoEvELO"],
-                              [0.9291443488886724, 0.7502030751695131, 0.7437527057678102, 2, 2, 0.511100935792232, 0.7213028361032197, 0.5590256083711386, 0.2615184431104183, 0.7774327843360552, "CoEvELO"],
-                              [0.10373467819859672, 0.961272247785899, 0.8833467825088809, 6, 7, 0.3245942883610985, 0.9685604724645657, 0.6039455496315845, 0.13132116016646456, 0.6308930758328315, "CoEvELO"],
-                              # coev GA
-                              [0.5296680302038603, 0.7913396501236944, 0.1484756029295331, 6, 1, 0.6141293126585077, 0.7893003170753544, 0.27548353980645435, 0.1367370822796239, 0.32084294928487345, "CoEvGA"],
-                              [0.4859717980626773, 0.6061377722530442, 0.7690359014217759, 5, 2, 0.5359423083410759, 0.2502058625939866, 0.21263002112864848, 0.9258892735541014, 0.8120464407808758, "CoEvGA"],
-                              [0.9609987620355505, 0.20610609964580984, 0.507066433589285, 4, 4, 0.9707413947048525, 0.3705438550855966, 0.19917051121690899, 0.18188515852994291, 0.1173103447579249, "CoEvGA"],
-                              [0.18243372802157765, 0.018896528679374525, 0.8960905257877619, 5, 11, 0.9502573366218408, 0.608636223992721, 0.3560660179061693, 0.3398173646106416, 0.2635904919086409, "CoEvGA"],
-                              [0.3390729325360927, 0.1305158934195393, 0.06912474831286741, 8, 2, 0.7841551494600603, 0.8182534032606329, 0.7844896246021426, 0.4211679057584541, 0.7454018349476341, "CoEvGA"]
-                                 ],
+                          seeds=seeds,
                           maximize=True,
                           bounder=ec.Bounder([0, 0, 0, 1, 1, 0, 0, 0, 0, 0], 
                                             [1, 1, 1, 10, 20, 1, 1, 1, 1, 1]),
-                          max_evaluations=evaluations,
-                          max_time = 300000,
+                          max_evaluations=max_evaluations,
+                          max_time=max_time,
                           folder_name=folder_name,
-                          mp_processes=mp_processes)
+                          mp_processes=mp_processes,
+                          evaluation_server=evaluation_server,
+                          fitness_cache=fitness_cache,
+                          pairwise_results=pairwise_results,
+                          worker_pool=worker_pool,
+                          match_cost_model=match_cost_model,
+                          pairing=pairing,
+                          match_budget=match_budget,
+                          pairing_k=pairing_k,
+                          rating_solver=rating_solver,
+                          supervision=supervision,
+                          game_seed=game_seed,
+                          failure_tracker=failure_tracker,
+                          **resume_args)
     fin = time()
 
-    final_pop.sort(reverse=True)
+    if evaluation_server is not None:
+        farm_stats = evaluation_server.stats() if farm is not None else None
+        evaluation_server.close()
+    if worker_pool is not None:
+        pool_stats = worker_pool.stats()
+        worker_pool.close()
+    if fitness_cache is not None:
+        cache_stats = fitness_cache.stats()
+        fitness_cache.close()
+
+    if array_population:
+        final_pop = [final_pop[idx] for idx in lexico_order(to_array(final_pop))]
+    else:
+        final_pop.sort(reverse=True)
 
     # Guardar estadísticas incluyendo la seed y configuración
     stats_file = f"{results_folder}/CoEvstats_{evaluation_type.lower()}-{timestamp}.txt"
     with open(stats_file, 'w') as file:
         file.write(f"Seed: {seed_value}\n")
+        if game_seed is not None:
+            file.write(f"Game seed: {game_seed} (seeded MyAgent games)\n")
         file.write(f"{fin-inicio} seconds employed\n")
         file.write(f"{evaluations} evaluations\n")
         file.write(f"{generations} generations\n")
         file.write(f"{pop_size} pop size\n")
         file.write(f"{mp_processes} mp_processes\n")
         file.write(f"Evaluation type: {evaluation_type}\n")
+        if use_elo_evaluation:
+            file.write(f"Rating solver: {rating_solver}\n")
+        if pairing != 'round_robin':
+            budget = match_budget if match_budget is not None else 'default'
+            file.write(f"Pairing: {pairing} (k={pairing_k}, match budget={budget})\n")
+        if fitness_cache is not None:
+            file.write(f"Fitness cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                       f"{cache_stats['evictions']} evictions, {cache_stats['entries']} entries\n")
+        if worker_pool is not None:
+            file.write(f"Worker pool: {pool_stats['busy']:.1f}s busy, {pool_stats['idle']:.1f}s idle, "
+                       f"{pool_stats['utilization']:.1%} utilization\n")
+        if farm is not None:
+            file.write(f"Farm: {farm_stats['requeued']} requeued tasks, tasks per worker: {farm_stats['workers']}\n")
+        if game_backend is not None:
+            file.write(f"Game backend: {type(evaluation_server).__name__}\n")
+        if failure_tracker is not None:
+            failure_stats = failure_tracker.stats()
+            file.write(f"Supervision: {failure_stats['failed']} failed, {failure_stats['timeouts']} timeouts, "
+                       f"{failure_stats['retries']} retries, {failure_stats['skipped']} skipped, "
+                       f"{failure_stats['quarantined']} quarantined genomes\n")
+        if array_population:
+            file.write(f"Array population: np.lexsort selection and replacement, final population in "
+                       f"CoEvpopulation-{evaluation_type.lower()}-{timestamp}.npy\n")
+        if pairwise_results is not None:
+            file.write(f"Pairwise results: {pairwise_results.played} matches played, "
+                       f"{pairwise_results.reused} matches reused\n")
+        if results_logger is not None:
+            log_stats = results_logger.stats()
+            file.write(f"Results log: {log_stats['records']} records ({log_stats['bytes']} bytes) in "
+                       f"{os.path.basename(results_logger.path)}"
+                       + ("" if text_results else ", inspyred text files disabled") + "\n")
         file.write("Best individual\n")
         file.write(f"{str(final_pop[0])}\n")
 
     pd.DataFrame(final_pop).to_csv(f"{results_folder}/CoEvpopulation-{evaluation_type.lower()}-{timestamp}.csv")
+    if array_population:
+        save_population(f"{results_folder}/CoEvpopulation-{evaluation_type.lower()}-{timestamp}.npy", final_pop)
     
     return final_pop[0], fin-inicio, evaluation_type, results_folder
 
+def resume_coev_experiment(results_folder):
+    """Continúa el experimento de co-evolución de results_folder desde su último checkpoint."""
+    settings = load_checkpoint(results_folder)['settings']
+    return run_coev_experiment(**settings['experiment'], resume=results_folder)
+
 if __name__ == "__main__":
+    # python CoEvGAmicroRTS.py --resume <carpeta_resultados> continúa un experimento interrumpido
+    if len(sys.argv) == 3 and sys.argv[1] == '--resume':
+        best_individual, tiempo, eval_type, folder = resume_coev_experiment(sys.argv[2])
+        print(f"Mejor: {str(best_individual)}, Tiempo: {tiempo:.2f}s, Tipo: {eval_type}")
+        print(f"Guardado en: {folder}\n")
+        sys.exit(0)
+
     # Configuración de experimentos
     NUM_EXPERIMENTS = 1
     USE_ELO = False
     GENERATIONS = 1
     POP_SIZE = 15
     MP_PROCESSES = 12
+    USE_JVM_SERVER = False  # True: los enfrentamientos se juegan en JVMs persistentes (ver jvm_evaluation.py)
+    # p.ej. "./resultados/fitness_cache_coev.sqlite": reutiliza enfrentamientos entre ejecuciones; solo
+    # válida con la misma compilación de MyAgent (borrar el fichero tras cambiar el código Java)
+    FITNESS_CACHE_PATH = None
+    REUSE_MATCH_RESULTS = True
+    PAIRING = 'round_robin'   # 'round_robin', 'swiss', 'k_random' o 'active' (poblaciones grandes)
+    MATCH_BUDGET = None       # enfrentamientos nuevos por generación (None: PAIRING_K * N / 2)
+    PAIRING_K = 4             # oponentes por agente ('k_random') o rondas ('swiss')
+    RATING_SOLVER = 'sequential'  # ELO: 'sequential', 'batched' o 'bradley_terry' (ajuste global)
+    FARM = None  # 'host:puerto' del broker (fuera de 127.0.0.1 exige MICRORTS_FARM_TOKEN); trabajadores: python farm.py worker host:puerto --capacity N
+    GAME_BACKEND = None  # 'replay' para probar la orquestación sin MicroRTS (ver game_backend.py)
+    ARRAY_POPULATION = False  # selección y reemplazo vectorizados con np.lexsort (poblaciones grandes)
+    GAME_SEED = None  # semilla base de los enfrentamientos (int) para resultados reproducibles; None sin semilla
+    RESULTS_LOG = False  # registro binario de la población de cada generación (ver results_log.py)
+    TEXT_RESULTS = True  # False para no escribir los inspyred-*-file de texto (requiere RESULTS_LOG)
+    # Límite de tiempo por enfrentamiento (segundos), reintentos y cuarentena (None sin supervisión),
+    # p.ej. SupervisionPolicy(evaluation_timeout=900, retries=2, backoff=1.0, quarantine_after=3)
+    SUPERVISION = None
 
     for i in range(NUM_EXPERIMENTS):
         print(f"Experimento CoEv {i+1}/{NUM_EXPERIMENTS}")
@@ -700,7 +1162,21 @@ if __name__ == "__main__":
             use_elo_evaluation=USE_ELO,
             generations=GENERATIONS,
             pop_size=POP_SIZE,
-            mp_processes=MP_PROCESSES
+            mp_processes=MP_PROCESSES,
+            use_jvm_server=USE_JVM_SERVER,
+            fitness_cache_path=FITNESS_CACHE_PATH,
+            reuse_match_results=REUSE_MATCH_RESULTS,
+            pairing=PAIRING,
+            match_budget=MATCH_BUDGET,
+            pairing_k=PAIRING_K,
+            rating_solver=RATING_SOLVER,
+            supervision=SUPERVISION,
+            farm=FARM,
+            game_backend=GAME_BACKEND,
+            array_population=ARRAY_POPULATION,
+            game_seed=GAME_SEED + i if GAME_SEED is not None else None,
+            results_log=RESULTS_LOG,
+            text_results=TEXT_RESULTS
         )
         print(f"Mejor: {str(best_individual)}, Tiempo: {tiempo:.2f}s, Tipo: {eval_type}")
         print(f"Guardado en: {folder}\n")
@@ -7,11 +7,41 @@ from inspyred.ec import terminators
 from inspyred.ec import evaluators
 import subprocess
 import pandas as pd
-from io import StringIO
 import os
+from jvm_evaluation import CLASS_PATH, EvaluationServerPool
+from game_backend import driver_config, make_backend
+from fitness_cache import FitnessCache, canonical_genome
+from tournament_results import parse_tournament_output, summary_total
+from game_units import run_game_units
+from racing import race_candidates
+from adaptive_games import AdaptivePolicy, adaptive_victories, play_adaptive
+from cell_store import CellStore, evaluate_from_cells
+from seeding import seed_arguments, seeded_payload, tournament_seed
+from islands import FileMigrator, IslandSpec
+from steady_state import SteadyStateEC
+from lean_evaluation import LeanEvaluator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import Pool
+from farm import Broker
+from functools import partial
+from checkpoint import (CheckpointObserver, ResumedEvaluator, cache_counters, load_checkpoint, restore_cache_counters,
+                        resume_state, resumed_submit)
+from supervision import FailureTracker, SupervisionPolicy, run_java, supervised_call
+from tracing import PHASES, ExecutionTimer, TraceWriter, wall_time
+from surrogate import SurrogateScreen
+from population import lexico_order, plus_replacement, save_population, to_array, tournament_selection
+from results_log import ResultsLog
+import sys
 #end_imports
 
 class LexicoFitness(float):
+    # Racing: si la evaluación se cortó, partidas que llegó a jugar (None si jugó el torneo completo)
+    games_played = None
+    # Muestreo adaptativo: partidas jugadas en cada celda [mapa][oponente] (None con iteraciones fijas)
+    cell_games = None
+    # Segundos de reloj de la evaluación (None si no se jugó: caché de fitness o inmigrante)
+    wall_time = None
+
     def __new__(cls, victorias, tiempo_victoria, tiempo_derrota):
         # El valor float será solo las victorias para numpy
         obj = float.__new__(cls, victorias)
@@ -55,56 +85,11 @@ class LexicoFitness(float):
         return (self.victorias, self.tiempo_victoria, self.tiempo_derrota)
 
     def __repr__(self):
+        # Los fitness truncados por racing llevan las partidas jugadas como cuarto elemento
+        if self.games_played is not None:
+            return f"({self.victorias}, {self.tiempo_victoria}, {self.tiempo_derrota}, {self.games_played})"
         return f"({self.victorias}, {self.tiempo_victoria}, {self.tiempo_derrota})"
 
-def load_tournament_games_from_df(df):
-    """
-    Extrae los datos de partidas desde un DataFrame de torneo.
-    
-    Args:
-        df (pd.DataFrame): DataFrame completo del torneo
-        
-    Returns:
-        pd.DataFrame: DataFrame con solo los datos de las partidas
-        
-    Raises:
-        ValueError: Si no se encuentra la estructura esperada del DataFrame
-    """
-    # Convertir DataFrame a líneas de texto para procesar
-    lines = []
-    for index, row in df.iterrows():
-        # Convertir la fila a string, manejando valores NaN
-        row_str = '\t'.join(str(val) if pd.notna(val) else '' for val in row.values)
-        lines.append(row_str + '\n')
-    
-    # Buscar la línea de headers y el inicio de estadísticas
-    header_line_idx = None
-    stats_start_idx = None
-    
-    for i, line in enumerate(lines):
-        stripped_line = line.strip()
-        
-        # Buscar headers de columnas
-        if header_line_idx is None and all(col in line for col in ['iteration', 'map', 'ai1', 'ai2']):
-            header_line_idx = i
-        
-        # Buscar inicio de estadísticas
-        elif stripped_line == "Wins:":
-            stats_start_idx = i
-            break
-    
-    if header_line_idx is None:
-        raise ValueError("No se encontró la línea de headers en el DataFrame")
-    
-    # Extraer líneas de datos de partidas
-    end_idx = stats_start_idx if stats_start_idx else len(lines)
-    data_lines = lines[header_line_idx:end_idx]
-    
-    # Crear DataFrame optimizado
-    csv_content = ''.join(data_lines)
-    return pd.read_csv(StringIO(csv_content), sep='\t')
-
-
 def generate_agent(random, args):
     size = 10 # number of parameters
 
@@ -120,19 +105,19 @@ def meantime_to_win(df_games):
     Calcula el tiempo medio de victoria de un agente (ai1=0).
     
     Args:
-        df_games: DataFrame con las partidas del torneo
+        df_games: partidas del torneo en columnas (ver tournament_results.parse_tournament_output)
         
     Returns:
         float: Tiempo medio de victoria (0 si no hay victorias)
     """
     # Filtrar solo las partidas donde ai1=0 (nuestro agente) y winner=0 (ganó nuestro agente)
-    victories = df_games[(df_games['ai1'] == 0) & (df_games['winner'] == 0)]
+    victories = (df_games['ai1'] == 0) & (df_games['winner'] == 0)
     
-    if len(victories) == 0:
+    if not victories.any():
         return float('inf')  # No hay victorias
     
     # Calcular el tiempo medio de victoria
-    mean_victory_time = victories['time'].mean()
+    mean_victory_time = float(df_games['time'][victories].mean())
     
     return mean_victory_time
 
@@ -141,84 +126,421 @@ def meantime_to_lose(df_games):
     Calcula el tiempo medio de derrota de un agente (ai1=0).
     
     Args:
-        df_games: DataFrame con las partidas del torneo
+        df_games: partidas del torneo en columnas (ver tournament_results.parse_tournament_output)
         
     Returns:
         float: Tiempo medio de derrota (0 si no hay derrotas)
     """
     # Filtrar solo las partidas donde ai1=0 (nuestro agente) y winner=1 (ganó el oponente)
-    defeats = df_games[(df_games['ai1'] == 0) & (df_games['winner'] == 1)]
+    defeats = (df_games['ai1'] == 0) & (df_games['winner'] == 1)
     
-    if len(defeats) == 0:
+    if not defeats.any():
         return 0  # No hay derrotas
     
     # Calcular el tiempo medio de derrota
-    mean_defeat_time = defeats['time'].mean()
+    mean_defeat_time = float(df_games['time'][defeats].mean())
     
     return mean_defeat_time
 
+def tournament_fitness(games, summary):
+    """
+    Calcula el fitness lexicográfico a partir de los registros de un torneo EvaluationTournament.
+
+    Args:
+        games (dict): partidas del torneo en columnas de NumPy
+        summary (dict): resumen del torneo con los bloques 'wins' y 'ties'
+
+    Returns:
+        LexicoFitness: (victorias + 0.5 * empates, tiempo medio de victoria, tiempo medio de derrota)
+    """
+    # Sin resumen el torneo no terminó: se trata como evaluación fallida
+    if summary is None or 'wins' not in summary or 'ties' not in summary:
+        return LexicoFitness(0, float('inf'), 0)
+
+    ind_fitness = summary_total(summary, 'wins') + 0.5 * summary_total(summary, 'ties')
+    # Calcular tiempos medios usando las partidas individuales
+    ind_victory_time = meantime_to_win(games)
+    ind_defeat_time = meantime_to_lose(games)
+
+    fitness = LexicoFitness(ind_fitness, ind_victory_time, ind_defeat_time)
+    # Las partidas sueltas (shard_games, racing, adaptive, celdas) traen sus tiempos en el resumen
+    if 'timing' in summary:
+        fitness.wall_time = wall_time(summary['timing'])
+    return fitness
+
+def tournament_complete(parsed):
+    """Indica si una salida de parse_tournament_output corresponde a un torneo terminado."""
+    summary = parsed[1]
+    return summary is not None and 'wins' in summary and 'ties' in summary
+
 def evaluate_agent(candidate=None, args=None):
     fitness = []
-    class_path = 'bin/' +\
-      ':lib/hamcrest-all-1.3.jar:' +\
-      'lib/jdom.jar:lib/junit-4.12.jar:' +\
-      'lib/minimal-json-0.9.4.jar:lib/weka.jar:' +\
-      'lib/MicroRTS.jar'
-
-    # Obtener el nombre de la carpeta desde args
-    folder_name = args.get('folder_name', 'GABotsLit')  # valor por defecto
-    
-    # Generar nombre único para el archivo basado en process ID y timestamp
-    process_id = os.getpid()
-    timestamp = int(time() * 1000000)  # microsegundos para mayor unicidad
-    filename = f"./resultados/{folder_name}/tournament_{process_id}_{timestamp}.csv"
-    
-    result_file = subprocess.run(['java', '-cp', class_path, 'tournament.EvaluationTournament'] + 
-                                 [str(c) for c in candidate[0]] + [filename], capture_output=True, text=True)
+    class_path = CLASS_PATH
+
+    # Con "-" el torneo emite sus resultados por stdout (sin fichero temporal)
+    command = ['java', '-cp', class_path, 'tournament.EvaluationTournament'] + [str(c) for c in candidate[0]] + ['-'] + \
+        seed_arguments(tournament_seed(args.get('game_seed') if args else None, candidate[0]))
+    policy = args.get('supervision') if args else None
+    timer = ExecutionTimer()
+    if policy is None:
+        stdout = timer.run(lambda: subprocess.run(command, capture_output=True, text=True).stdout)
+        parsed = parse_tournament_output(stdout)
+        fitness.append(timed_fitness(timer, parsed, tournament_fitness(*parsed), args))
+        return fitness
+
+    # Supervisada: límite de tiempo por evaluación y reintentos; los contadores viajan con el fitness
+    parsed, outcome = supervised_call(
+        lambda: parse_tournament_output(timer.run(lambda: run_java(command, policy.evaluation_timeout))),
+        accept=tournament_complete, retries=policy.retries, backoff=policy.backoff)
+    if parsed is not None:
+        result = timed_fitness(timer, parsed, tournament_fitness(*parsed), args)
+    else:
+        result = LexicoFitness(0, float('inf'), 0)
+    result.supervision = outcome
+    fitness.append(result)
+
+    return fitness
+
+def evaluate_agent_server(candidate, args):
+    """
+    Evalúa un candidato en una de las JVM persistentes de args['evaluation_server'].
+
+    Args:
+        candidate: genoma del agente (10 genes + etiqueta)
+        args: diccionario de argumentos de inspyred
+
+    Returns:
+        LexicoFitness: fitness del candidato (0 victorias si el torneo falla)
+    """
+    payload = seeded_payload({'type': 'evaluate', 'agent': [str(c) for c in candidate]},
+                             tournament_seed(args.get('game_seed'), candidate))
+    policy = args.get('supervision')
+    timer = ExecutionTimer()
+    if policy is not None:
+        parsed, outcome = supervised_call(
+            lambda: parse_tournament_output(
+                timer.run(lambda: args['evaluation_server'].request(payload, policy.evaluation_timeout)['records'])),
+            accept=tournament_complete, retries=policy.retries, backoff=policy.backoff)
+        if parsed is not None:
+            result = timed_fitness(timer, parsed, tournament_fitness(*parsed), args)
+        else:
+            result = LexicoFitness(0, float('inf'), 0)
+        result.supervision = outcome
+        return result
 
-    # Read CSV file from the generated file
     try:
-        df = pd.read_csv(filename)
-        # Eliminar el archivo temporal después de leerlo
-        os.remove(filename)
-    except FileNotFoundError:
-        # Si no se pudo crear el archivo, devolver fitness 0
-        return [LexicoFitness(0, float('inf'), 0)]
-    
-    offset = 14
-    nAIs = 1
-    nOpponentAIs = 3
-    nMaps = 5
-    nIter = 4
-    wins_row_idx = (offset + nMaps + nAIs + nOpponentAIs + (nOpponentAIs * nMaps * nIter)) - 2 # Minus 2 because of the column label and 0 indexing
-    ties_row_idx = wins_row_idx + 2
-
-    # check number of rows
-    if len(df) >= ties_row_idx:
-        wins_row = df.iloc[wins_row_idx]
-        ties_row = df.iloc[ties_row_idx]
-
-        # convert to numeric and sum the values 
-        if (nOpponentAIs > 1):
-            ind_fitness = sum(float(wins) for wins in wins_row.iloc[0].split('\t') if wins)
-            ind_fitness += sum(float(ties) for ties in ties_row.iloc[0].split('\t') if ties) * 0.5
-            # Calcular tiempos medios usando las partidas individuales
-            games_df = load_tournament_games_from_df(df)
-            ind_victory_time = meantime_to_win(games_df)
-            ind_defeat_time = meantime_to_lose(games_df)
+        response = timer.run(lambda: args['evaluation_server'].request(payload))
+    except RuntimeError:
+        return LexicoFitness(0, float('inf'), 0)
+
+    parsed = parse_tournament_output(response['records'])
+    return timed_fitness(timer, parsed, tournament_fitness(*parsed), args)
+
+def timed_fitness(timer, parsed, fitness, args):
+    """
+    Anota en el fitness los segundos de reloj de la evaluación y, con args['trace'], adjunta
+    (en 'timing') su desglose de tiempos.
+    """
+    record = timer.record(parsed)
+    fitness.wall_time = wall_time([record])
+    if args and args.get('trace'):
+        fitness.timing = [record]
+    return fitness
+
+def evaluate_agents_server(candidates, args):
+    """
+    Evaluador de inspyred que reparte los candidatos entre las JVM persistentes.
+    Sustituye a evaluators.parallel_evaluation_mp cuando use_jvm_server=True.
+    """
+    evaluation_server = args['evaluation_server']
+    return evaluation_server.map(lambda candidate: evaluate_agent_server(candidate, args), candidates)
+
+def evaluate_agents_sharded(candidates, args):
+    """
+    Evaluador de inspyred que reparte las partidas (mapa, oponente, iteración) de todos los
+    candidatos entre los procesos disponibles y recompone el LexicoFitness de cada uno.
+
+    Usa las JVM persistentes de args['evaluation_server'] si existen y, si no, el
+    multiprocessing.Pool del experimento (args['game_pool']).
+    """
+    results = run_game_units(candidates, args['tournament_config'],
+                             evaluation_server=args.get('evaluation_server'),
+                             processes=args['mp_nprocs'], policy=args.get('supervision'), pool=args.get('game_pool'))
+    fitness = []
+    for games, summary in results:
+        result = tournament_fitness(games, summary)
+        if args.get('trace') and summary is not None:
+            result.timing = summary['timing']
+        fitness.append(result)
+    return fitness
+
+def evaluate_agents_cells(candidates, args):
+    """
+    Evaluador de inspyred que construye cada torneo con las partidas del almacén de celdas
+    args['cell_store'] y solo juega (como partidas sueltas) las celdas que faltan (ver cell_store.py).
+    """
+    results = evaluate_from_cells(candidates, args['cell_store'], evaluation_server=args.get('evaluation_server'),
+                                  processes=args['mp_nprocs'], policy=args.get('supervision'),
+                                  pool=args.get('game_pool'))
+    return [tournament_fitness(games, summary) for games, summary in results]
+
+def evaluate_agents_racing(candidates, args):
+    """
+    Evaluador de inspyred que juega las partidas por lotes y deja de evaluar a los candidatos
+    que ya no pueden alcanzar el peor fitness de la población actual (ver racing.py).
+
+    Los fitness truncados guardan en games_played las partidas jugadas. Por cada llamada
+    (una por generación) se añade una fila a args['racing_stats_file'] con las partidas
+    jugadas y ahorradas, y se acumulan los totales en args['racing_stats'].
+    """
+    population = args['_ec'].population
+    threshold = min(ind.fitness for ind in population).victorias if population else None
+
+    outcomes = race_candidates(candidates, args['tournament_config'], threshold=threshold,
+                               mode=args['racing'], delta=args['racing_delta'],
+                               evaluation_server=args.get('evaluation_server'),
+                               processes=args['mp_nprocs'], policy=args.get('supervision'),
+                               pool=args.get('game_pool'))
+
+    total_games = len(args['tournament_config']['maps']) * len(args['tournament_config']['opponents']) * \
+        args['tournament_config']['iterations']
+    fitness = []
+    for games, summary, games_played, truncated in outcomes:
+        result = tournament_fitness(games, summary)
+        if truncated:
+            result.games_played = games_played
+        fitness.append(result)
+
+    games_played = sum(outcome[2] for outcome in outcomes)
+    n_truncated = sum(1 for outcome in outcomes if outcome[3])
+    games_saved = total_games * len(candidates) - games_played
+    racing_stats = args['racing_stats']
+    with open(args['racing_stats_file'], 'a') as file:
+        file.write(f"{racing_stats['generations']}, {len(candidates)}, {n_truncated}, {games_played}, {games_saved}\n")
+    racing_stats['generations'] += 1
+    racing_stats['truncated'] += n_truncated
+    racing_stats['games_played'] += games_played
+    racing_stats['games_saved'] += games_saved
+
+    return fitness
+
+def evaluate_agents_adaptive(candidates, args):
+    """
+    Evaluador de inspyred que pide las partidas por rondas y deja de muestrear cada celda
+    (mapa, oponente) en cuanto su test secuencial se decide (ver adaptive_games.py).
+
+    Las victorias se escalan a las iteraciones del torneo completo para que los fitness sean
+    comparables, y cada fitness guarda en cell_games las partidas que recibió cada celda.
+    Por cada candidato se añade una fila a args['adaptive_stats_file'] con sus partidas por
+    celda, y se acumulan los totales en args['adaptive_stats'].
+    """
+    config = args['tournament_config']
+    outcomes = play_adaptive(candidates, config, args['adaptive'], evaluation_server=args.get('evaluation_server'),
+                             processes=args['mp_nprocs'], supervision=args.get('supervision'),
+                             pool=args.get('game_pool'))
+
+    fixed_games = len(config['maps']) * len(config['opponents']) * config['iterations']
+    adaptive_stats = args['adaptive_stats']
+    fitness = []
+    with open(args['adaptive_stats_file'], 'a') as file:
+        for games, summary, cell_games in outcomes:
+            result = tournament_fitness(games, summary)
+            if not is_failed_fitness(result):
+                elapsed = result.wall_time
+                result = LexicoFitness(adaptive_victories(games, cell_games, config['iterations']),
+                                       result.tiempo_victoria, result.tiempo_derrota)
+                result.cell_games = cell_games.tolist()
+                result.wall_time = elapsed
+            fitness.append(result)
+            games_played = int(cell_games.sum())
+            file.write(f"{adaptive_stats['generations']}, {games_played}, {fixed_games - games_played}, "
+                       + ", ".join(str(n) for n in cell_games.ravel()) + "\n")
+            adaptive_stats['games_played'] += games_played
+            adaptive_stats['games_saved'] += fixed_games - games_played
+    adaptive_stats['generations'] += 1
+
+    return fitness
+
+def is_failed_fitness(fitness):
+    """Indica si un fitness es el marcador de evaluación fallida (0, inf, 0)."""
+    return fitness.victorias == 0 and fitness.tiempo_victoria == float('inf') and fitness.tiempo_derrota == 0
+
+def supervised_fitness(failure_tracker, candidate, result):
+    """
+    Registra una evaluación en el FailureTracker y devuelve su fitness, o None si falló
+    (inspyred y SteadyStateEC descartan los candidatos con fitness None en lugar de
+    tratarlos como si hubieran perdido todas las partidas).
+    """
+    failed = result is None or is_failed_fitness(result)
+    outcome = result.__dict__.pop('supervision', None) if result is not None else None
+    failure_tracker.record([candidate], outcome, failed)
+    return None if failed else result
+
+def evaluate_supervised(candidates, args):
+    """
+    Evaluador de inspyred con contabilidad de fallos (ver supervision.py).
+
+    Los genomas en cuarentena en args['failure_tracker'] no se evalúan; el resto se
+    delega en args['supervised_evaluator'] y las evaluaciones que fallan tras los
+    reintentos devuelven None.
+    """
+    failure_tracker = args['failure_tracker']
+    fitness = [None] * len(candidates)
+    to_evaluate = []
+    for idx, candidate in enumerate(candidates):
+        if failure_tracker.is_quarantined(candidate):
+            failure_tracker.skip()
         else:
-            ind_fitness = int(wins_row) + 0.5*int(ties_row)
-            # Calcular tiempos medios usando las partidas individuales
-            games_df = load_tournament_games_from_df(df)
-            ind_victory_time = meantime_to_win(games_df)
-            ind_defeat_time = meantime_to_lose(games_df)
+            to_evaluate.append(idx)
 
-        fitness.append(LexicoFitness(ind_fitness, ind_victory_time, ind_defeat_time))
-    else:
-        fitness.append(LexicoFitness(0, float('inf'), 0))
+    if to_evaluate:
+        results = args['supervised_evaluator'](candidates=[candidates[idx] for idx in to_evaluate], args=args)
+        for idx, result in zip(to_evaluate, results):
+            fitness[idx] = supervised_fitness(failure_tracker, candidates[idx], result)
 
     return fitness
 
+def supervised_submit(submit, failure_tracker):
+    """Versión de submit para SteadyStateEC con cuarentena y contabilidad de fallos."""
+    def wrapper(candidate):
+        result = Future()
+        if failure_tracker.is_quarantined(candidate):
+            failure_tracker.skip()
+            result.set_result(None)
+            return result
+        future = submit(candidate)
+        future.add_done_callback(
+            lambda done: result.set_result(supervised_fitness(failure_tracker, candidate, done.result())))
+        return result
+    return wrapper
+
+def traced_result(tracer, candidate, submitted, result):
+    """Escribe en la traza el desglose de tiempos que trae el fitness (si lo trae) y lo quita de él."""
+    timing = result.__dict__.pop('timing', None) if result is not None else None
+    if timing:
+        tracer.record(candidate, submitted, timing, result)
+    return result
+
+def evaluate_traced(candidates, args):
+    """
+    Evaluador de inspyred que escribe la traza de tiempos de cada evaluación (ver tracing.py)
+    en args['tracer']; las evaluaciones las hace args['traced_evaluator'].
+    """
+    submitted = time()
+    results = args['traced_evaluator'](candidates=candidates, args=args)
+    return [traced_result(args['tracer'], candidate, submitted, result) for candidate, result in zip(candidates, results)]
+
+def traced_submit(submit, tracer):
+    """Versión de submit para SteadyStateEC que escribe la traza de tiempos de cada evaluación."""
+    def wrapper(candidate):
+        submitted = time()
+        result = Future()
+        future = submit(candidate)
+        future.add_done_callback(
+            lambda done: result.set_result(traced_result(tracer, candidate, submitted, done.result())))
+        return result
+    return wrapper
+
+def evaluate_with_surrogate(candidates, args):
+    """
+    Evaluador de inspyred que preselecciona los descendientes con el modelo sustituto de
+    args['surrogate'] (ver surrogate.py).
+
+    Solo los candidatos elegidos se delegan en args['surrogate_evaluator']; los descartados
+    devuelven None y inspyred los excluye sin jugar ninguna partida. La población inicial
+    se evalúa entera (se predice igualmente para medir la correlación de rangos).
+    """
+    surrogate = args['surrogate']
+    selected, predicted = surrogate.screen(candidates, discard=bool(args['_ec'].population))
+    fitness = [None] * len(candidates)
+    to_evaluate = [candidates[idx] for idx in selected]
+    results = args['surrogate_evaluator'](candidates=to_evaluate, args=args) if to_evaluate else []
+    for idx, result in zip(selected, results):
+        fitness[idx] = result
+    surrogate.record(to_evaluate, [predicted[idx] for idx in selected] if predicted is not None else None,
+                     [None if result is None or is_failed_fitness(result) else result for result in results],
+                     len(candidates))
+    return fitness
+
+def evaluate_with_cache(candidates, args):
+    """
+    Evaluador de inspyred que consulta la caché de fitness antes de lanzar ningún torneo.
+
+    Los genomas ya evaluados con la misma configuración de torneo (en esta o en otra
+    ejecución) y los duplicados dentro del mismo lote se resuelven sin jugar partidas;
+    el resto se delega en args['cache_evaluator']. Las evaluaciones fallidas y las truncadas
+    por racing no se guardan.
+    """
+    fitness_cache = args['fitness_cache']
+    fitness = [None] * len(candidates)
+
+    # genoma canónico -> índices de los candidatos pendientes con ese genoma
+    pending = {}
+    for idx, candidate in enumerate(candidates):
+        genome = canonical_genome(candidate)
+        if genome in pending:
+            pending[genome].append(idx)
+            continue
+        cached = fitness_cache.get('evaluate', [candidate])
+        if cached is not None:
+            fitness[idx] = LexicoFitness(*cached)
+        else:
+            pending[genome] = [idx]
+
+    if pending:
+        to_evaluate = [candidates[indices[0]] for indices in pending.values()]
+        results = args['cache_evaluator'](candidates=to_evaluate, args=args)
+        for indices, candidate, result in zip(pending.values(), to_evaluate, results):
+            store_fitness(fitness_cache, candidate, result)
+            for idx in indices:
+                fitness[idx] = result
+
+    return fitness
+
+def evaluate_candidate(candidate, context=None):
+    """
+    Evalúa un único candidato en un subprocess java.
+
+    Es una función de nivel de módulo para poder enviarla por referencia a
+    ProcessPoolExecutor y LeanEvaluator; context es el contexto pequeño de evaluación.
+    """
+    return evaluate_agent([candidate], context if context is not None else {})[0]
+
+def steady_state_submit(executor, evaluate, fitness_cache=None):
+    """
+    Construye las funciones submit y on_evaluated de SteadyStateEC.
+
+    Los candidatos que ya están en la caché de fitness se resuelven sin enviarlos al
+    executor; los demás se evalúan con evaluate y on_evaluated los guarda en la caché
+    (en el hilo principal, que es el dueño de la conexión SQLite).
+
+    Returns:
+        tuple: (candidate -> Future con su LexicoFitness, (candidate, fitness) -> None o None sin caché)
+    """
+    from_cache = {}  # id -> fitness resueltos desde la caché (no se vuelven a guardar)
+
+    def submit(candidate):
+        if fitness_cache is not None:
+            cached = fitness_cache.get('evaluate', [candidate])
+            if cached is not None:
+                fitness = LexicoFitness(*cached)
+                from_cache[id(fitness)] = fitness
+                future = Future()
+                future.set_result(fitness)
+                return future
+        return executor.submit(evaluate, candidate)
+
+    def on_evaluated(candidate, fitness):
+        if from_cache.pop(id(fitness), None) is None:
+            store_fitness(fitness_cache, candidate, fitness)
+
+    return submit, (on_evaluated if fitness_cache is not None else None)
+
+def store_fitness(fitness_cache, candidate, result):
+    """Guarda en la caché un fitness completo (no los fallidos ni los truncados por racing)."""
+    if result is not None and not is_failed_fitness(result) and result.games_played is None:
+        fitness_cache.put('evaluate', [candidate], [result.victorias, result.tiempo_victoria, result.tiempo_derrota])
+
 def my_uniform_mutation_variator(random, candidates, args):
     mutation_rate = args.get('mutation_rate', 0.15)
     mutants = []
@@ -238,26 +560,206 @@ def my_uniform_mutation_variator(random, candidates, args):
         mutants.append(mutant)
     return mutants
 
-def run_experiment(mp_nprocs=15, evaluations=2, pop_size=2):
-    # Generar y guardar la seed para replicabilidad
-    seed_value = int(time())
+def run_experiment(mp_nprocs=15, evaluations=2, pop_size=2, use_jvm_server=False, fitness_cache_path=None,
+                   shard_games=False, racing=None, racing_delta=0.05, steady_state=False, lean_evaluator=True,
+                   supervision=None, farm=None, trace=None, game_backend=None, surrogate=None,
+                   array_population=False, adaptive=None, cell_store_path=None, island=None,
+                   game_seed=None, results_log=False, text_results=True, resume=None):
+    # Parámetros del experimento: se guardan en el checkpoint para reanudarlo con la misma configuración
+    experiment = dict(mp_nprocs=mp_nprocs, evaluations=evaluations, pop_size=pop_size, use_jvm_server=use_jvm_server,
+                      fitness_cache_path=fitness_cache_path, shard_games=shard_games, racing=racing,
+                      racing_delta=racing_delta, steady_state=steady_state, lean_evaluator=lean_evaluator,
+                      supervision=supervision, farm=farm, trace=trace, game_backend=game_backend,
+                      surrogate=surrogate, array_population=array_population,
+                      adaptive=adaptive, cell_store_path=cell_store_path, island=island,
+                      game_seed=game_seed, results_log=results_log, text_results=text_results)
+
+    # Al reanudar (resume = carpeta de resultados) se conservan la seed, la carpeta y el estado del Random
+    checkpoint = load_checkpoint(resume) if resume is not None else None
+
+    # Generar y guardar la seed para replicabilidad (con game_seed el experimento entero es reproducible)
+    seed_value = (int(time()) if game_seed is None else game_seed) if checkpoint is None else checkpoint['settings']['seed']
+    if island is not None and checkpoint is None:
+        seed_value += island.index   # islas lanzadas en el mismo segundo no comparten seed
     rand = Random()
     rand.seed(seed_value)
+    if checkpoint is not None:
+        rand.setstate(checkpoint['random_state'])
     ea = ec.GA(rand)
     ea.selector = ec.selectors.tournament_selection
     ea.terminator = [terminators.evaluation_termination, terminators.time_termination]
     ea.observer = ec.observers.file_observer
     ea.variator = [ec.variators.uniform_crossover, my_uniform_mutation_variator]
     ea.replacer = ec.replacers.plus_replacement
+    # Con island (IslandSpec) esta población es una isla del modelo de islas: cada island.interval
+    # generaciones publica sus mejores individuos y recibe los de sus vecinas (ver islands.py)
+    migrator = None
+    if island is not None:
+        if steady_state:
+            raise ValueError("island migra por generaciones y no es compatible con steady_state")
+        if checkpoint is not None and 'migrator' in checkpoint['extra']:
+            migrator = checkpoint['extra']['migrator']
+        else:
+            migrator = FileMigrator(island, LexicoFitness)
+        ea.migrator = migrator
+    # Con array_population la selección y el reemplazo ordenan la población con np.lexsort en
+    # lugar de comparar LexicoFitness par a par (ver population.py)
+    if array_population:
+        ea.selector = tournament_selection
+        ea.replacer = plus_replacement
 
-    timestamp = datetime.now().strftime("%m%d%Y-%H%M%S")
-    folder_name = f"GABotsLit_{timestamp}"
+    timestamp = datetime.now().strftime("%m%d%Y-%H%M%S") if checkpoint is None else checkpoint['settings']['timestamp']
+    folder_name = f"GABotsLit_{timestamp}" if island is None else f"GABotsLit_{timestamp}_island{island.index}"
     results_folder = f"./resultados/{folder_name}"
     os.makedirs(results_folder, exist_ok=True)
 
-    inicio = time()
-    final_pop = ea.evolve(generator=generate_agent,
-                          evaluator=evaluators.parallel_evaluation_mp,
+    # Con results_log cada generación se añade como registros binarios de tipo fijo a
+    # results-log-<timestamp>.bin (ver results_log.py); con text_results=False no se escriben
+    # además los inspyred-statistics-file e inspyred-individuals-file
+    if not text_results and not results_log:
+        raise ValueError("text_results=False necesita results_log para guardar los resultados")
+    results_logger = None
+    if results_log:
+        results_logger = ResultsLog(f"{results_folder}/results-log-{timestamp}.bin",
+                                    after_generation=checkpoint['num_generations'] if checkpoint is not None else None)
+
+    if shard_games and (racing is not None or adaptive is not None or cell_store_path is not None):
+        raise ValueError("shard_games no es compatible con racing, adaptive ni cell_store_path "
+                         "(sus evaluadores ya reparten las partidas sueltas y sustituirían al de shard_games)")
+
+    # Con use_jvm_server cada proceso de evaluación es una JVM persistente en lugar de un
+    # subprocess java por candidato
+    evaluation_server = None
+    lean = None
+    evaluator = evaluators.parallel_evaluation_mp
+    if lean_evaluator and not (use_jvm_server or farm is not None or game_backend is not None or shard_games or
+                               racing is not None or adaptive is not None or cell_store_path is not None or
+                               steady_state):
+        # Pool persistente que solo envía el genoma y un contexto pequeño (no todo args)
+        lean = LeanEvaluator(evaluate_candidate, mp_nprocs,
+                             context={'folder_name': folder_name, 'supervision': supervision, 'trace': trace,
+                                      'game_seed': game_seed},
+                             log_path=f"{results_folder}/lean-evaluator-log-{timestamp}.csv")
+        evaluator = lean
+    if use_jvm_server:
+        evaluation_server = EvaluationServerPool(mp_nprocs)
+    # Con farm ('host:puerto') las peticiones van a los trabajadores de farm.py conectados al broker
+    if farm is not None:
+        evaluation_server = Broker.from_address(farm)
+    # Con game_backend ('replay' u otro objeto con la interfaz de EvaluationServerPool) las partidas
+    # no las juega MicroRTS (ver game_backend.py)
+    if game_backend is not None:
+        evaluation_server = make_backend(game_backend, mp_nprocs)
+    if evaluation_server is not None:
+        evaluation_server.start()
+        evaluator = evaluate_agents_server
+
+    # Sin evaluation_server las evaluaciones por partidas sueltas (shard_games, racing, adaptive y
+    # celdas) comparten un Pool durante todo el experimento, como LeanEvaluator
+    game_pool = None
+    if evaluation_server is None and not steady_state and (shard_games or racing is not None or
+                                                           adaptive is not None or cell_store_path is not None):
+        game_pool = Pool(processes=mp_nprocs)
+
+    # Configuración del torneo (mapas, oponentes, iteraciones): la usan la caché y el reparto por partidas
+    config = None
+    if (shard_games or racing is not None or adaptive is not None or cell_store_path is not None or
+            fitness_cache_path is not None):
+        config = driver_config('EvaluationTournament', evaluation_server)
+        if adaptive is not None:
+            # Los fitness adaptativos no se mezclan en la caché con los de iteraciones fijas
+            config = dict(config, adaptive=adaptive._asdict())
+        if game_seed is not None:
+            # Con game_seed cada partida lleva una semilla derivada de (genoma, mapa, oponente, iteración)
+            # (ver seeding.py); la caché y el almacén de celdas no mezclan semillas distintas
+            config = dict(config, game_seed=game_seed)
+
+    # Con shard_games la unidad de trabajo es la partida y no el torneo completo de un candidato
+    if shard_games:
+        evaluator = evaluate_agents_sharded
+
+    # Con cell_store_path cada partida se guarda por (genoma, oponente, mapa, iteración, ajustes) y los
+    # torneos se construyen con las celdas guardadas: al cambiar oponentes o mapas solo se juegan las nuevas
+    cell_store = None
+    if cell_store_path is not None:
+        if racing is not None or adaptive is not None or steady_state:
+            raise ValueError("cell_store_path no es compatible con racing, adaptive ni steady_state")
+        cell_store = CellStore(cell_store_path, config)
+        evaluator = evaluate_agents_cells
+
+    # Con racing ('exact' o 'hoeffding') las partidas se juegan por lotes y se cortan las evaluaciones perdidas
+    racing_stats_file = None
+    racing_stats = {'generations': 0, 'truncated': 0, 'games_played': 0, 'games_saved': 0}
+    if racing is not None:
+        evaluator = evaluate_agents_racing
+        racing_stats_file = f"{results_folder}/racing-statistics-file-{timestamp}.csv"
+        with open(racing_stats_file, 'w') as file:
+            file.write("generation, candidates, truncated, games_played, games_saved\n")
+
+    # Con adaptive (AdaptivePolicy) cada celda (mapa, oponente) juega partidas por rondas hasta que
+    # su test secuencial (SPRT o anchura del intervalo de Wilson) se decide
+    adaptive_stats_file = None
+    adaptive_stats = {'generations': 0, 'games_played': 0, 'games_saved': 0}
+    if adaptive is not None:
+        if racing is not None or steady_state:
+            raise ValueError("adaptive no es compatible con racing ni con steady_state")
+        evaluator = evaluate_agents_adaptive
+        adaptive_stats_file = f"{results_folder}/adaptive-statistics-file-{timestamp}.csv"
+        if checkpoint is None:
+            with open(adaptive_stats_file, 'w') as file:
+                file.write("generation, games_played, games_saved, " + ", ".join(
+                    f"m{map_idx}_o{opponent}" for map_idx in range(len(config['maps']))
+                    for opponent in range(len(config['opponents']))) + "\n")
+
+    # Con trace ('json' o 'csv') cada evaluación escribe en la traza en qué se fue su tiempo
+    # (cola, arranque de la JVM, cada partida, E/S y parseo); resumen: python tracing.py <traza>
+    tracer = None
+    traced_evaluator = None
+    if trace is not None:
+        tracer = TraceWriter(f"{results_folder}/evaluation-trace-{timestamp}.{trace}", trace)
+        traced_evaluator = evaluator
+        evaluator = evaluate_traced
+
+    # Con supervision (SupervisionPolicy) cada ejecución tiene límite de tiempo y reintentos; los
+    # fallos definitivos se contabilizan por generación y los genomas que fallan una y otra vez
+    # quedan en cuarentena
+    failure_tracker = None
+    supervised_evaluator = None
+    if supervision is not None:
+        if checkpoint is not None and 'failure_tracker' in checkpoint['extra']:
+            failure_tracker = checkpoint['extra']['failure_tracker']
+        else:
+            failure_tracker = FailureTracker(supervision.quarantine_after,
+                                             report_path=f"{results_folder}/failure-report-{timestamp}.csv")
+        supervised_evaluator = evaluator
+        evaluator = evaluate_supervised
+
+    # Con surrogate (proporción de descendientes que juegan el torneo real) un proceso gaussiano
+    # entrenado con las ejecuciones anteriores y la actual descarta el resto sin jugar partidas.
+    # Los descartados cuentan en max_evaluations, como las evaluaciones truncadas por racing
+    surrogate_screen = None
+    surrogate_evaluator = None
+    if surrogate is not None:
+        if steady_state:
+            raise ValueError("surrogate preselecciona por generaciones y no es compatible con steady_state")
+        if checkpoint is not None and 'surrogate' in checkpoint['extra']:
+            surrogate_screen = checkpoint['extra']['surrogate']
+        else:
+            surrogate_screen = SurrogateScreen.from_results(
+                fraction=surrogate, seed=seed_value,
+                report_path=f"{results_folder}/surrogate-statistics-file-{timestamp}.csv")
+        surrogate_evaluator = evaluator
+        evaluator = evaluate_with_surrogate
+
+    # La caché se consulta antes de cualquier evaluación; el evaluador real pasa a cache_evaluator
+    fitness_cache = None
+    cache_evaluator = None
+    if fitness_cache_path is not None:
+        fitness_cache = FitnessCache(fitness_cache_path, config)
+        cache_evaluator = evaluator
+        evaluator = evaluate_with_cache
+
+    evolve_args = dict(generator=generate_agent,
                           pop_size=pop_size,
                         seeds = [
                               # agentes GABotsLit
@@ -286,32 +788,241 @@ def run_experiment(mp_nprocs=15, evaluations=2, pop_size=2):
                           max_time = 300000,
                           mp_evaluator=evaluate_agent,
                           mp_nprocs=mp_nprocs,
-                          folder_name=folder_name)
+                          folder_name=folder_name,
+                          evaluation_server=evaluation_server,
+                          game_pool=game_pool,
+                          fitness_cache=fitness_cache,
+                          cache_evaluator=cache_evaluator,
+                          tournament_config=config,
+                          game_seed=game_seed,
+                          racing=racing,
+                          racing_delta=racing_delta,
+                          racing_stats_file=racing_stats_file,
+                          racing_stats=racing_stats,
+                          adaptive=adaptive,
+                          cell_store=cell_store,
+                          adaptive_stats_file=adaptive_stats_file,
+                          adaptive_stats=adaptive_stats,
+                          supervision=supervision,
+                          failure_tracker=failure_tracker,
+                          supervised_evaluator=supervised_evaluator,
+                          trace=trace,
+                          tracer=tracer,
+                          traced_evaluator=traced_evaluator,
+                          surrogate=surrogate_screen,
+                          surrogate_evaluator=surrogate_evaluator)
+
+    # Checkpoint atómico en cada generación (población, Random, contadores, tiempo, caché y racing)
+    def extra_state():
+        extra = {'racing_stats': dict(racing_stats), 'adaptive_stats': dict(adaptive_stats)}
+        if fitness_cache is not None:
+            extra['cache_counters'] = cache_counters(fitness_cache)
+        if failure_tracker is not None:
+            extra['failure_tracker'] = failure_tracker
+        if surrogate_screen is not None:
+            extra['surrogate'] = surrogate_screen
+        if migrator is not None:
+            extra['migrator'] = migrator
+        return extra
+
+    # Las islas arrancan a la vez en el mismo directorio: cada una escribe los ficheros de
+    # file_observer en su carpeta de resultados (al reanudar se reabren los del checkpoint)
+    if island is not None and text_results and checkpoint is None:
+        evolve_args['statistics_file'] = open(f"{results_folder}/inspyred-statistics-file-{timestamp}.csv", 'w')
+        evolve_args['individuals_file'] = open(f"{results_folder}/inspyred-individuals-file-{timestamp}.csv", 'w')
+
+    observers = ([ea.observer] if text_results else []) + ([failure_tracker] if failure_tracker is not None else []) + \
+        ([tracer] if tracer is not None else []) + ([surrogate_screen] if surrogate_screen is not None else []) + \
+        ([results_logger] if results_logger is not None else [])
+    generation_offset, evaluation_offset, elapsed_offset = 0, 0, 0.0
+    resumed_fitness = None
+    if checkpoint is not None:
+        # La población guardada entra como semillas con su fitness: no se vuelve a evaluar nada
+        state = resume_state(resume, observers)
+        observers = state['observers']
+        resumed_fitness = state['fitness']
+        generation_offset = state['num_generations']
+        evaluation_offset = state['num_evaluations'] - len(state['seeds'])
+        elapsed_offset = state['elapsed']
+        evolve_args.update(state['file_args'])
+        evolve_args['seeds'] = state['seeds']
+        if not steady_state:
+            evolve_args['num_selected'] = pop_size
+        evolve_args['pop_size'] = min(pop_size, len(state['seeds']))
+        evolve_args['max_evaluations'] = evaluations - state['num_evaluations'] + len(state['seeds'])
+        evolve_args['max_time'] -= elapsed_offset
+        racing_stats.update(state['extra']['racing_stats'])
+        adaptive_stats.update(state['extra'].get('adaptive_stats', {}))
+        if fitness_cache is not None and 'cache_counters' in state['extra']:
+            restore_cache_counters(fitness_cache, state['extra']['cache_counters'])
+        evaluator = ResumedEvaluator(evaluator, resumed_fitness)
+        print(f"Reanudando {folder_name} en la generación {state['num_generations']} "
+              f"({state['num_evaluations']} evaluaciones, {elapsed_offset:.0f}s)")
+    checkpointer = CheckpointObserver(results_folder, {'experiment': experiment, 'seed': seed_value, 'timestamp': timestamp},
+                                      extra_state=extra_state, generation_offset=generation_offset,
+                                      evaluation_offset=evaluation_offset, elapsed_offset=elapsed_offset)
+    ea.observer = observers + [checkpointer]
+
+    inicio = time() - elapsed_offset   # al reanudar cuenta también el tiempo ya empleado
+    if steady_state:
+        # Sin barrera de generación: cada trabajador libre recibe un hijo nuevo
+        ea = SteadyStateEC(rand, ea.selector, ea.variator, ea.observer)
+        if evaluation_server is not None:
+            executor = ThreadPoolExecutor(max_workers=mp_nprocs)
+            evaluate = partial(evaluate_agent_server, args={'evaluation_server': evaluation_server,
+                                                            'supervision': supervision, 'trace': trace,
+                                                            'game_seed': game_seed})
+        else:
+            executor = ProcessPoolExecutor(max_workers=mp_nprocs)
+            evaluate = partial(evaluate_candidate, context={'supervision': supervision, 'trace': trace,
+                                                            'game_seed': game_seed})
+        submit, on_evaluated = steady_state_submit(executor, evaluate, fitness_cache)
+        if tracer is not None:
+            submit = traced_submit(submit, tracer)
+        if failure_tracker is not None:
+            submit = supervised_submit(submit, failure_tracker)
+        if resumed_fitness is not None:
+            submit = resumed_submit(submit, resumed_fitness)
+        final_pop = ea.evolve(submit=submit, concurrency=mp_nprocs, on_evaluated=on_evaluated, **evolve_args)
+        executor.shutdown(wait=True)
+    else:
+        final_pop = ea.evolve(evaluator=evaluator, **evolve_args)
     fin = time()
 
-    final_pop.sort(reverse=True)
+    if evaluation_server is not None:
+        farm_stats = evaluation_server.stats() if farm is not None else None
+        evaluation_server.close()
+    if lean is not None:
+        lean_stats = lean.stats()
+        lean.close()
+    if game_pool is not None:
+        game_pool.close()
+        game_pool.join()
+    if fitness_cache is not None:
+        cache_stats = fitness_cache.stats()
+        fitness_cache.close()
+    if cell_store is not None:
+        cell_stats = cell_store.stats()
+        cell_store.close()
+
+    if array_population:
+        final_pop = [final_pop[idx] for idx in lexico_order(to_array(final_pop))]
+    else:
+        final_pop.sort(reverse=True)
 
     stats_file = f"{results_folder}/stats_ga_{timestamp}.txt"
     with open(stats_file, 'w') as file:
         file.write(f"Seed: {seed_value}\n")
+        if game_seed is not None:
+            file.write(f"Game seed: {game_seed} (seeded MyAgent games)\n")
         file.write(f"{fin-inicio} seconds employed\n")
         file.write(f"{evaluations} evaluations\n")
         file.write(f"{pop_size} pop size\n")
         file.write(f"{mp_nprocs} mp_nprocs\n")
+        if fitness_cache is not None:
+            file.write(f"Fitness cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                       f"{cache_stats['evictions']} evictions, {cache_stats['entries']} entries\n")
+        if lean is not None:
+            comparison = (f" (parallel_evaluation_mp: {lean_stats['inspyred_bytes']:.0f})"
+                          if lean_stats['inspyred_bytes'] is not None else "")
+            file.write(f"Lean evaluator: {lean_stats['payload_bytes']:.0f} bytes/candidate{comparison}, "
+                       f"{lean_stats['dispatch_latency_ms']:.1f} ms mean dispatch latency\n")
+        if farm is not None:
+            file.write(f"Farm: {farm_stats['requeued']} requeued tasks, tasks per worker: {farm_stats['workers']}\n")
+        if game_backend is not None:
+            file.write(f"Game backend: {type(evaluation_server).__name__}\n")
+        if failure_tracker is not None:
+            failure_stats = failure_tracker.stats()
+            file.write(f"Supervision: {failure_stats['failed']} failed, {failure_stats['timeouts']} timeouts, "
+                       f"{failure_stats['retries']} retries, {failure_stats['skipped']} skipped, "
+                       f"{failure_stats['quarantined']} quarantined genomes\n")
+        if tracer is not None:
+            trace_stats = tracer.stats()
+            file.write(f"Trace: {trace_stats['evaluations']} evaluations in {os.path.basename(tracer.path)}, seconds per phase: "
+                       + ", ".join(f"{phase} {trace_stats[phase]:.1f}" for phase in PHASES) + "\n")
+        if surrogate_screen is not None:
+            surrogate_stats = surrogate_screen.stats()
+            file.write(f"Surrogate ({surrogate}): {surrogate_stats['evaluated']} real evaluations, "
+                       f"{surrogate_stats['avoided']} avoided, {surrogate_stats['training_points']} training genomes\n")
+        if array_population:
+            file.write(f"Array population: np.lexsort selection and replacement, "
+                       f"final population in Final_population_{timestamp}.npy\n")
+        if migrator is not None:
+            migration_stats = migrator.stats()
+            file.write(f"Island {island.index}/{island.islands} ({island.topology}, receives from "
+                       f"{migration_stats['sources']}): {migration_stats['sent']} migrants sent, "
+                       f"{migration_stats['received']} received\n")
+        if cell_store is not None:
+            file.write(f"Cell store: {cell_stats['reused']} cells reused, {cell_stats['played']} cells played, "
+                       f"{cell_stats['entries']} entries\n")
+        if adaptive is not None:
+            file.write(f"Adaptive ({adaptive.test}): {adaptive_stats['games_played']} games played, "
+                       f"{adaptive_stats['games_saved']} games saved against fixed iterations "
+                       f"(negative: extra games spent on undecided cells)\n")
+        if racing is not None:
+            file.write(f"Racing ({racing}): {racing_stats['games_played']} games played, "
+                       f"{racing_stats['games_saved']} games saved, {racing_stats['truncated']} truncated evaluations\n")
+        if results_logger is not None:
+            log_stats = results_logger.stats()
+            file.write(f"Results log: {log_stats['records']} records ({log_stats['bytes']} bytes) in "
+                       f"{os.path.basename(results_logger.path)}"
+                       + ("" if text_results else ", inspyred text files disabled") + "\n")
         file.write("Best individual\n")
         file.write(f"{str(final_pop[0])}\n")
 
     pd.DataFrame(final_pop).to_csv(f"{results_folder}/Final_population_{timestamp}.csv")
+    if array_population:
+        save_population(f"{results_folder}/Final_population_{timestamp}.npy", final_pop)
     
     return final_pop[0], fin-inicio
 
+def resume_experiment(results_folder):
+    """Continúa el experimento de results_folder desde su último checkpoint."""
+    settings = load_checkpoint(results_folder)['settings']
+    return run_experiment(**settings['experiment'], resume=results_folder)
+
 if __name__ == "__main__":
+    # python GAmicroRTS.py --resume <carpeta_resultados> continúa un experimento interrumpido
+    if len(sys.argv) == 3 and sys.argv[1] == '--resume':
+        best_individual, tiempo = resume_experiment(sys.argv[2])
+        print(f"Mejor: {str(best_individual)}, Tiempo: {tiempo:.2f}s\n")
+        sys.exit(0)
+
     NUM_EXPERIMENTS = 1
     MP_NPROCS = 10
     EVALUATIONS = 15
     POP_SIZE = 15
+    USE_JVM_SERVER = False  # True: cada proceso de evaluación es una JVM persistente (ver jvm_evaluation.py)
+    # p.ej. "./resultados/fitness_cache_gabotslit.sqlite": reutiliza fitness entre ejecuciones; solo
+    # válida con la misma compilación de MyAgent (borrar el fichero tras cambiar el código Java)
+    FITNESS_CACHE_PATH = None
+    SHARD_GAMES = False  # True: reparte las partidas (mapa, oponente, iteración) entre los procesos
+    RACING = None  # 'exact', 'hoeffding' o None para jugar siempre el torneo completo
+    STEADY_STATE = False  # evolución asíncrona sin barrera de generación
+    FARM = None  # 'host:puerto' del broker (fuera de 127.0.0.1 exige MICRORTS_FARM_TOKEN); trabajadores: python farm.py worker host:puerto --capacity N
+    TRACE = None  # 'json' (Chrome trace) o 'csv' para trazar los tiempos de cada evaluación
+    GAME_BACKEND = None  # 'replay' para probar la orquestación sin MicroRTS (ver game_backend.py)
+    SURROGATE = None  # proporción de descendientes que juegan el torneo real tras la preselección (p.ej. 0.5)
+    ARRAY_POPULATION = False  # selección y reemplazo vectorizados con np.lexsort (poblaciones grandes)
+    ADAPTIVE = None  # AdaptivePolicy('sprt') o AdaptivePolicy('wilson') para partidas adaptativas por celda
+    CELL_STORE_PATH = None  # p.ej. "./resultados/cell_store.sqlite": partidas guardadas por (genoma, oponente, mapa)
+    GAME_SEED = None  # semilla base de las partidas (int) para resultados reproducibles; None sin semilla
+    ISLAND = None  # IslandSpec(i, n, 'ring', ...) para ejecutar una isla; todas a la vez: python islands.py run
+    RESULTS_LOG = False  # registro binario de la población de cada generación (ver results_log.py)
+    TEXT_RESULTS = True  # False para no escribir los inspyred-*-file de texto (requiere RESULTS_LOG)
+    # Límites de tiempo (segundos), reintentos y cuarentena de las ejecuciones java (None sin supervisión),
+    # p.ej. SupervisionPolicy(game_timeout=120, evaluation_timeout=1800, retries=2, backoff=1.0, quarantine_after=3)
+    SUPERVISION = None
 
     for i in range(NUM_EXPERIMENTS):
         print(f"Experimento {i+1}/{NUM_EXPERIMENTS}")
-        best_individual, tiempo = run_experiment(mp_nprocs=MP_NPROCS, evaluations=EVALUATIONS, pop_size=POP_SIZE)
+        best_individual, tiempo = run_experiment(mp_nprocs=MP_NPROCS, evaluations=EVALUATIONS, pop_size=POP_SIZE,
+                                                 use_jvm_server=USE_JVM_SERVER, fitness_cache_path=FITNESS_CACHE_PATH,
+                                                 shard_games=SHARD_GAMES, racing=RACING, steady_state=STEADY_STATE,
+                                                 supervision=SUPERVISION, farm=FARM, trace=TRACE,
+                                                 game_backend=GAME_BACKEND, surrogate=SURROGATE,
+                                                 array_population=ARRAY_POPULATION, adaptive=ADAPTIVE,
+                                                 cell_store_path=CELL_STORE_PATH, island=ISLAND,
+                                                 results_log=RESULTS_LOG, text_results=TEXT_RESULTS,
+                                                 game_seed=GAME_SEED + i if GAME_SEED is not None else None)
         print(f"Mejor: {str(best_individual)}, Tiempo: {tiempo:.2f}s\n")
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Número de partidas adaptativo por celda (mapa, oponente) del torneo de evaluación.
+
+EvaluationTournament juega siempre ITERATIONS partidas en cada celda: un candidato que
+gana siempre a WorkerRush en todos los mapas las juega todas, y los enfrentamientos
+igualados se quedan con pocas muestras. Aquí las partidas de cada candidato se piden por
+rondas (increment partidas por celda y ronda, con el mismo reparto en partidas sueltas
+que shard_games) y cada celda deja de muestrearse cuando su test secuencial se decide:
+
+- 'sprt': test de razón de verosimilitudes secuencial de Wald entre una tasa de
+  puntuación p0 (la celda se pierde) y p1 (se gana), con errores alpha y beta.
+- 'wilson': el intervalo de Wilson (95%) de la tasa de puntuación es más estrecho que width.
+
+Cada celda juega entre min_games y max_games partidas (por defecto el doble de las
+iteraciones del torneo). La puntuación de una partida es 1 si se gana, 0.5 si se empata
+y 0 si se pierde.
+"""
+
+from collections import namedtuple
+from math import log, sqrt
+from multiprocessing import Pool
+
+import numpy as np
+
+from game_units import merge_game_units, play_game_tasks, unit_task
+from jvm_evaluation import CLASS_PATH
+
+ADAPTIVE_TESTS = ('sprt', 'wilson')
+
+AdaptivePolicy = namedtuple('AdaptivePolicy',
+                            ['test', 'increment', 'min_games', 'max_games', 'p0', 'p1', 'alpha', 'beta', 'width'])
+AdaptivePolicy.__new__.__defaults__ = ('sprt', 1, 2, None, 0.25, 0.75, 0.1, 0.1, 0.5)
+AdaptivePolicy.__doc__ = """
+Parámetros del muestreo adaptativo (pequeño y serializable: se guarda en el checkpoint).
+
+    test (str): 'sprt' o 'wilson'
+    increment (int): partidas por celda no decidida en cada ronda
+    min_games (int): partidas mínimas por celda antes de aplicar el test
+    max_games (int): partidas máximas por celda (None: el doble de las iteraciones del torneo)
+    p0, p1 (float): tasas de puntuación de las hipótesis del SPRT (celda perdida / ganada)
+    alpha, beta (float): errores de tipo I y II del SPRT
+    width (float): anchura del intervalo de Wilson con la que se da la celda por decidida
+"""
+
+
+def wilson_interval(score, n, z=1.96):
+    """Intervalo de Wilson de una tasa de puntuación (score de n partidas)."""
+    if n == 0:
+        return 0.0, 1.0
+    p = score / n
+    center = (p + z * z / (2 * n)) / (1 + z * z / n)
+    radius = z * sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, center - radius), min(1.0, center + radius)
+
+
+def sprt_decision(score, n, p0=0.25, p1=0.75, alpha=0.1, beta=0.1):
+    """
+    Decisión del SPRT de Wald con n partidas y puntuación score.
+
+    Returns:
+        int: 1 si acepta p1, -1 si acepta p0, 0 si todavía no decide
+    """
+    llr = score * log(p1 / p0) + (n - score) * log((1 - p1) / (1 - p0))
+    if llr >= log((1 - beta) / alpha):
+        return 1
+    if llr <= log(beta / (1 - alpha)):
+        return -1
+    return 0
+
+
+def cell_decided(score, n, policy, max_games):
+    """Indica si una celda con n partidas y puntuación score ya no necesita más partidas."""
+    if n >= max_games:
+        return True
+    if n < policy.min_games:
+        return False
+    if policy.test == 'sprt':
+        return sprt_decision(score, n, policy.p0, policy.p1, policy.alpha, policy.beta) != 0
+    low, high = wilson_interval(score, n)
+    return high - low <= policy.width
+
+
+def cell_scores(games, n_maps, n_opponents):
+    """
+    Partidas y puntuación de cada celda (mapa, oponente) a partir de las partidas en columnas.
+
+    Returns:
+        tuple: (partidas (mapas x oponentes), puntuación (mapas x oponentes))
+    """
+    counts = np.zeros((n_maps, n_opponents), dtype=np.int64)
+    scores = np.zeros((n_maps, n_opponents))
+    np.add.at(counts, (games['map'], games['ai2']), 1)
+    score = (games['winner'] == 0) + 0.5 * (games['winner'] == -1)
+    np.add.at(scores, (games['map'], games['ai2']), score)
+    return counts, scores
+
+
+def play_adaptive(candidates, config, policy, evaluation_server=None, processes=None, class_path=CLASS_PATH,
+                  supervision=None, pool=None):
+    """
+    Juega las partidas de los candidatos por rondas hasta decidir todas sus celdas.
+
+    Args:
+        candidates (list): genomas a evaluar
+        config (dict): configuración de EvaluationTournament
+        policy (AdaptivePolicy): test y límites del muestreo
+        evaluation_server (EvaluationServerPool): JVMs persistentes; si es None se usa un multiprocessing.Pool
+        processes (int): procesos del Pool (ignorado con evaluation_server)
+        class_path (str): classpath de Java
+        supervision (SupervisionPolicy): límites de tiempo y reintentos por partida (None sin supervisión)
+        pool (multiprocessing.Pool): procesos del experimento (ignorado con evaluation_server); si es
+            None se crea uno de processes procesos para esta llamada
+
+    Returns:
+        list: (partidas, resumen, partidas por celda (mapas x oponentes)) de cada candidato; el
+              resumen es None si alguna partida falló
+    """
+    if policy.test not in ADAPTIVE_TESTS:
+        raise ValueError(f"Test secuencial desconocido: {policy.test} (opciones: {ADAPTIVE_TESTS})")
+    n_maps, n_opponents = len(config['maps']), len(config['opponents'])
+    max_games = policy.max_games if policy.max_games is not None else 2 * config['iterations']
+
+    units = [[] for _ in candidates]      # (mapa, oponente, iteración) jugadas por cada candidato
+    played = [[] for _ in candidates]     # resultados de esas partidas
+    counts = [np.zeros((n_maps, n_opponents), dtype=np.int64) for _ in candidates]
+    scores = [np.zeros((n_maps, n_opponents)) for _ in candidates]
+    active = list(range(len(candidates)))
+
+    own_pool = pool is None and evaluation_server is None
+    if own_pool:
+        pool = Pool(processes=processes)
+    try:
+        while active:
+            round_units = []
+            for idx in active:
+                pending = [(map_idx, opponent, int(counts[idx][map_idx, opponent]) + k)
+                           for map_idx in range(n_maps) for opponent in range(n_opponents)
+                           if not cell_decided(scores[idx][map_idx, opponent], counts[idx][map_idx, opponent],
+                                               policy, max_games)
+                           for k in range(min(policy.increment, max_games - int(counts[idx][map_idx, opponent])))]
+                round_units.append(pending)
+            tasks = [unit_task(candidates[idx], unit, class_path, supervision, config)
+                     for idx, pending in zip(active, round_units) for unit in pending]
+            results = play_game_tasks(tasks, evaluation_server=evaluation_server, pool=pool) if tasks else []
+
+            still_active = []
+            position = 0
+            for idx, pending in zip(active, round_units):
+                batch = results[position:position + len(pending)]
+                position += len(pending)
+                units[idx].extend(pending)
+                played[idx].extend(batch)
+                if not pending or any(summary is None for _, summary in batch):
+                    continue   # celdas decididas o evaluación fallida: no se siguen jugando partidas
+                games, _ = merge_game_units(pending, batch, n_opponents)
+                new_counts, new_scores = cell_scores(games, n_maps, n_opponents)
+                counts[idx] += new_counts
+                scores[idx] += new_scores
+                still_active.append(idx)
+            active = still_active
+    finally:
+        if own_pool:
+            pool.close()
+            pool.join()
+
+    outcomes = []
+    for idx in range(len(candidates)):
+        games, summary = merge_game_units(units[idx], played[idx], n_opponents)
+        outcomes.append((games, summary, counts[idx]))
+    return outcomes
+
+
+def adaptive_victories(games, cell_games, iterations):
+    """
+    Victorias (más 0.5 por empate) equivalentes a un torneo de iterations partidas por celda:
+    la tasa de puntuación de cada celda por iterations, sumada sobre las celdas.
+    """
+    n_maps, n_opponents = cell_games.shape
+    _, scores = cell_scores(games, n_maps, n_opponents)
+    rates = np.divide(scores, cell_games, out=np.zeros_like(scores), where=cell_games > 0)
+    return float(rates.sum() * iterations)
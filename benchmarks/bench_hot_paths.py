@@ -0,0 +1,398 @@
+"""
+Benchmark de los caminos calientes de Python del orquestador, con fixtures grabadas y
+comparación con una línea base.
+
+Cubre, para poblaciones de 15 a 1000 individuos:
+
+- lexico_sort: final_pop.sort(reverse=True) con Individual de inspyred y LexicoFitness
+- array_sort: el mismo orden con population.lexico_order (volcado al array incluido)
+- parse_records: parse_tournament_output sobre los registros JSON de los torneos
+- legacy_parse: pd.read_csv + load_tournament_games_from_df (la ruta anterior, como referencia)
+- ga_fitness: tournament_fitness (meantime_to_win / meantime_to_lose de GAmicroRTS)
+- coev_fitness: meantime_to_win / meantime_to_lose / count_total_wins / count_total_ties
+  de CoEvGAmicroRTS para los dos agentes de cada enfrentamiento
+- round_robin_elo: generate_all_round_pairings y actualización Elo secuencial de todas las rondas
+
+y, sobre los ficheros de resultados/ tal cual, los cargadores de las visualizaciones
+(load_statistics_data de fitness_generaciones, que necesita seaborn, y los parsers de
+tabla_estadisticas_gabotslits).
+
+Las fixtures de benchmarks/fixtures son torneos de EvaluationTournament (60 partidas) y
+enfrentamientos de CoEvEvaluationGame (20 partidas) en el formato de registros JSON de los
+drivers, generados a partir de los fitness de los inspyred-individuals-file de resultados/
+(victorias y tiempos medios de victoria y derrota). Se regeneran con --record.
+
+Uso:
+    python benchmarks/bench_hot_paths.py                     # compara con la línea base
+    python benchmarks/bench_hot_paths.py --save-baseline     # guarda la línea base
+    python benchmarks/bench_hot_paths.py --sizes 15 100 --only lexico_sort ga_fitness
+
+Sale con código 1 si algún benchmark es más lento que la línea base en más de --tolerance.
+La línea base depende de la máquina: conviene guardarla en la misma en la que se compara.
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import re
+import sys
+import tempfile
+from random import Random
+from time import perf_counter
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'visualizaciones'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from inspyred.ec import Individual  # noqa: E402
+
+import CoEvGAmicroRTS as coev  # noqa: E402
+import GAmicroRTS as ga  # noqa: E402
+import population as array_population  # noqa: E402
+import tabla_estadisticas_gabotslits as tabla  # noqa: E402
+from bench_tournament_parser import legacy_parse  # noqa: E402
+from tournament_results import parse_tournament_output  # noqa: E402
+
+try:
+    from fitness_generaciones import load_statistics_data
+except ImportError:   # seaborn/matplotlib no instalados: se omite ese cargador
+    load_statistics_data = None
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_hot_paths.json')
+RESULTS = os.path.join(ROOT, 'resultados')
+SIZES = (15, 100, 1000)
+MAX_GAME_LENGTH = 14000
+FITNESS_PATTERN = re.compile(r'\(([\d.]+|inf), ([\d.]+|inf), ([\d.]+|inf)\)')
+
+
+def recorded_fitness(prefix='GABotsLit'):
+    """Fitness (victorias, tiempo de victoria, tiempo de derrota) de los inspyred-individuals-file de resultados/."""
+    fitness = []
+    for path in sorted(glob.glob(os.path.join(RESULTS, f'{prefix}_*', 'inspyred-individuals-file-*.csv'))):
+        with open(path) as f:
+            for line in f:
+                match = FITNESS_PATTERN.search(line)
+                if match:
+                    fitness.append(tuple(float(value) for value in match.groups()))
+    return fitness
+
+
+def game_time(rand, mean):
+    """Duración de una partida alrededor de un tiempo medio registrado."""
+    if not np.isfinite(mean) or mean <= 0:
+        mean = MAX_GAME_LENGTH / 4
+    return int(min(MAX_GAME_LENGTH, max(100, rand.gauss(mean, mean / 4))))
+
+
+def tournament_records(rand, fitness, n_maps=5, n_opponents=3, iterations=4):
+    """Registros de un torneo de EvaluationTournament coherentes con un fitness registrado."""
+    n_games = n_maps * n_opponents * iterations
+    score, win_time, lose_time = fitness
+    wins = min(n_games, int(score))
+    ties = min(n_games - wins, int(round(2 * (score - wins))))
+    outcomes = [0] * wins + [-1] * ties + [1] * (n_games - wins - ties)
+    rand.shuffle(outcomes)
+    records = []
+    wins_block = [[0] * n_opponents]
+    ties_block = [[0] * n_opponents]
+    slots = [(iteration, m, opponent) for iteration in range(iterations) for m in range(n_maps)
+             for opponent in range(n_opponents)]
+    for (iteration, m, opponent), winner in zip(slots, outcomes):
+        time = game_time(rand, win_time if winner == 0 else lose_time) if winner != -1 else MAX_GAME_LENGTH
+        records.append({'type': 'game', 'iteration': iteration, 'map': m, 'ai1': 0, 'ai2': opponent, 'time': time,
+                        'winner': winner, 'crashed': -1, 'timedout': -1})
+        wins_block[0][opponent] += winner == 0
+        ties_block[0][opponent] += winner == -1
+    records.append({'type': 'summary', 'games': n_games, 'wins': wins_block, 'ties': ties_block})
+    return records
+
+
+def match_records(rand, fitness_i, fitness_j, n_maps=5, iterations=2):
+    """Registros de un enfrentamiento de CoEvEvaluationGame (ida y vuelta en cada mapa)."""
+    p_i = (fitness_i[0] + 1) / (fitness_i[0] + fitness_j[0] + 2)
+    records = []
+    wins = [[0, 0], [0, 0]]
+    ties = [[0, 0], [0, 0]]
+    for iteration in range(iterations):
+        for m in range(n_maps):
+            for ai1, ai2 in ((0, 1), (1, 0)):
+                draw = rand.random()
+                first = 0 if ai1 == 0 else 1   # posición del agente i en la partida
+                if draw < 0.1:
+                    winner, time = -1, MAX_GAME_LENGTH
+                else:
+                    i_wins = draw < 0.1 + 0.9 * p_i
+                    winner = first if i_wins else 1 - first
+                    time = game_time(rand, fitness_i[1] if i_wins else fitness_j[1])
+                records.append({'type': 'game', 'iteration': iteration, 'map': m, 'ai1': ai1, 'ai2': ai2,
+                                'time': time, 'winner': winner, 'crashed': -1, 'timedout': -1})
+                if winner == -1:
+                    ties[ai1][ai2] += 1
+                    ties[ai2][ai1] += 1
+                else:
+                    winner_ai = ai1 if winner == 0 else ai2
+                    wins[winner_ai][1 - winner_ai] += 1
+    records.append({'type': 'summary', 'games': 2 * n_maps * iterations, 'wins': wins, 'ties': ties})
+    return records
+
+
+def record_fixtures(n_tournaments=8, n_matches=8, seed=0):
+    """Regenera las fixtures a partir de los fitness registrados en resultados/."""
+    rand = Random(seed)
+    fitness = recorded_fitness()
+    if not fitness:
+        raise SystemExit(f"No hay inspyred-individuals-file en {RESULTS}")
+    os.makedirs(FIXTURES, exist_ok=True)
+    for k in range(n_tournaments):
+        write_records(os.path.join(FIXTURES, f'ga_tournament_{k}.jsonl'),
+                      tournament_records(rand, rand.choice(fitness)))
+    for k in range(n_matches):
+        write_records(os.path.join(FIXTURES, f'coev_match_{k}.jsonl'),
+                      match_records(rand, rand.choice(fitness), rand.choice(fitness)))
+    print(f"Fixtures grabadas en {FIXTURES}: {n_tournaments} torneos y {n_matches} enfrentamientos")
+
+
+def write_records(path, records):
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+
+def load_fixtures(kind):
+    paths = sorted(glob.glob(os.path.join(FIXTURES, f'{kind}_*.jsonl')))
+    if not paths:
+        raise SystemExit(f"No hay fixtures {kind} en {FIXTURES} (generarlas con --record)")
+    fixtures = []
+    for path in paths:
+        with open(path) as f:
+            fixtures.append(f.read().splitlines())
+    return fixtures
+
+
+def write_text_tournament(path, lines):
+    """Escribe una fixture con el formato de texto de FixedOpponentsTournament (el que leía la ruta anterior)."""
+    games, summary = parse_tournament_output(lines)
+    with open(path, 'w') as f:
+        f.write("FixedOpponentsTournament\n")
+        f.write("iteration\tmap\tai1\tai2\ttime\twinner\tcrashed\ttimedout\n")
+        for row in zip(*(games[column] for column in ('iteration', 'map', 'ai1', 'ai2', 'time', 'winner', 'crashed',
+                                                      'timedout'))):
+            f.write('\t'.join(str(value) for value in row) + '\n')
+        for name in ('wins', 'ties'):
+            f.write(f"{name.capitalize()}: \n")
+            for row in summary[name]:
+                f.write('\t'.join(str(value) for value in row) + '\t\n')
+
+
+def tile(items, size):
+    return [items[idx % len(items)] for idx in range(size)]
+
+
+# Cada benchmark recibe el tamaño de población y devuelve la función a cronometrar (la
+# preparación queda fuera de la medida)
+
+def lexico_population(size, context):
+    rand = Random(size)
+    population = []
+    for fitness in (rand.choice(context['fitness']) for _ in range(size)):
+        ind = Individual([rand.random() for _ in range(10)], maximize=True)
+        ind.fitness = ga.LexicoFitness(*fitness)
+        population.append(ind)
+    return population
+
+
+def bench_lexico_sort(size, context):
+    population = lexico_population(size, context)
+    return lambda: list(population).sort(reverse=True)
+
+
+def bench_array_sort(size, context):
+    population = lexico_population(size, context)
+    return lambda: [population[idx] for idx in array_population.lexico_order(array_population.to_array(population))]
+
+
+def bench_parse_records(size, context):
+    tournaments = tile(context['ga_fixtures'], size)
+    return lambda: [parse_tournament_output(lines) for lines in tournaments]
+
+
+def bench_legacy_parse(size, context):
+    paths = tile(context['text_fixtures'], size)
+    return lambda: [legacy_parse(path) for path in paths]
+
+
+def bench_ga_fitness(size, context):
+    parsed = tile([parse_tournament_output(lines) for lines in context['ga_fixtures']], size)
+    return lambda: [ga.tournament_fitness(games, summary) for games, summary in parsed]
+
+
+def bench_coev_fitness(size, context):
+    parsed = tile([parse_tournament_output(lines)[0] for lines in context['coev_fixtures']], size)
+
+    def run():
+        for games in parsed:
+            for ai in (0, 1):
+                coev.meantime_to_win(games, ai)
+                coev.meantime_to_lose(games, ai)
+                coev.count_total_wins(games, ai)
+                coev.count_total_ties(games, ai)
+    return run
+
+
+def bench_round_robin_elo(size, context):
+    rand = Random(size)
+    strength = [rand.choice(context['fitness'])[0] for _ in range(size)]
+
+    def run():
+        ratings = [1200.0] * size
+        for round_matches in coev.generate_all_round_pairings(size):
+            for i, j in round_matches:
+                result = 1.0 if strength[i] > strength[j] else (0.5 if strength[i] == strength[j] else 0.0)
+                ratings[i], ratings[j] = coev.update_elo_ratings(ratings[i], ratings[j], result)
+        return ratings
+    return run
+
+
+def bench_viz_loaders(size, context):
+    runs = sorted(glob.glob(os.path.join(RESULTS, 'GABotsLit_*')))
+
+    def files(pattern):
+        return [path for run in runs for path in glob.glob(os.path.join(run, pattern))]
+    statistics, populations, stats = (files('inspyred-statistics-file-*.csv'), files('Final_population_*.csv'),
+                                      files('stats_ga_*.txt'))
+
+    def run():
+        for path in statistics:
+            tabla.parse_statistics_csv(path)
+            if load_statistics_data is not None:
+                load_statistics_data(path, parse_tuples=True)
+        for path in populations:
+            tabla.parse_final_population(path)
+        for path in stats:
+            tabla.parse_stats_file(path)
+    return run
+
+
+# nombre -> (función, escala con el tamaño de población)
+BENCHMARKS = {
+    'lexico_sort': (bench_lexico_sort, True),
+    'array_sort': (bench_array_sort, True),
+    'parse_records': (bench_parse_records, True),
+    'legacy_parse': (bench_legacy_parse, True),
+    'ga_fitness': (bench_ga_fitness, True),
+    'coev_fitness': (bench_coev_fitness, True),
+    'round_robin_elo': (bench_round_robin_elo, True),
+    'viz_loaders': (bench_viz_loaders, False),
+}
+
+
+def measure(function, budget=1.0, max_repeat=20):
+    """Mejor tiempo de varias ejecuciones (una sola si la primera ya agota el presupuesto)."""
+    times = []
+    spent = 0.0
+    while len(times) < max_repeat and (not times or spent < budget):
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+        spent += times[-1]
+    return min(times)
+
+
+def run_benchmarks(names, sizes, budget):
+    fitness = recorded_fitness()
+    context = {'fitness': fitness, 'ga_fixtures': load_fixtures('ga_tournament'),
+               'coev_fixtures': load_fixtures('coev_match')}
+    text_dir = tempfile.TemporaryDirectory()
+    context['text_fixtures'] = []
+    for k, lines in enumerate(context['ga_fixtures']):
+        path = os.path.join(text_dir.name, f'tournament_{k}.csv')
+        write_text_tournament(path, lines)
+        context['text_fixtures'].append(path)
+
+    results = {}
+    for name in names:
+        function, scales = BENCHMARKS[name]
+        for size in (sizes if scales else [None]):
+            key = f"{name}/{size}" if scales else name
+            results[key] = measure(function(size, context), budget)
+            print(f"  {key:<24} {results[key] * 1000:10.3f} ms", flush=True)
+    text_dir.cleanup()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Imprime la comparación con la línea base y devuelve los benchmarks que empeoran."""
+    regressions = []
+    print(f"\n{'benchmark':<24} {'base (ms)':>12} {'ahora (ms)':>12} {'ratio':>8}")
+    for key, seconds in results.items():
+        if key not in baseline:
+            print(f"{key:<24} {'-':>12} {seconds * 1000:12.3f} {'nuevo':>8}")
+            continue
+        ratio = seconds / baseline[key] if baseline[key] > 0 else float('inf')
+        flag = '  REGRESIÓN' if ratio > 1 + tolerance else ''
+        print(f"{key:<24} {baseline[key] * 1000:12.3f} {seconds * 1000:12.3f} {ratio:8.2f}{flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help='tamaños de población')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help='benchmarks a ejecutar')
+    parser.add_argument('--budget', type=float, default=1.0, help='segundos por medida (mejor de varias)')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='empeoramiento relativo admitido')
+    parser.add_argument('--baseline', default=BASELINE, help='fichero JSON de la línea base')
+    parser.add_argument('--save-baseline', action='store_true', help='guardar los resultados como línea base')
+    parser.add_argument('--record', action='store_true', help='regenerar las fixtures desde resultados/')
+    options = parser.parse_args()
+
+    if options.record:
+        record_fixtures()
+        return
+
+    if load_statistics_data is None:
+        print("fitness_generaciones no se puede importar (falta seaborn/matplotlib): viz_loaders solo mide "
+              "tabla_estadisticas_gabotslits")
+    print(f"Benchmarks (tamaños {options.sizes}):")
+    results = run_benchmarks(options.only, options.sizes, options.budget)
+
+    if options.save_baseline:
+        baseline = {'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                                'processor': platform.processor()},
+                    'results': results}
+        if os.path.exists(options.baseline):
+            with open(options.baseline) as f:
+                previous = json.load(f)['results']
+            baseline['results'] = {**previous, **results}
+        with open(options.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nLínea base guardada en {options.baseline}")
+        return
+
+    if not os.path.exists(options.baseline):
+        print(f"\nNo hay línea base en {options.baseline} (guardarla con --save-baseline)")
+        return
+    with open(options.baseline) as f:
+        baseline = json.load(f)
+    print(f"\nLínea base: Python {baseline['machine']['python']} en {baseline['machine']['platform']}")
+    regressions = compare(results, baseline['results'], options.tolerance)
+    missing = [key for key in results if key not in baseline['results']]
+    if missing:
+        print(f"\nSin línea base (no pueden marcarse como regresión; guardarla con --save-baseline): "
+              f"{', '.join(missing)}")
+    if regressions:
+        print(f"\n{len(regressions)} regresiones de más del {options.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nSin regresiones")
+
+
+if __name__ == '__main__':
+    main()
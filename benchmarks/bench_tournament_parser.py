@@ -0,0 +1,142 @@
+"""
+Benchmark del parser de torneos: tournament_results.parse_tournament_file frente a la
+ruta anterior (pd.read_csv + load_tournament_games_from_df, que se reconstruía con
+df.iterrows() y se volvía a leer con pd.read_csv en cada enfrentamiento).
+
+Uso:
+    python benchmarks/bench_tournament_parser.py "resultados/**/tournament_*.csv" --repeat 20
+
+Si el patrón no encuentra ficheros de torneo grabados se generan ficheros de ejemplo con
+el mismo formato que FixedOpponentsTournament (60 partidas, como en GAmicroRTS) y
+RoundRobinTournament (20 partidas, como en CoEvGAmicroRTS).
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+from io import StringIO
+from random import Random
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from tournament_results import parse_tournament_file  # noqa: E402
+
+
+def legacy_load_tournament_games_from_df(df):
+    """Copia de la función anterior de GAmicroRTS/CoEvGAmicroRTS, solo como referencia."""
+    lines = []
+    for index, row in df.iterrows():
+        row_str = '\t'.join(str(val) if pd.notna(val) else '' for val in row.values)
+        lines.append(row_str + '\n')
+
+    header_line_idx = None
+    stats_start_idx = None
+    for i, line in enumerate(lines):
+        stripped_line = line.strip()
+        if header_line_idx is None and all(col in line for col in ['iteration', 'map', 'ai1', 'ai2']):
+            header_line_idx = i
+        elif stripped_line == "Wins:":
+            stats_start_idx = i
+            break
+
+    if header_line_idx is None:
+        raise ValueError("No se encontró la línea de headers en el DataFrame")
+
+    end_idx = stats_start_idx if stats_start_idx else len(lines)
+    return pd.read_csv(StringIO(''.join(lines[header_line_idx:end_idx])), sep='\t')
+
+
+def legacy_parse(path):
+    return legacy_load_tournament_games_from_df(pd.read_csv(path))
+
+
+def write_sample_tournament(path, rand, n_ais, n_opponents, n_maps, iterations):
+    """Escribe un torneo de ejemplo con el formato de texto de los torneos de MicroRTS."""
+    with open(path, 'w') as f:
+        f.write("FixedOpponentsTournament\nAIs\n")
+        for ai in range(n_ais):
+            f.write(f"\tMyAgent#{ai}[0.20 0.82 0.85 3 0 0.70 0.40 0.30 0.12 0.25 \"\"]\n")
+        f.write("opponent AIs\n")
+        for opponent in range(n_opponents):
+            f.write(f"\tOpponent{opponent}\n")
+        f.write("maps\n")
+        for m in range(n_maps):
+            f.write(f"\tmaps/map{m}.xml\n")
+        f.write(f"iterations\t{iterations}\nmaxGameLength\t14000\ntimeBudget\t100\niterationsBudget\t-1\n"
+                "pregameAnalysisBudget\t0\t0\nfullObservability\ttrue\ntimeoutCheck\ttrue\nrunGC\ttrue\n")
+        f.write("iteration\tmap\tai1\tai2\ttime\twinner\tcrashed\ttimedout\n")
+
+        wins = np.zeros((n_ais, n_opponents), dtype=int)
+        ties = np.zeros((n_ais, n_opponents), dtype=int)
+        for iteration in range(iterations):
+            for m in range(n_maps):
+                for ai in range(n_ais):
+                    for opponent in range(n_opponents):
+                        winner = rand.choice([-1, 0, 1])
+                        wins[ai, opponent] += winner == 0
+                        ties[ai, opponent] += winner == -1
+                        f.write(f"{iteration}\t{m}\t{ai}\t{opponent}\t{rand.randint(200, 14000)}\t{winner}\t-1\t-1\n")
+
+        for name, block in (("Wins", wins), ("Ties", ties)):
+            f.write(f"{name}: \n")
+            for row in block:
+                f.write('\t'.join(str(v) for v in row) + '\t\n')
+
+
+def time_parser(parser, paths, repeat):
+    start = perf_counter()
+    for _ in range(repeat):
+        for path in paths:
+            parser(path)
+    return (perf_counter() - start) / (repeat * len(paths))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pattern', nargs='?', default='resultados/**/tournament_*.csv',
+                        help='patrón glob de los ficheros de torneo grabados')
+    parser.add_argument('--repeat', type=int, default=20, help='repeticiones por fichero')
+    options = parser.parse_args()
+
+    paths = sorted(glob.glob(options.pattern, recursive=True))
+    sample_dir = None
+    if not paths:
+        sample_dir = tempfile.TemporaryDirectory()
+        rand = Random(0)
+        for n in range(10):
+            path = os.path.join(sample_dir.name, f"tournament_ga_{n}.csv")
+            write_sample_tournament(path, rand, n_ais=1, n_opponents=3, n_maps=5, iterations=4)
+            paths.append(path)
+            path = os.path.join(sample_dir.name, f"tournament_coev_{n}.csv")
+            write_sample_tournament(path, rand, n_ais=2, n_opponents=2, n_maps=5, iterations=2)
+            paths.append(path)
+        print(f"No se encontraron torneos con '{options.pattern}'; usando {len(paths)} ficheros de ejemplo")
+
+    # Comprobar que ambos parsers extraen las mismas partidas
+    for path in paths:
+        legacy = legacy_parse(path)
+        games, _ = parse_tournament_file(path)
+        for column in legacy.columns:
+            if not np.array_equal(legacy[column].to_numpy(), games[column]):
+                raise AssertionError(f"{path}: la columna {column} no coincide")
+
+    legacy_time = time_parser(legacy_parse, paths, options.repeat)
+    new_time = time_parser(parse_tournament_file, paths, options.repeat)
+
+    print(f"Ficheros: {len(paths)}, repeticiones: {options.repeat}")
+    print(f"load_tournament_games_from_df: {legacy_time * 1000:.3f} ms/fichero")
+    print(f"parse_tournament_file:         {new_time * 1000:.3f} ms/fichero")
+    print(f"Aceleración: {legacy_time / new_time:.1f}x")
+
+    if sample_dir is not None:
+        sample_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+Almacén de resultados por celda: (genoma, oponente, mapa, iteración, ajustes de partida).
+
+La caché de fitness guarda el torneo completo de un genoma bajo el hash de toda la
+configuración, así que añadir o quitar un oponente o un mapa en EvaluationTournament
+invalida todos los resultados conocidos. Aquí cada partida suelta se guarda por separado,
+identificada por el nombre del oponente y la ruta del mapa (no por su posición en las
+listas) y por los ajustes de partida (duración máxima, presupuestos, observabilidad...),
+y la evaluación de un genoma se construye con sus celdas: solo se juegan las que faltan.
+
+Con el mismo almacén se pueden volver a puntuar los genomas de ejecuciones anteriores
+contra el benchmark actual jugando solo las celdas nuevas:
+
+    python cell_store.py resultados/cell_store.sqlite --backend replay --output rescore.csv
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import sqlite3
+from multiprocessing import Pool
+from time import time
+
+import numpy as np
+
+from fitness_cache import canonical_genome
+from game_units import game_units, merge_game_units, play_game_tasks, unit_task
+from jvm_evaluation import CLASS_PATH
+from tournament_results import GAME_COLUMNS
+
+# Claves de la configuración que enumeran las celdas; el resto son ajustes de partida
+CELL_AXES = ('driver', 'maps', 'opponents', 'iterations')
+
+
+def settings_digest(config):
+    """Hash de los ajustes de partida de una configuración (todo salvo mapas, oponentes e iteraciones)."""
+    settings = {key: value for key, value in config.items() if key not in CELL_AXES}
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class CellStore:
+    """
+    Almacén SQLite de partidas sueltas de EvaluationTournament.
+
+    Args:
+        path (str): ruta del fichero SQLite
+        config (dict): configuración del torneo actual (ver jvm_evaluation.tournament_config)
+    """
+
+    def __init__(self, path, config):
+        self.path = path
+        self.config = config
+        self.settings = settings_digest(config)
+        self.reused = 0
+        self.played = 0
+
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute('''CREATE TABLE IF NOT EXISTS cells (
+                                       genome TEXT NOT NULL,
+                                       opponent TEXT NOT NULL,
+                                       map TEXT NOT NULL,
+                                       iteration INTEGER NOT NULL,
+                                       settings TEXT NOT NULL,
+                                       time INTEGER NOT NULL,
+                                       winner INTEGER NOT NULL,
+                                       crashed INTEGER NOT NULL,
+                                       timedout INTEGER NOT NULL,
+                                       created REAL NOT NULL,
+                                       PRIMARY KEY (genome, opponent, map, iteration, settings))''')
+        self.connection.commit()
+
+    def _key(self, candidate, unit):
+        map_idx, opponent, iteration = unit
+        return (json.dumps(canonical_genome(candidate)), self.config['opponents'][opponent],
+                self.config['maps'][map_idx], iteration, self.settings)
+
+    def get(self, candidate, units):
+        """
+        Celdas ya jugadas de un genoma.
+
+        Returns:
+            dict: unidad (mapa, oponente, iteración) -> (partidas, resumen) en el formato de
+                  una partida suelta; las unidades que faltan no aparecen
+        """
+        genome = json.dumps(canonical_genome(candidate))
+        rows = self.connection.execute('SELECT opponent, map, iteration, time, winner, crashed, timedout FROM cells '
+                                       'WHERE genome = ? AND settings = ?', (genome, self.settings)).fetchall()
+        stored = {tuple(row[:3]): row[3:] for row in rows}
+        found = {}
+        for map_idx, opponent, iteration in units:
+            cell = stored.get((self.config['opponents'][opponent], self.config['maps'][map_idx], iteration))
+            if cell is not None:
+                found[(map_idx, opponent, iteration)] = stored_game(*cell)
+        return found
+
+    def put(self, candidate, unit, parsed):
+        """Guarda una partida suelta terminada (las fallidas no se guardan)."""
+        games, summary = parsed
+        if summary is None or len(games['time']) != 1:
+            return
+        self.connection.execute('INSERT OR REPLACE INTO cells VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                self._key(candidate, unit) + (int(games['time'][0]), int(games['winner'][0]),
+                                                              int(games['crashed'][0]), int(games['timedout'][0]),
+                                                              time()))
+
+    def commit(self):
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM cells').fetchone()[0]
+
+    def stats(self):
+        """Celdas reutilizadas y jugadas durante esta ejecución."""
+        return {'reused': self.reused, 'played': self.played, 'entries': len(self)}
+
+    def close(self):
+        self.connection.close()
+
+
+def stored_game(time_, winner, crashed, timedout):
+    """Una celda guardada con el formato de parse_tournament_output de una partida suelta."""
+    values = {'iteration': 0, 'map': 0, 'ai1': 0, 'ai2': 1, 'time': time_, 'winner': winner,
+              'crashed': crashed, 'timedout': timedout}
+    games = {column: np.array([values[column]], dtype=np.int64) for column in GAME_COLUMNS}
+    summary = {'wins': np.array([[int(winner == 0)]]), 'ties': np.array([[int(winner == -1)]]), 'games': 1}
+    return games, summary
+
+
+def evaluate_from_cells(candidates, store, evaluation_server=None, processes=None, class_path=CLASS_PATH,
+                        policy=None, pool=None):
+    """
+    Resultados de torneo de varios candidatos jugando solo las celdas que no están en store.
+
+    Args:
+        candidates (list): genomas a evaluar
+        store (CellStore): almacén de celdas (su config define el torneo)
+        evaluation_server (EvaluationServerPool): JVMs persistentes; si es None se usa un multiprocessing.Pool
+        processes (int): procesos del Pool (ignorado con evaluation_server)
+        class_path (str): classpath de Java
+        policy (SupervisionPolicy): límites de tiempo y reintentos por partida (None sin supervisión)
+        pool (multiprocessing.Pool): procesos del experimento (ignorado con evaluation_server); si es
+            None se crea uno de processes procesos para esta llamada
+
+    Returns:
+        list: (partidas, resumen) de cada candidato con el formato del torneo completo
+    """
+    config = store.config
+    units = game_units(config)
+    results = []
+    pending = {}   # (genoma canónico, unidad) -> tarea: los genomas repetidos en el lote comparten partidas
+    for candidate in candidates:
+        found = store.get(candidate, units)
+        results.append(found)
+        genome = canonical_genome(candidate)
+        for unit in units:
+            if unit not in found:
+                pending.setdefault((genome, unit), unit_task(candidate, unit, class_path, policy, config))
+        store.reused += len(found)
+
+    if pending:
+        tasks = list(pending.values())
+        if evaluation_server is not None or pool is not None:
+            played = play_game_tasks(tasks, evaluation_server=evaluation_server, pool=pool)
+        else:
+            with Pool(processes=processes) as pool:
+                played = play_game_tasks(tasks, pool=pool)
+        played = dict(zip(pending, played))
+        for key, task in pending.items():
+            store.put(task[0], key[1], played[key])
+        store.commit()
+        store.played += len(tasks)
+        for candidate, found in zip(candidates, results):
+            genome = canonical_genome(candidate)
+            found.update({unit: played[(genome, unit)] for unit in units if (genome, unit) in played})
+
+    n_opponents = len(config['opponents'])
+    return [merge_game_units(units, [found[unit] for unit in units], n_opponents) for found in results]
+
+
+if __name__ == "__main__":
+    from game_backend import INDIVIDUALS_PATTERN, driver_config, load_individuals, make_backend
+    from GAmicroRTS import tournament_fitness
+
+    parser = argparse.ArgumentParser(description="Vuelve a puntuar genomas ya evaluados contra el torneo actual")
+    parser.add_argument('store', help="fichero SQLite del almacén de celdas")
+    parser.add_argument('--pattern', default=INDIVIDUALS_PATTERN, help="inspyred-individuals-file con los genomas")
+    parser.add_argument('--backend', default=None, help="backend de partidas (p.ej. 'replay'; por defecto MicroRTS)")
+    parser.add_argument('--processes', type=int, default=8)
+    parser.add_argument('--output', default='rescore.csv')
+    options = parser.parse_args()
+
+    genomes, _ = load_individuals(sorted(glob.glob(options.pattern)))
+    # La etiqueta (gen 10) no se guarda en los ficheros de individuos; MyAgent solo la usa en su toString
+    candidates = [list(genome) + ['rescore'] for genome in dict.fromkeys(canonical_genome(genome) for genome in genomes)]
+    backend = make_backend(options.backend, options.processes) if options.backend is not None else None
+    if backend is not None:
+        backend.start()
+    store = CellStore(options.store, driver_config('EvaluationTournament', backend))
+    try:
+        parsed = evaluate_from_cells(candidates, store, evaluation_server=backend, processes=options.processes)
+    finally:
+        if backend is not None:
+            backend.close()
+    with open(options.output, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([f'gene{i}' for i in range(10)] + ['victorias', 'tiempo_victoria', 'tiempo_derrota'])
+        for candidate, (games, summary) in zip(candidates, parsed):
+            fitness = tournament_fitness(games, summary)
+            writer.writerow(candidate[:10] + [fitness.victorias, fitness.tiempo_victoria, fitness.tiempo_derrota])
+    stats = store.stats()
+    print(f"{len(candidates)} genomas: {stats['reused']} celdas reutilizadas, {stats['played']} jugadas, "
+          f"{stats['entries']} en el almacén; resultados en {options.output}")
+    store.close()
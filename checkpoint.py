@@ -0,0 +1,196 @@
+"""
+Checkpoints por generación y reanudación de experimentos.
+
+CheckpointObserver es un observador de inspyred (también vale para SteadyStateEC) que
+en cada generación escribe de forma atómica en la carpeta de resultados la población
+con sus fitness, el estado del Random, los contadores de evaluaciones y generaciones,
+el tiempo transcurrido y el estado adicional que indique el experimento (matriz de
+resultados de la co-evolución, contadores de la caché...). La caché SQLite ya es
+persistente por sí misma.
+
+Al reanudar, la población guardada se pasa como semillas y ResumedEvaluator devuelve
+sus fitness sin volver a evaluarlas; ResumedObserver desplaza los contadores para que
+los ficheros de inspyred continúen donde se quedaron.
+"""
+
+import os
+import pickle
+from concurrent.futures import Future
+from time import time
+
+from inspyred.ec import Individual
+
+from inspyred_callables import InspyredCallable
+
+CHECKPOINT_NAME = 'checkpoint.pkl'
+CACHE_COUNTERS = ('hits', 'misses', 'stores', 'evictions')
+
+
+def checkpoint_path(results_folder):
+    return os.path.join(results_folder, CHECKPOINT_NAME)
+
+
+def save_checkpoint(results_folder, state):
+    """Escribe el checkpoint en un fichero temporal y lo renombra (un corte no deja un checkpoint a medias)."""
+    path = checkpoint_path(results_folder)
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def load_checkpoint(results_folder):
+    """Lee el checkpoint de una carpeta de resultados (FileNotFoundError si no hay)."""
+    with open(checkpoint_path(results_folder), 'rb') as f:
+        return pickle.load(f)
+
+
+def cache_counters(fitness_cache):
+    """Contadores de una FitnessCache para guardarlos en el checkpoint."""
+    return {name: getattr(fitness_cache, name) for name in CACHE_COUNTERS}
+
+
+def restore_cache_counters(fitness_cache, counters):
+    for name, value in counters.items():
+        setattr(fitness_cache, name, value)
+
+
+def restore_population(state, maximize=True):
+    """Individual de inspyred con el candidato, el fitness y la fecha de nacimiento guardados."""
+    population = []
+    for candidate, fitness, birthdate in state['population']:
+        ind = Individual(candidate, maximize=maximize)
+        ind.fitness = fitness
+        ind.birthdate = birthdate
+        population.append(ind)
+    return population
+
+
+class CheckpointObserver(InspyredCallable):
+    """
+    Observador que guarda un checkpoint en cada generación.
+
+    Args:
+        results_folder (str): carpeta del experimento
+        settings (dict): parámetros del experimento (para reanudarlo con la misma configuración)
+        extra_state: función sin argumentos que devuelve el estado adicional a guardar
+        generation_offset, evaluation_offset (int): generaciones y evaluaciones hechas antes de reanudar
+        elapsed_offset (float): segundos empleados antes de reanudar
+    """
+
+    inspyred_name = 'checkpoint_observer'
+
+    def __init__(self, results_folder, settings, extra_state=None, generation_offset=0, evaluation_offset=0,
+                 elapsed_offset=0.0):
+        self.results_folder = results_folder
+        self.settings = settings
+        self.extra_state = extra_state
+        self.generation_offset = generation_offset
+        self.evaluation_offset = evaluation_offset
+        self.elapsed_offset = elapsed_offset
+        self.started = time()
+
+    def elapsed(self):
+        """Segundos de experimento contando los de las ejecuciones anteriores."""
+        return self.elapsed_offset + time() - self.started
+
+    def __call__(self, population, num_generations, num_evaluations, args):
+        # Rutas absolutas: --resume puede lanzarse desde otro directorio
+        files = {name: os.path.abspath(args[name].name) for name in ('statistics_file', 'individuals_file')
+                 if name in args}
+        state = {
+            'settings': self.settings,
+            'population': [(ind.candidate, ind.fitness, ind.birthdate) for ind in population],
+            'random_state': args['_ec']._random.getstate(),
+            'num_generations': num_generations + self.generation_offset,
+            'num_evaluations': num_evaluations + self.evaluation_offset,
+            'elapsed': self.elapsed(),
+            'files': files,
+            'extra': self.extra_state() if self.extra_state is not None else {},
+        }
+        save_checkpoint(self.results_folder, state)
+
+
+class ResumedObserver(InspyredCallable):
+    """
+    Envuelve un observador al reanudar: se salta la observación de la población
+    restaurada (ya estaba registrada) y desplaza los contadores.
+    """
+
+    def __init__(self, observer, generation_offset, evaluation_offset):
+        self.inspyred_name = getattr(observer, '__name__', 'resumed_observer')
+        self.observer = observer
+        self.generation_offset = generation_offset
+        self.evaluation_offset = evaluation_offset
+        self.first = True
+
+    def __call__(self, population, num_generations, num_evaluations, args):
+        if self.first:
+            self.first = False
+            return
+        self.observer(population=population, num_generations=num_generations + self.generation_offset,
+                      num_evaluations=num_evaluations + self.evaluation_offset, args=args)
+
+
+class ResumedEvaluator(InspyredCallable):
+    """
+    Envuelve un evaluador de inspyred al reanudar: la primera llamada (la población
+    restaurada) devuelve los fitness guardados; las siguientes evalúan normalmente.
+    """
+
+    def __init__(self, evaluator, fitness):
+        self.inspyred_name = getattr(evaluator, '__name__', 'resumed_evaluator')
+        self.evaluator = evaluator
+        self.fitness = list(fitness)
+
+    def __call__(self, candidates, args):
+        if self.fitness is not None:
+            fitness, self.fitness = self.fitness, None
+            return fitness
+        return self.evaluator(candidates=candidates, args=args)
+
+
+def resumed_submit(submit, fitness):
+    """Versión de submit para SteadyStateEC: los primeros envíos devuelven los fitness guardados."""
+    pending = list(fitness)
+
+    def wrapper(candidate):
+        if pending:
+            future = Future()
+            future.set_result(pending.pop(0))
+            return future
+        return submit(candidate)
+    return wrapper
+
+
+def resume_state(results_folder, observers, maximize=True):
+    """
+    Prepara la reanudación de un experimento.
+
+    Args:
+        results_folder (str): carpeta del experimento con el checkpoint
+        observers (list): observadores originales del experimento
+        maximize (bool): si el fitness se maximiza
+
+    Returns:
+        dict: checkpoint con además 'seeds' (candidatos de la población), 'fitness',
+              'observers' (envueltos con ResumedObserver) y 'file_args' (ficheros de
+              inspyred reabiertos en modo añadir)
+    """
+    state = load_checkpoint(results_folder)
+    population = restore_population(state, maximize)
+    generation_offset = state['num_generations']
+    evaluation_offset = state['num_evaluations'] - len(population)
+    state['seeds'] = [ind.candidate for ind in population]
+    state['fitness'] = [ind.fitness for ind in population]
+    state['observers'] = [ResumedObserver(obs, generation_offset, evaluation_offset) for obs in observers]
+    state['file_args'] = {}
+    for name, path in state['files'].items():
+        if not os.path.exists(path):
+            # Checkpoints anteriores guardaban rutas relativas: se buscan también en la carpeta del experimento
+            path = os.path.join(results_folder, os.path.basename(path))
+        if os.path.exists(path):
+            state['file_args'][name] = open(path, 'a')
+    return state
@@ -0,0 +1,465 @@
+"""
+Granja de evaluación en varias máquinas: un broker en el orquestador y agentes
+trabajadores que se conectan a él por TCP.
+
+El Broker tiene la misma interfaz que jvm_evaluation.EvaluationServerPool (request,
+map, start, close), así que se usa como args['evaluation_server'] en todos los caminos
+de evaluación que ya existen (torneo completo, partida suelta, enfrentamiento de
+co-evolución). Las peticiones se encolan y se envían a los trabajadores conectados
+respetando la capacidad que anuncia cada uno; si un trabajador deja de enviar latidos
+o se desconecta, sus tareas en curso vuelven a la cola.
+
+Cada trabajador ejecuta las peticiones en su propio EvaluationServerPool (JVMs
+persistentes), o en un backend de game_backend.py con --game-backend, y devuelve los
+registros del torneo. Se arranca en cada máquina con:
+
+    python farm.py worker <host_broker>:<puerto> --capacity 8
+
+El broker escucha por defecto solo en 127.0.0.1. Para aceptar trabajadores de otras
+máquinas hay que darle una interfaz explícita y un token compartido (argumento token o
+variable de entorno MICRORTS_FARM_TOKEN, la misma en el orquestador y en los trabajadores):
+los trabajadores que no lo presentan en su saludo se desconectan, porque el broker da por
+buenos los registros de fitness que devuelven.
+
+Para probar la granja en una sola máquina sin Java (un broker, varios trabajadores con el
+backend 'replay' y uno de ellos muerto a mitad de la ejecución):
+
+    python farm.py localhost --workers 3 --tasks 40
+
+El protocolo son líneas JSON, como el de tournament.EvaluationServer:
+
+- trabajador -> broker: {"type": "hello", "name", "capacity", "token"}, {"type": "heartbeat"},
+  {"type": "result", "id", "ok", "records" | "error", "timeout"}
+- broker -> trabajador: {"type": "task", "id", "payload", "timeout"}
+"""
+
+import argparse
+import hmac
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import count
+from random import Random
+from time import sleep, time
+
+from game_backend import GENE_LOWER, GENE_UPPER, make_backend
+from jvm_evaluation import CLASS_PATH, EvaluationServerError, EvaluationServerPool, EvaluationTimeout
+
+
+TOKEN_VARIABLE = 'MICRORTS_FARM_TOKEN'
+
+
+def parse_address(address):
+    """'host:puerto' -> (host, puerto)."""
+    host, port = address.rsplit(':', 1)
+    return host, int(port)
+
+
+def is_loopback(host):
+    return host in ('localhost', '::1') or host.startswith('127.')
+
+
+def _send(connection, lock, message):
+    data = (json.dumps(message) + '\n').encode()
+    with lock:
+        connection.sendall(data)
+
+
+class _Task:
+    def __init__(self, task_id, payload, timeout):
+        self.id = task_id
+        self.payload = payload
+        self.timeout = timeout
+        self.future = Future()
+        self.attempts = 0
+
+
+class _WorkerConnection:
+    def __init__(self, connection, address):
+        self.connection = connection
+        self.address = address
+        self.name = f"{address[0]}:{address[1]}"
+        self.capacity = 0
+        self.in_flight = {}
+        self.last_seen = time()
+        self.send_lock = threading.Lock()
+        self.alive = True
+
+
+class Broker:
+    """
+    Cola de peticiones de evaluación servida por trabajadores remotos.
+
+    Args:
+        host (str): interfaz en la que escuchar (otra distinta de loopback, p.ej. '0.0.0.0' para
+            aceptar otras máquinas, exige token)
+        port (int): puerto TCP (0 elige uno libre; ver self.address tras start)
+        token (str): secreto compartido que los trabajadores presentan al saludar (por defecto,
+            la variable de entorno MICRORTS_FARM_TOKEN)
+        heartbeat_timeout (float): segundos sin latido tras los que un trabajador se da por muerto
+        max_attempts (int): envíos de una tarea antes de darla por fallida (por muertes de trabajadores)
+        max_in_flight (int): hilos de map, es decir, peticiones pendientes a la vez
+    """
+
+    def __init__(self, host='127.0.0.1', port=5555, heartbeat_timeout=30.0, max_attempts=3, max_in_flight=256,
+                 token=None):
+        self.token = token if token is not None else os.environ.get(TOKEN_VARIABLE)
+        if not is_loopback(host) and not self.token:
+            raise ValueError(f"El broker solo escucha en {host} con un token compartido "
+                             f"(argumento token o variable de entorno {TOKEN_VARIABLE})")
+        self.host = host
+        self.port = port
+        self.address = None
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.queue = deque()
+        self.workers = []
+        self.condition = threading.Condition()
+        self.ids = count(1)
+        self.requeued = 0
+        self.completed = Counter()
+        self.closed = False
+        self._server = None
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight)
+
+    @classmethod
+    def from_address(cls, address, **kwargs):
+        host, port = parse_address(address)
+        return cls(host, port, **kwargs)
+
+    def start(self):
+        """Empieza a escuchar; las peticiones esperan en la cola hasta que se conecte algún trabajador."""
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((self.host, self.port))
+        self._server.listen()
+        self.address = self._server.getsockname()
+        for target in (self._accept_loop, self._dispatch_loop, self._monitor_loop):
+            threading.Thread(target=target, daemon=True).start()
+
+    def _accept_loop(self):
+        while not self.closed:
+            try:
+                connection, address = self._server.accept()
+            except OSError:
+                return
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            worker = _WorkerConnection(connection, address)
+            threading.Thread(target=self._read_loop, args=(worker,), daemon=True).start()
+
+    def _read_loop(self, worker):
+        try:
+            for line in worker.connection.makefile('r'):
+                message = json.loads(line)
+                with self.condition:
+                    worker.last_seen = time()
+                    if message['type'] == 'hello':
+                        if self.token and not hmac.compare_digest(str(message.get('token', '')), self.token):
+                            break   # trabajador sin el token: se desconecta
+                        worker.name = message.get('name', worker.name)
+                        worker.capacity = int(message['capacity'])
+                        self.workers.append(worker)
+                        self.condition.notify_all()
+                    elif message['type'] == 'result':
+                        task = worker.in_flight.pop(message['id'], None)
+                        # Un resultado tardío de una tarea ya reencolada no cuenta para el trabajador
+                        if task is not None:
+                            self.completed[worker.name] += 1
+                            task.future.set_result(message)
+                        self.condition.notify_all()
+        except (OSError, ValueError):
+            pass
+        self._drop(worker)
+
+    def _drop(self, worker):
+        """Da de baja un trabajador y devuelve sus tareas en curso a la cola."""
+        with self.condition:
+            if not worker.alive:
+                return
+            worker.alive = False
+            if worker in self.workers:
+                self.workers.remove(worker)
+            for task in worker.in_flight.values():
+                if task.attempts >= self.max_attempts:
+                    task.future.set_exception(EvaluationServerError(
+                        f"Tarea {task.id} perdida en {task.attempts} trabajadores"))
+                else:
+                    self.queue.appendleft(task)
+                    self.requeued += 1
+            worker.in_flight.clear()
+            self.condition.notify_all()
+        try:
+            worker.connection.close()
+        except OSError:
+            pass
+
+    def _dispatch_loop(self):
+        while True:
+            with self.condition:
+                while not self.closed and not (self.queue and self._free_worker()):
+                    self.condition.wait()
+                if self.closed:
+                    return
+                worker = self._free_worker()
+                task = self.queue.popleft()
+                task.attempts += 1
+                worker.in_flight[task.id] = task
+            try:
+                _send(worker.connection, worker.send_lock,
+                      {'type': 'task', 'id': task.id, 'payload': task.payload, 'timeout': task.timeout})
+            except OSError:
+                self._drop(worker)
+
+    def _free_worker(self):
+        """Trabajador con hueco y menor ocupación relativa (None si todos están llenos)."""
+        free = [worker for worker in self.workers if len(worker.in_flight) < worker.capacity]
+        return min(free, key=lambda worker: len(worker.in_flight) / worker.capacity) if free else None
+
+    def _monitor_loop(self):
+        while not self.closed:
+            sleep(self.heartbeat_timeout / 3)
+            with self.condition:
+                dead = [worker for worker in self.workers if time() - worker.last_seen > self.heartbeat_timeout]
+            for worker in dead:
+                self._drop(worker)
+
+    def submit(self, payload, timeout=None):
+        """Encola una petición; devuelve un Future con el mensaje de resultado del trabajador."""
+        task = _Task(next(self.ids), payload, timeout)
+        with self.condition:
+            self.queue.append(task)
+            self.condition.notify_all()
+        return task.future
+
+    def request(self, payload, timeout=None):
+        """
+        Igual que EvaluationServerPool.request: bloquea hasta la respuesta.
+
+        Raises:
+            EvaluationTimeout: si la petición superó timeout en el trabajador
+            EvaluationServerError: si la tarea se perdió en max_attempts trabajadores
+            RuntimeError: si el torneo falló en el trabajador
+        """
+        message = self.submit(payload, timeout).result()
+        if not message['ok']:
+            if message.get('timeout'):
+                raise EvaluationTimeout(message.get('error', f"La petición superó {timeout}s"))
+            raise RuntimeError(message.get('error', 'Error desconocido en el trabajador'))
+        return {'ok': True, 'records': message['records']}
+
+    def map(self, function, items):
+        """Aplica function a cada elemento con hasta max_in_flight hilos (mantiene el orden)."""
+        return list(self._executor.map(function, items))
+
+    def stats(self):
+        """Trabajadores conectados, tareas completadas por trabajador y tareas reencoladas."""
+        with self.condition:
+            return {'workers': dict(self.completed),
+                    'capacity': sum(worker.capacity for worker in self.workers),
+                    'queued': len(self.queue),
+                    'requeued': self.requeued}
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        with self.condition:
+            self.closed = True
+            workers = list(self.workers)
+            self.condition.notify_all()
+        if self._server is not None:
+            self._server.close()
+        for worker in workers:
+            self._drop(worker)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class FarmWorker:
+    """
+    Agente trabajador: ejecuta las peticiones del broker en JVMs persistentes locales.
+
+    Args:
+        address (str): 'host:puerto' del broker
+        capacity (int): peticiones simultáneas (= JVMs locales)
+        name (str): nombre con el que se anuncia (por defecto, el nombre de la máquina)
+        heartbeat_interval (float): segundos entre latidos
+        class_path (str): classpath de Java
+        reconnect_delay (float): espera antes de reconectar si se pierde el broker (None para terminar)
+        game_backend (str): backend de partidas de game_backend.py (p.ej. 'replay') en lugar de JVMs
+        backend_options (dict): opciones del backend (p.ej. {'cycle_seconds': 1e-4})
+        token (str): token del broker (por defecto, la variable de entorno MICRORTS_FARM_TOKEN)
+    """
+
+    def __init__(self, address, capacity, name=None, heartbeat_interval=5.0, class_path=CLASS_PATH,
+                 reconnect_delay=5.0, game_backend=None, backend_options=None, token=None):
+        self.address = parse_address(address)
+        self.token = token if token is not None else os.environ.get(TOKEN_VARIABLE)
+        self.capacity = capacity
+        self.name = name or socket.gethostname()
+        self.heartbeat_interval = heartbeat_interval
+        self.reconnect_delay = reconnect_delay
+        if game_backend is not None:
+            self.servers = make_backend(game_backend, capacity, **(backend_options or {}))
+        else:
+            self.servers = EvaluationServerPool(capacity, class_path)
+        self.executor = ThreadPoolExecutor(max_workers=capacity)
+
+    def run(self):
+        """Atiende al broker indefinidamente (o hasta perderlo, si reconnect_delay es None)."""
+        self.servers.start()
+        try:
+            while True:
+                try:
+                    self._serve()
+                except OSError:
+                    pass
+                if self.reconnect_delay is None:
+                    return
+                sleep(self.reconnect_delay)
+        finally:
+            self.executor.shutdown(wait=False)
+            self.servers.close()
+
+    def _serve(self):
+        connection = socket.create_connection(self.address)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        send_lock = threading.Lock()
+        connected = threading.Event()
+        connected.set()
+
+        def heartbeat():
+            while connected.is_set():
+                try:
+                    _send(connection, send_lock, {'type': 'heartbeat'})
+                except OSError:
+                    return
+                sleep(self.heartbeat_interval)
+
+        def handle(task):
+            try:
+                response = self.servers.request(task['payload'], task.get('timeout'))
+                message = {'type': 'result', 'id': task['id'], 'ok': True, 'records': response['records']}
+            except EvaluationTimeout as e:
+                message = {'type': 'result', 'id': task['id'], 'ok': False, 'timeout': True, 'error': str(e)}
+            except Exception as e:
+                # Cualquier fallo (también no poder relanzar la JVM: OSError) se responde; si no, el
+                # broker esperaría para siempre una tarea que el trabajador, aún vivo, no va a devolver
+                message = {'type': 'result', 'id': task['id'], 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            try:
+                _send(connection, send_lock, message)
+            except OSError:
+                pass   # el broker reencolará la tarea
+
+        _send(connection, send_lock, {'type': 'hello', 'name': self.name, 'capacity': self.capacity,
+                                      'token': self.token or ''})
+        threading.Thread(target=heartbeat, daemon=True).start()
+        try:
+            for line in connection.makefile('r'):
+                self.executor.submit(handle, json.loads(line))
+        finally:
+            connected.clear()
+            connection.close()
+
+
+def worker_command(address, capacity, name, game_backend='replay', cycle_seconds=0.0, heartbeat=1.0):
+    """Línea de órdenes que lanza un trabajador (python farm.py worker ...)."""
+    return [sys.executable, os.path.abspath(__file__), 'worker', address, '--capacity', str(capacity),
+            '--name', name, '--heartbeat', str(heartbeat), '--game-backend', game_backend,
+            '--cycle-seconds', str(cycle_seconds)]
+
+
+def localhost_check(workers=3, capacity=2, tasks=40, game_backend='replay', cycle_seconds=1e-4, timeout=60.0):
+    """
+    Prueba la granja en esta máquina: arranca un broker y workers trabajadores en subprocesos,
+    encola tasks partidas sueltas y mata al primer trabajador mientras tiene tareas en curso.
+
+    Returns:
+        dict: estadísticas del broker más 'results' (respuestas correctas), 'killed' (trabajador
+              muerto) y 'passed' (todas las tareas respondidas, alguna reencolada y ninguna
+              contada dos veces)
+    """
+    token = os.urandom(16).hex()
+    broker = Broker('127.0.0.1', 0, heartbeat_timeout=3.0, token=token)
+    broker.start()
+    address = f"127.0.0.1:{broker.address[1]}"
+    names = [f"local-{i}" for i in range(workers)]
+    environment = dict(os.environ, **{TOKEN_VARIABLE: token})
+    processes = [subprocess.Popen(worker_command(address, capacity, name, game_backend, cycle_seconds),
+                                  env=environment)
+                 for name in names]
+    try:
+        deadline = time() + timeout
+        while len(broker.workers) < workers:
+            if time() > deadline:
+                raise RuntimeError(f"Solo se conectaron {len(broker.workers)} de {workers} trabajadores")
+            sleep(0.1)
+
+        rand = Random(0)
+        genomes = [[rand.uniform(low, high) for low, high in zip(GENE_LOWER, GENE_UPPER)] + ['farm']
+                   for _ in range(tasks)]
+        futures = [broker.submit({'type': 'game', 'agent': [str(gene) for gene in genome], 'map': i % 5,
+                                  'opponent': i % 3, 'iteration': i})
+                   for i, genome in enumerate(genomes)]
+
+        # Se mata al primer trabajador en cuanto tiene tareas en curso
+        victim = None
+        while victim is None and time() < deadline:
+            with broker.condition:
+                victim = next((worker for worker in broker.workers
+                               if worker.name == names[0] and worker.in_flight), None)
+            if victim is None:
+                sleep(0.01)
+        processes[0].kill()
+
+        results = [future.result(timeout=max(1.0, deadline - time())) for future in futures]
+    finally:
+        for process in processes:
+            process.kill()
+            process.wait()
+        stats = broker.stats()
+        broker.close()
+    stats['results'] = sum(1 for message in results if message['ok'])
+    stats['killed'] = names[0]
+    stats['passed'] = (stats['results'] == tasks and stats['requeued'] >= 1 and
+                       sum(stats['workers'].values()) == tasks)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agente trabajador de la granja de evaluación")
+    parser.add_argument('role', choices=['worker', 'localhost'],
+                        help="'worker' atiende a un broker; 'localhost' prueba la granja en esta máquina")
+    parser.add_argument('broker', nargs='?', help="host:puerto del broker (solo con 'worker')")
+    parser.add_argument('--capacity', type=int, default=4, help="JVMs / peticiones simultáneas")
+    parser.add_argument('--name', default=None)
+    parser.add_argument('--heartbeat', type=float, default=5.0, help="segundos entre latidos")
+    parser.add_argument('--game-backend', default=None, help="backend de partidas (p.ej. 'replay') en lugar de JVMs")
+    parser.add_argument('--cycle-seconds', type=float, default=0.0,
+                        help="segundos de reloj por ciclo simulado (solo con --game-backend replay)")
+    parser.add_argument('--workers', type=int, default=3, help="trabajadores locales (solo con 'localhost')")
+    parser.add_argument('--tasks', type=int, default=40, help="partidas encoladas (solo con 'localhost')")
+    parser.add_argument('--token', default=None,
+                        help=f"token del broker (mejor en la variable de entorno {TOKEN_VARIABLE})")
+    options = parser.parse_args()
+
+    if options.role == 'localhost':
+        stats = localhost_check(options.workers, options.capacity, options.tasks,
+                                options.game_backend or 'replay', options.cycle_seconds or 1e-4)
+        print(f"{stats['results']}/{options.tasks} resultados, {stats['requeued']} tareas reencoladas tras matar "
+              f"a {stats['killed']}, tareas por trabajador: {stats['workers']}")
+        sys.exit(0 if stats['passed'] else 1)
+
+    if options.broker is None:
+        parser.error("'worker' necesita la dirección del broker")
+    backend_options = {'cycle_seconds': options.cycle_seconds} if options.cycle_seconds > 0 else None
+    FarmWorker(options.broker, options.capacity, name=options.name, heartbeat_interval=options.heartbeat,
+               game_backend=options.game_backend, backend_options=backend_options, token=options.token).run()
@@ -0,0 +1,132 @@
+"""
+Caché persistente de fitness direccionada por contenido.
+
+Las claves son el hash del genoma canónico (los 10 genes, sin la etiqueta) junto con
+el contexto de evaluación (oponentes, mapas, iteraciones y parámetros de partida que
+devuelve ``java tournament.<driver> --config``). Los valores se guardan en SQLite para
+que se compartan entre generaciones y entre ejecuciones. Cuando se supera el número
+máximo de entradas se eliminan las menos usadas recientemente (LRU).
+
+La clave no incluye el código de MyAgent ni de los drivers: la caché es opcional
+(fitness_cache_path=None por defecto) y solo es válida para una misma compilación del
+agente. Tras cambiar el código Java hay que usar un fichero nuevo o borrar el anterior.
+"""
+
+import hashlib
+import json
+import sqlite3
+from time import time
+
+NUM_GENES = 10
+INTEGER_GENES = (3, 4)
+
+
+def canonical_genome(candidate):
+    """
+    Forma canónica de un genoma: los 10 genes numéricos con su tipo normalizado.
+
+    La etiqueta (posición 10) solo se usa en el toString del agente, así que no
+    forma parte de la clave.
+
+    Args:
+        candidate: lista de genes (con o sin etiqueta)
+
+    Returns:
+        tuple: genes 0-9, con los genes 3 y 4 como int y el resto como float
+    """
+    return tuple(int(gene) if i in INTEGER_GENES else float(gene)
+                 for i, gene in enumerate(candidate[:NUM_GENES]))
+
+
+class FitnessCache:
+    """
+    Almacén SQLite de resultados de evaluación.
+
+    Args:
+        path (str): ruta del fichero SQLite
+        context (dict): configuración del torneo; resultados de contextos distintos no se mezclan
+        max_entries (int): tamaño máximo antes de desalojar entradas (LRU)
+    """
+
+    def __init__(self, path, context, max_entries=200000):
+        self.path = path
+        self.max_entries = max_entries
+        self.context_digest = hashlib.sha256(json.dumps(context, sort_keys=True).encode()).hexdigest()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute('''CREATE TABLE IF NOT EXISTS fitness (
+                                       key TEXT PRIMARY KEY,
+                                       kind TEXT NOT NULL,
+                                       value TEXT NOT NULL,
+                                       created REAL NOT NULL,
+                                       last_access REAL NOT NULL,
+                                       hits INTEGER NOT NULL DEFAULT 0)''')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS fitness_last_access ON fitness (last_access)')
+        self.connection.commit()
+
+    def key(self, kind, genomes):
+        """Clave de una entrada: tipo de resultado, contexto y genomas canónicos."""
+        payload = json.dumps([kind, self.context_digest, [canonical_genome(g) for g in genomes]])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, kind, genomes):
+        """
+        Busca un resultado en la caché.
+
+        Args:
+            kind (str): tipo de resultado ('evaluate' para GA, 'match' para co-evolución)
+            genomes (list): genomas que identifican el resultado
+
+        Returns:
+            El valor guardado (decodificado de JSON) o None si no está
+        """
+        key = self.key(kind, genomes)
+        row = self.connection.execute('SELECT value FROM fitness WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.connection.execute('UPDATE fitness SET last_access = ?, hits = hits + 1 WHERE key = ?', (time(), key))
+        self.connection.commit()
+        return json.loads(row[0])
+
+    def put(self, kind, genomes, value):
+        """Guarda un resultado (serializable a JSON) y desaloja entradas si se supera el tamaño."""
+        now = time()
+        self.connection.execute('INSERT OR REPLACE INTO fitness (key, kind, value, created, last_access, hits) '
+                                'VALUES (?, ?, ?, ?, ?, 0)',
+                                (self.key(kind, genomes), kind, json.dumps(value), now, now))
+        self.stores += 1
+        self._evict()
+        self.connection.commit()
+
+    def _evict(self):
+        count = self.connection.execute('SELECT COUNT(*) FROM fitness').fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self.connection.execute('DELETE FROM fitness WHERE key IN '
+                                    '(SELECT key FROM fitness ORDER BY last_access ASC LIMIT ?)', (excess,))
+            self.evictions += excess
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM fitness').fetchone()[0]
+
+    def stats(self):
+        """Contadores de uso de la caché durante esta ejecución."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'entries': len(self),
+        }
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,321 @@
+"""
+Backends de partidas.
+
+Un backend es cualquier objeto con la interfaz de jvm_evaluation.EvaluationServerPool
+(request, map, start, close), así que se usa como args['evaluation_server'] en todos los
+caminos que ya existen: torneo completo, partidas sueltas (shard_games y racing),
+steady-state y enfrentamientos de la co-evolución. Opcionalmente tiene config(driver)
+con la configuración del torneo; si no, se pide a Java con tournament_config.
+
+- MicroRTS real: EvaluationServerPool (JVMs persistentes) o farm.Broker.
+- ReplayBackend: sustituto rápido sin JVM que devuelve registros con el mismo formato que
+  los drivers, con tasas de victoria y duraciones de partida ajustadas a los fitness de
+  los inspyred-individuals-file de resultados/. Sirve para probar la orquestación (cachés,
+  planificadores, co-evolución) con poblaciones mucho mayores en segundos.
+"""
+
+import glob
+import json
+import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import sleep
+
+import numpy as np
+
+from jvm_evaluation import tournament_config
+
+GAME_BACKENDS = ('replay',)
+INDIVIDUALS_PATTERN = 'resultados/GABotsLit_*/inspyred-individuals-file-*.csv'
+GENE_LOWER = np.array([0, 0, 0, 1, 1, 0, 0, 0, 0, 0], dtype=float)
+GENE_UPPER = np.array([1, 1, 1, 10, 20, 1, 1, 1, 1, 1], dtype=float)
+
+# Configuración de los drivers de Java (ver describeConfig en EvaluationTournament y CoEvEvaluationGame)
+REPLAY_MAPS = ['maps/16x16/basesWorkers16x16A.xml', 'maps/BWDistantResources32x32.xml', 'maps/DoubleGame24x24.xml',
+               'maps/BroodWar/(2)Benzene.scxA.xml', 'maps/BroodWar/(2)Destination.scxA.xml']
+REPLAY_CONFIG = {
+    'EvaluationTournament': {'driver': 'EvaluationTournament', 'agentVersion': 2,
+                             'opponents': ['WorkerRush', 'EconomyLightRush', 'mayari'],
+                             'maps': REPLAY_MAPS, 'iterations': 4, 'maxGameLength': 14000},
+    'CoEvEvaluationGame': {'driver': 'CoEvEvaluationGame', 'agentVersion': 2, 'maps': REPLAY_MAPS, 'iterations': 2,
+                           'maxGameLength': 14000},
+}
+
+_INDIVIDUAL_LINE = re.compile(r'\(([^)]*)\),\s*\[([^\]]*)\]')
+
+
+def driver_config(driver, backend=None):
+    """Configuración de un driver: la del backend si la tiene y, si no, la de Java (--config)."""
+    if backend is not None and hasattr(backend, 'config'):
+        return backend.config(driver)
+    return tournament_config(driver)
+
+
+def load_individuals(paths):
+    """
+    Lee genomas y fitness de ficheros inspyred-individuals-file.
+
+    Returns:
+        tuple: (genomas (n, 10), fitness (n, 3) con victorias, tiempo de victoria y tiempo de derrota)
+    """
+    genomes, fitness = [], []
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                match = _INDIVIDUAL_LINE.search(line)
+                if match is None:
+                    continue
+                fitness.append([float(value) for value in match.group(1).split(',')])
+                genomes.append([float(value) for value in match.group(2).split(',')[:10]])
+    return np.array(genomes, dtype=float).reshape(-1, 10), np.array(fitness, dtype=float).reshape(-1, 3)
+
+
+def odd_ties_rate(victories, games):
+    """
+    Probabilidad de empate por partida que explica la proporción de fitness con media
+    victoria: con empates Binomial(games, t), P(número impar de empates) = (1 - (1 - 2t)^games) / 2.
+    """
+    odd = np.mean(np.abs(victories - np.floor(victories) - 0.5) < 1e-9) if len(victories) else 0.0
+    odd = min(odd, 0.499)
+    return (1 - (1 - 2 * odd) ** (1.0 / games)) / 2
+
+
+class ReplayBackend:
+    """
+    Sustituto de MicroRTS ajustado a resultados registrados.
+
+    Un genoma ya registrado repite (replay) su fitness medio; uno nuevo toma la media
+    ponderada por distancia de los neighbours genomas registrados más cercanos en el espacio
+    de genes normalizado. De ahí salen la probabilidad de ganar cada partida contra los oponentes
+    fijos y los tiempos medios de victoria y derrota; la duración de cada partida se
+    sortea con una gamma alrededor de esos tiempos y los empates llegan al límite de
+    ciclos. En un enfrentamiento de co-evolución la probabilidad de que gane cada agente
+    sale de un modelo Bradley-Terry sobre sus fuerzas estimadas.
+
+    Contra los oponentes fijos cada celda (mapa, oponente) tiene su propia dificultad: la
+    proporción de puntos del genoma se desplaza en escala logit por una dificultad del
+    oponente y otra del mapa (de media 0, así que el fitness medio apenas cambia), y cada mapa
+    alarga o acorta sus partidas por un factor propio. Las partidas sueltas ('game') se
+    juegan en su celda (mapa, oponente, iteración), con la misma distribución que esa celda
+    dentro del torneo completo.
+
+    Las respuestas son deterministas: el generador aleatorio se siembra con seed y la
+    petición, así que repetir una petición devuelve las mismas partidas.
+
+    Args:
+        genomes (np.ndarray): genomas registrados (n, 10)
+        fitness (np.ndarray): fitness registrados (n, 3)
+        neighbours (int): vecinos para genomas no registrados
+        tie_rate (float): probabilidad de empate por partida (None para ajustarla a los fitness)
+        shape (float): forma de la gamma de duraciones (la desviación relativa es 1/sqrt(shape))
+        cycle_seconds (float): segundos de reloj por ciclo simulado (0 responde al instante;
+            mayor que 0 imita la duración real de las partidas para probar planificadores)
+        workers (int): hilos de map (peticiones simultáneas)
+        seed (int): semilla de las partidas (y de la dificultad de cada celda)
+        cell_spread (float): desviación típica, en escala logit, de la dificultad de cada oponente;
+            la de cada mapa es la mitad y la del logaritmo de la duración de sus partidas, un cuarto
+    """
+
+    def __init__(self, genomes, fitness, neighbours=5, tie_rate=None, shape=4.0, cycle_seconds=0.0, workers=32,
+                 seed=0, cell_spread=0.6):
+        if len(genomes) == 0:
+            raise ValueError("ReplayBackend necesita al menos un individuo registrado")
+        self.config_by_driver = REPLAY_CONFIG
+        tournament = self.config_by_driver['EvaluationTournament']
+        self.tournament_games = len(tournament['maps']) * len(tournament['opponents']) * tournament['iterations']
+        self.max_game_length = tournament['maxGameLength']
+        self.points = self._normalize(genomes)
+        self.score = np.clip(fitness[:, 0] / self.tournament_games, 0.0, 1.0)
+        self.win_time = fitness[:, 1]
+        self.lose_time = fitness[:, 2]
+        self.mean_win_time = float(np.mean(self.win_time[np.isfinite(self.win_time) & (self.win_time > 0)]))
+        self.mean_lose_time = float(np.mean(self.lose_time[np.isfinite(self.lose_time) & (self.lose_time > 0)]))
+        self.neighbours = min(neighbours, len(genomes))
+        self.tie_rate = odd_ties_rate(fitness[:, 0], self.tournament_games) if tie_rate is None else tie_rate
+        self.shape = shape
+        self.cycle_seconds = cycle_seconds
+        self.seed = seed
+        # Dificultad de cada oponente y mapa (logit, centradas) y factor de duración de cada mapa
+        cells = np.random.default_rng([seed, 1])
+        n_maps, n_opponents = len(tournament['maps']), len(tournament['opponents'])
+        self.opponent_difficulty = self._centered(cells.normal(0.0, cell_spread, n_opponents))
+        self.map_difficulty = self._centered(cells.normal(0.0, cell_spread / 2, n_maps))
+        self.map_length = np.exp(self._centered(cells.normal(0.0, cell_spread / 4, n_maps)))
+        self.requests = 0
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    @classmethod
+    def from_results(cls, pattern=INDIVIDUALS_PATTERN, **kwargs):
+        """ReplayBackend ajustado a los inspyred-individuals-file que encuentre pattern."""
+        genomes, fitness = load_individuals(sorted(glob.glob(pattern)))
+        return cls(genomes, fitness, **kwargs)
+
+    def config(self, driver):
+        # 'backend' separa en la caché de fitness los resultados simulados de los de MicroRTS
+        return dict(self.config_by_driver[driver], backend='replay')
+
+    @staticmethod
+    def _centered(values):
+        return values - values.mean()
+
+    @staticmethod
+    def _normalize(genomes):
+        return (np.asarray(genomes, dtype=float) - GENE_LOWER) / (GENE_UPPER - GENE_LOWER)
+
+    def predict(self, agent):
+        """
+        Rendimiento estimado de un genoma.
+
+        Returns:
+            tuple: (proporción de puntos contra los oponentes fijos, tiempo medio de victoria,
+                    tiempo medio de derrota)
+        """
+        point = self._normalize([float(gene) for gene in agent[:10]])
+        distances = np.sqrt(((self.points - point) ** 2).sum(axis=1))
+        nearest = np.argpartition(distances, self.neighbours - 1)[:self.neighbours]
+        if distances[nearest].min() < 1e-12:
+            nearest = np.flatnonzero(distances < 1e-12)   # genoma registrado: se repite su fitness medio
+            weights = np.ones(len(nearest))
+        else:
+            weights = 1.0 / distances[nearest]
+        return (float(np.average(self.score[nearest], weights=weights)),
+                self._mean_time(self.win_time[nearest], weights, self.mean_win_time),
+                self._mean_time(self.lose_time[nearest], weights, self.mean_lose_time))
+
+    @staticmethod
+    def _mean_time(times, weights, default):
+        valid = np.isfinite(times) & (times > 0)
+        return float(np.average(times[valid], weights=weights[valid])) if valid.any() else default
+
+    def _outcomes(self, rng, p_win, n):
+        """Ganador de n partidas desde el punto de vista del agente: 0 gana, 1 pierde, -1 empate."""
+        draw = rng.random(n)
+        return np.where(draw < self.tie_rate, -1, np.where(draw < self.tie_rate + p_win, 0, 1))
+
+    def _durations(self, rng, means):
+        means = np.asarray(means, dtype=float)
+        times = rng.gamma(self.shape, means / self.shape)
+        return np.clip(times, 1, self.max_game_length).astype(np.int64)
+
+    def _win_probability(self, score):
+        return np.clip(score - self.tie_rate / 2, 0.0, 1.0 - self.tie_rate)
+
+    def _cell_score(self, score, maps, opponents):
+        """Proporción de puntos en las celdas (mapas, oponentes) a partir de la proporción global."""
+        score = np.clip(score, 1e-3, 1 - 1e-3)
+        logit = np.log(score / (1 - score)) - self.opponent_difficulty[opponents] - self.map_difficulty[maps]
+        return 1.0 / (1.0 + np.exp(-logit))
+
+    def request(self, payload, timeout=None):
+        """Responde a una petición de EvaluationServer ('evaluate', 'game' o 'match') con sus registros."""
+        key = json.dumps({k: v for k, v in payload.items() if k != 'id'}, sort_keys=True).encode()
+        rng = np.random.default_rng([self.seed, zlib.crc32(key)])
+        kind = payload['type']
+        if kind == 'evaluate':
+            records = self._tournament(rng, payload['agent'])
+        elif kind == 'game':
+            records = self._tournament(rng, payload['agent'],
+                                       cell=(payload['map'], payload['opponent'], payload.get('iteration', 0)))
+        elif kind == 'match':
+            records = self._match(rng, payload['agent1'], payload['agent2'])
+        else:
+            raise RuntimeError(f"Tipo de petición desconocido: {kind}")
+        if self.cycle_seconds > 0:
+            sleep(self.cycle_seconds * sum(record['time'] for record in records if record['type'] == 'game'))
+        with self._lock:
+            self.requests += 1
+        return {'ok': True, 'records': records}
+
+    def _tournament(self, rng, agent, cell=None):
+        """Torneo completo o, con cell = (mapa, oponente, iteración), una partida suelta en esa celda."""
+        config = self.config_by_driver['EvaluationTournament']
+        if cell is not None:
+            slots = [(cell[2], cell[0], cell[1])]
+            n_opponents = 1   # el resumen de una partida suelta tiene una sola columna, como en Java
+        else:
+            n_opponents = len(config['opponents'])
+            slots = [(iteration, m, opponent) for iteration in range(config['iterations'])
+                     for m in range(len(config['maps'])) for opponent in range(n_opponents)]
+        iterations, maps, opponents = (np.array(column, dtype=int) for column in zip(*slots))
+        score, win_time, lose_time = self.predict(agent)
+        winners = self._outcomes(rng, self._win_probability(self._cell_score(score, maps, opponents)), len(slots))
+        times = self._durations(rng, np.where(winners == 0, win_time, lose_time) * self.map_length[maps])
+        times[winners == -1] = self.max_game_length
+        wins = [[0] * n_opponents]
+        ties = [[0] * n_opponents]
+        records = []
+        for (iteration, m, opponent), winner, time in zip(slots, winners.tolist(), times.tolist()):
+            records.append(self._game(iteration, m, 0, opponent, time, winner))
+            column = 0 if cell is not None else opponent
+            wins[0][column] += winner == 0
+            ties[0][column] += winner == -1
+        records.append({'type': 'summary', 'games': len(slots), 'wins': wins, 'ties': ties, 'startup_ms': 0})
+        return records
+
+    def _match(self, rng, agent1, agent2):
+        config = self.config_by_driver['CoEvEvaluationGame']
+        score1, win_time1, _ = self.predict(agent1)
+        score2, win_time2, _ = self.predict(agent2)
+        # Bradley-Terry sobre las fuerzas (logit de la proporción de puntos contra los oponentes fijos)
+        strength1, strength2 = (np.log((s + 0.01) / (1.01 - s)) for s in (score1, score2))
+        p1 = 1.0 / (1.0 + np.exp(strength2 - strength1))
+        slots = [(iteration, m, ai1) for iteration in range(config['iterations'])
+                 for m in range(len(config['maps'])) for ai1 in (0, 1)]
+        outcomes = self._outcomes(rng, (1.0 - self.tie_rate) * p1, len(slots))   # desde el punto de vista del agente 0
+        times = self._durations(rng, np.where(outcomes == 0, win_time1, win_time2))
+        times[outcomes == -1] = self.max_game_length
+        wins = [[0, 0], [0, 0]]
+        ties = [[0, 0], [0, 0]]
+        records = []
+        for (iteration, m, ai1), outcome, time in zip(slots, outcomes.tolist(), times.tolist()):
+            ai2 = 1 - ai1
+            if outcome == -1:
+                winner = -1
+                ties[0][1] += 1
+                ties[1][0] += 1
+            else:
+                winner_ai = 0 if outcome == 0 else 1
+                winner = 0 if winner_ai == ai1 else 1
+                wins[winner_ai][1 - winner_ai] += 1
+            records.append(self._game(iteration, m, ai1, ai2, time, winner))
+        records.append({'type': 'summary', 'games': len(slots), 'wins': wins, 'ties': ties, 'startup_ms': 0})
+        return records
+
+    def _game(self, iteration, m, ai1, ai2, time, winner):
+        return {'type': 'game', 'iteration': iteration, 'map': m, 'ai1': ai1, 'ai2': ai2, 'time': time,
+                'winner': winner, 'crashed': -1, 'timedout': -1, 'wall_ms': int(1000 * self.cycle_seconds * time)}
+
+    def start(self):
+        pass
+
+    def map(self, function, items):
+        """Aplica function a cada elemento con hasta workers hilos (mantiene el orden)."""
+        return list(self._executor.map(function, items))
+
+    def stats(self):
+        return {'requests': self.requests, 'tie_rate': self.tie_rate, 'individuals': len(self.points)}
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def make_backend(game_backend, processes, **options):
+    """
+    Crea el backend indicado por nombre ('replay'); un objeto backend se devuelve tal cual.
+
+    Las options se pasan al constructor del backend (p.ej. cycle_seconds de ReplayBackend).
+    """
+    if not isinstance(game_backend, str):
+        return game_backend
+    if game_backend == 'replay':
+        return ReplayBackend.from_results(workers=processes, **options)
+    raise ValueError(f"Backend de partidas desconocido: {game_backend} (opciones: {GAME_BACKENDS})")
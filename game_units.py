@@ -0,0 +1,195 @@
+"""
+Reparto de las evaluaciones de EvaluationTournament en partidas individuales.
+
+Un torneo de evaluación son mapas x oponentes x iteraciones partidas que la JVM juega
+en serie, de modo que cada generación espera al candidato más lento. Aquí cada
+evaluación se divide en unidades (mapa, oponente, iteración), las unidades de todos
+los candidatos de la generación se reparten entre los procesos disponibles y los
+resultados de cada candidato se vuelven a juntar con el mismo formato que el torneo
+completo (partidas en columnas y bloques 'wins'/'ties' del resumen).
+"""
+
+import subprocess
+from multiprocessing import Pool
+
+import numpy as np
+
+from jvm_evaluation import CLASS_PATH
+from seeding import game_seed, seed_arguments, seeded_payload
+from supervision import run_java, supervised_call
+from tournament_results import GAME_COLUMNS, parse_tournament_output
+from tracing import ExecutionTimer
+
+
+def game_units(config):
+    """
+    Enumera las partidas de un torneo.
+
+    Args:
+        config (dict): configuración del driver (ver jvm_evaluation.tournament_config)
+
+    Returns:
+        list: tuplas (mapa, oponente, iteración)
+    """
+    return [(map_idx, opponent, iteration)
+            for iteration in range(config['iterations'])
+            for map_idx in range(len(config['maps']))
+            for opponent in range(len(config['opponents']))]
+
+
+def unit_task(candidate, unit, class_path, policy, config):
+    """Tarea de una partida suelta con su semilla (la de config['game_seed'], si la hay: ver seeding.py)."""
+    return candidate, unit, class_path, policy, game_seed(config.get('game_seed'), candidate, unit)
+
+
+def play_game_unit(task):
+    """
+    Juega una partida en un subprocess java (para multiprocessing.Pool).
+
+    Args:
+        task: tupla (candidate, (mapa, oponente, iteración), class_path[, policy[, seed]]); con una
+            SupervisionPolicy la partida tiene límite de tiempo (game_timeout) y reintentos, y
+            con una semilla MyAgent la juega de forma reproducible
+
+    Returns:
+        tuple: (partidas, resumen) tal y como los devuelve parse_tournament_output; el
+               resumen lleva en 'timing' el desglose de tiempos de la ejecución (ver tracing.py)
+    """
+    candidate, (map_idx, opponent, _), class_path = task[:3]
+    command = ['java', '-cp', class_path, 'tournament.EvaluationTournament'] + \
+        [str(c) for c in candidate] + ['-', str(map_idx), str(opponent)] + \
+        seed_arguments(task[4] if len(task) > 4 else None)
+    policy = task[3] if len(task) > 3 else None
+    timer = ExecutionTimer()
+    if policy is None:
+        stdout = timer.run(lambda: subprocess.run(command, capture_output=True, text=True).stdout)
+        return timed_unit(timer, parse_tournament_output(stdout))
+
+    parsed, _ = supervised_call(lambda: parse_tournament_output(timer.run(lambda: run_java(command, policy.game_timeout))),
+                                accept=lambda parsed: parsed[1] is not None,
+                                retries=policy.retries, backoff=policy.backoff)
+    return timed_unit(timer, parsed) if parsed is not None else parse_tournament_output([])
+
+
+def play_game_unit_server(task, evaluation_server):
+    """Juega una partida en una de las JVM persistentes (mismo formato de task y resultado que play_game_unit)."""
+    candidate, (map_idx, opponent, iteration) = task[:2]
+    policy = task[3] if len(task) > 3 else None
+    # La iteración distingue las repeticiones de una misma celda (el servidor Java la ignora)
+    payload = seeded_payload({'type': 'game', 'agent': [str(c) for c in candidate], 'map': map_idx,
+                              'opponent': opponent, 'iteration': iteration}, task[4] if len(task) > 4 else None)
+    timer = ExecutionTimer()
+    if policy is not None:
+        parsed, _ = supervised_call(
+            lambda: parse_tournament_output(
+                timer.run(lambda: evaluation_server.request(payload, policy.game_timeout)['records'])),
+            accept=lambda parsed: parsed[1] is not None, retries=policy.retries, backoff=policy.backoff)
+        return timed_unit(timer, parsed) if parsed is not None else parse_tournament_output([])
+    try:
+        response = timer.run(lambda: evaluation_server.request(payload))
+    except RuntimeError:
+        return parse_tournament_output([])
+    return timed_unit(timer, parse_tournament_output(response['records']))
+
+
+def timed_unit(timer, parsed):
+    """Añade al resumen de una partida suelta su desglose de tiempos (solo si la partida terminó)."""
+    if parsed[1] is not None:
+        parsed[1]['timing'] = timer.record(parsed)
+    return parsed
+
+
+def merge_game_units(units, results, n_opponents):
+    """
+    Junta las partidas sueltas de un candidato como si fueran un único torneo.
+
+    Args:
+        units (list): unidades (mapa, oponente, iteración) jugadas
+        results (list): (partidas, resumen) de cada unidad, en el mismo orden
+        n_opponents (int): número de oponentes del torneo
+
+    Returns:
+        tuple: (partidas en columnas, resumen con 'wins' y 'ties' de 1 x n_opponents y en
+               'timing' los desgloses de tiempos de las partidas), con resumen None si alguna
+               partida no se pudo jugar
+    """
+    columns = {column: [] for column in GAME_COLUMNS}
+    wins = np.zeros((1, n_opponents), dtype=np.int64)
+    ties = np.zeros((1, n_opponents), dtype=np.int64)
+    timings = []
+    complete = True
+
+    for (map_idx, opponent, iteration), (games, summary) in zip(units, results):
+        n_games = len(games['time'])
+        if summary is None or 'wins' not in summary or n_games == 0:
+            complete = False
+            continue
+        for column in GAME_COLUMNS:
+            columns[column].append(games[column])
+        # En la salida de una partida suelta mapa, oponente e iteración valen 0
+        columns['iteration'][-1] = np.full(n_games, iteration, dtype=np.int64)
+        columns['map'][-1] = np.full(n_games, map_idx, dtype=np.int64)
+        columns['ai2'][-1] = np.full(n_games, opponent, dtype=np.int64)
+        wins[0, opponent] += np.sum(summary['wins'])
+        ties[0, opponent] += np.sum(summary['ties'])
+        if 'timing' in summary:
+            timing = summary['timing']
+            for game in timing['games']:
+                game[:3] = [map_idx, opponent, iteration]
+            timings.append(timing)
+
+    games = {column: np.concatenate(values) if values else np.empty(0, dtype=np.int64)
+             for column, values in columns.items()}
+    if not complete:
+        return games, None
+    return games, {'wins': wins, 'ties': ties, 'games': len(games['time']), 'timing': timings}
+
+
+def play_game_tasks(tasks, evaluation_server=None, pool=None):
+    """
+    Juega una lista de partidas sueltas.
+
+    Args:
+        tasks (list): tuplas (candidate, (mapa, oponente, iteración), class_path[, policy[, seed]])
+        evaluation_server (EvaluationServerPool): JVMs persistentes; si es None se usa pool
+        pool (multiprocessing.Pool): procesos que lanzan un subprocess java por partida
+
+    Returns:
+        list: (partidas, resumen) de cada partida, en el mismo orden que tasks
+    """
+    if evaluation_server is not None:
+        return evaluation_server.map(lambda task: play_game_unit_server(task, evaluation_server), tasks)
+    return pool.map(play_game_unit, tasks, chunksize=1)
+
+
+def run_game_units(candidates, config, evaluation_server=None, processes=None, class_path=CLASS_PATH,
+                   policy=None, pool=None):
+    """
+    Juega todas las partidas de varios candidatos repartiéndolas entre procesos.
+
+    Args:
+        candidates (list): genomas a evaluar
+        config (dict): configuración de EvaluationTournament
+        evaluation_server (EvaluationServerPool): JVMs persistentes; si es None se usa un
+            multiprocessing.Pool con subprocess java por partida
+        processes (int): procesos del Pool (ignorado con evaluation_server)
+        class_path (str): classpath de Java
+        policy (SupervisionPolicy): límites de tiempo y reintentos por partida (None sin supervisión)
+        pool (multiprocessing.Pool): procesos del experimento (ignorado con evaluation_server); si es
+            None se crea uno de processes procesos para esta llamada
+
+    Returns:
+        list: (partidas, resumen) de cada candidato, en el mismo orden
+    """
+    units = game_units(config)
+    tasks = [unit_task(candidate, unit, class_path, policy, config) for candidate in candidates for unit in units]
+
+    if evaluation_server is not None or pool is not None:
+        results = play_game_tasks(tasks, evaluation_server=evaluation_server, pool=pool)
+    else:
+        with Pool(processes=processes) as pool:
+            results = play_game_tasks(tasks, pool=pool)
+
+    n_units = len(units)
+    return [merge_game_units(units, results[idx * n_units:(idx + 1) * n_units], len(config['opponents']))
+            for idx in range(len(candidates))]
@@ -0,0 +1,21 @@
+"""
+Base de los observadores, evaluadores y migradores con estado que se pasan a inspyred.
+
+inspyred escribe en sus mensajes de log el __name__ de los observadores, evaluadores y
+migradores, un atributo que tienen las funciones pero no las instancias de una clase.
+"""
+
+
+class InspyredCallable:
+    """
+    Objeto invocable con el __name__ que inspyred espera de sus funciones.
+
+    Las subclases lo declaran en el atributo de clase inspyred_name (o en la instancia, si
+    depende de lo que envuelven).
+    """
+
+    inspyred_name = None
+
+    @property
+    def __name__(self):
+        return self.inspyred_name or type(self).__name__
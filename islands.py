@@ -0,0 +1,214 @@
+"""
+Modelo de islas: varias poblaciones de GA que evolucionan a la vez en procesos separados
+e intercambian migrantes periódicamente.
+
+Cada isla es un run_experiment normal (con su carpeta de resultados, sus checkpoints y su
+parte de los procesos de evaluación) con un migrador de inspyred, FileMigrator: cada
+interval generaciones publica sus size mejores individuos (genoma y fitness) en
+<exchange_dir>/island-<i>.json y sustituye a sus peores individuos por los últimos
+migrantes publicados por las islas de las que recibe según la topología:
+
+- 'ring': cada isla recibe de la anterior (i - 1).
+- 'complete': cada isla recibe de todas las demás.
+- 'star': la isla 0 recibe de todas y las demás solo de la 0.
+
+La migración es asíncrona (no hay barrera entre islas: se leen los últimos migrantes
+publicados) y los ficheros se reemplazan de forma atómica, así que exchange_dir puede
+ser un directorio compartido entre máquinas. Todas las islas en esta máquina:
+
+    python islands.py run --islands 4 --topology ring --nprocs 64 --evaluations 600 --pop-size 15
+
+Una isla suelta (p.ej. en otra máquina con exchange_dir en un disco compartido). Todas las
+islas de una ejecución deben recibir el mismo --exchange-dir; sin él cada isla usa un
+directorio nuevo y no importa migrantes de ejecuciones anteriores:
+
+    python islands.py island --index 2 --islands 4 --topology ring --exchange-dir /compartido/islas --nprocs 16
+
+Cada isla escribe sus inspyred-statistics-file e inspyred-individuals-file en su carpeta de
+resultados (GABotsLit_<timestamp>_island<i>), no en el directorio de trabajo compartido.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import namedtuple
+from time import time
+
+from inspyred.ec import Individual
+
+from fitness_cache import canonical_genome
+from inspyred_callables import InspyredCallable
+
+ISLAND_TOPOLOGIES = ('ring', 'complete', 'star')
+
+IslandSpec = namedtuple('IslandSpec', ['index', 'islands', 'topology', 'interval', 'size', 'exchange_dir'])
+IslandSpec.__new__.__defaults__ = ('ring', 2, 2, './resultados/islands')
+IslandSpec.__doc__ = """
+Posición de una isla en el modelo (pequeño y serializable: se guarda en el checkpoint).
+
+    index (int): número de la isla (0 .. islands - 1)
+    islands (int): número total de islas
+    topology (str): 'ring', 'complete' o 'star'
+    interval (int): generaciones entre migraciones
+    size (int): migrantes que publica cada isla (sus mejores individuos)
+    exchange_dir (str): directorio (compartido) de los ficheros de migrantes
+"""
+
+
+def topology_sources(topology, islands, index):
+    """Islas de las que recibe migrantes la isla index."""
+    if topology not in ISLAND_TOPOLOGIES:
+        raise ValueError(f"Topología desconocida: {topology} (opciones: {ISLAND_TOPOLOGIES})")
+    if islands < 2:
+        return []
+    if topology == 'ring':
+        return [(index - 1) % islands]
+    if topology == 'complete':
+        return [other for other in range(islands) if other != index]
+    return [other for other in range(1, islands)] if index == 0 else [0]
+
+
+def exchange_path(exchange_dir, index):
+    return os.path.join(exchange_dir, f"island-{index}.json")
+
+
+class FileMigrator(InspyredCallable):
+    """
+    Migrador de inspyred que intercambia los mejores individuos por ficheros.
+
+    Args:
+        spec (IslandSpec): isla y parámetros de la migración
+        fitness_class: clase con la que se reconstruye el fitness de los inmigrantes (LexicoFitness)
+    """
+
+    inspyred_name = 'file_migration'
+
+    def __init__(self, spec, fitness_class):
+        self.spec = spec
+        self.fitness_class = fitness_class
+        self.sources = topology_sources(spec.topology, spec.islands, spec.index)
+        self.seen = {}      # isla de origen -> última publicación ya importada
+        self.sent = 0
+        self.received = 0
+        os.makedirs(spec.exchange_dir, exist_ok=True)
+
+    def publish(self, population, generation):
+        """Escribe de forma atómica los size mejores individuos de la población."""
+        elite = sorted(population, reverse=True)[:self.spec.size]
+        migrants = [{'candidate': list(ind.candidate),
+                     'fitness': [ind.fitness.victorias, ind.fitness.tiempo_victoria, ind.fitness.tiempo_derrota]}
+                    for ind in elite]
+        path = exchange_path(self.spec.exchange_dir, self.spec.index)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump({'island': self.spec.index, 'generation': generation, 'published': time(),
+                       'migrants': migrants}, f)
+        os.replace(temporary, path)
+        self.sent += len(migrants)
+
+    def collect(self):
+        """Migrantes publicados por las islas de origen desde la última vez (una vez cada publicación)."""
+        immigrants = []
+        for source in self.sources:
+            try:
+                with open(exchange_path(self.spec.exchange_dir, source)) as f:
+                    message = json.load(f)
+            except (OSError, ValueError):
+                continue   # la isla todavía no ha publicado
+            stamp = (message['generation'], message['published'])
+            if self.seen.get(source) == stamp:
+                continue
+            self.seen[source] = stamp
+            immigrants.extend(message['migrants'])
+        return immigrants
+
+    def __call__(self, random, population, args):
+        generation = args['_ec'].num_generations + 1
+        if generation % self.spec.interval != 0 or not population:
+            return population
+        self.publish(population, generation)
+        present = {canonical_genome(ind.candidate) for ind in population}
+        arrivals = []
+        for migrant in self.collect():
+            genome = canonical_genome(migrant['candidate'])
+            if genome in present:
+                continue
+            present.add(genome)
+            ind = Individual(migrant['candidate'], maximize=population[0].maximize)
+            ind.fitness = self.fitness_class(*migrant['fitness'])
+            arrivals.append(ind)
+        if not arrivals:
+            return population
+        # Los inmigrantes sustituyen a los peores (nunca más de la mitad de la población)
+        arrivals = sorted(arrivals, reverse=True)[:max(1, len(population) // 2)]
+        survivors = sorted(population, reverse=True)[:len(population) - len(arrivals)]
+        self.received += len(arrivals)
+        return survivors + arrivals
+
+    def stats(self):
+        return {'sent': self.sent, 'received': self.received, 'sources': self.sources}
+
+
+def island_command(spec, nprocs, evaluations, pop_size, use_jvm_server=False, game_backend=None):
+    """Línea de órdenes que lanza una isla (python islands.py island ...)."""
+    command = [sys.executable, os.path.abspath(__file__), 'island', '--index', str(spec.index),
+               '--islands', str(spec.islands), '--topology', spec.topology, '--interval', str(spec.interval),
+               '--size', str(spec.size), '--exchange-dir', spec.exchange_dir, '--nprocs', str(nprocs),
+               '--evaluations', str(evaluations), '--pop-size', str(pop_size)]
+    if use_jvm_server:
+        command.append('--jvm-server')
+    if game_backend is not None:
+        command += ['--game-backend', game_backend]
+    return command
+
+
+def run_islands(islands, nprocs, evaluations, pop_size, topology='ring', interval=2, size=2,
+                exchange_dir=None, use_jvm_server=False, game_backend=None):
+    """
+    Lanza todas las islas en esta máquina, cada una en su proceso con nprocs // islands
+    procesos de evaluación, y espera a que terminen.
+
+    Returns:
+        list: códigos de salida de las islas
+    """
+    if exchange_dir is None:
+        exchange_dir = f"./resultados/islands_{int(time())}"
+    per_island = max(1, nprocs // islands)
+    processes = [subprocess.Popen(island_command(IslandSpec(index, islands, topology, interval, size, exchange_dir),
+                                                 per_island, evaluations, pop_size, use_jvm_server, game_backend))
+                 for index in range(islands)]
+    return [process.wait() for process in processes]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GA con modelo de islas y migración")
+    parser.add_argument('role', choices=['run', 'island'], help="'run' lanza todas las islas; 'island' solo una")
+    parser.add_argument('--islands', type=int, default=4)
+    parser.add_argument('--index', type=int, default=0, help="número de isla (solo con 'island')")
+    parser.add_argument('--topology', choices=ISLAND_TOPOLOGIES, default='ring')
+    parser.add_argument('--interval', type=int, default=2, help="generaciones entre migraciones")
+    parser.add_argument('--size', type=int, default=2, help="migrantes por publicación")
+    parser.add_argument('--exchange-dir', default=None,
+                        help="directorio de migrantes, el mismo para todas las islas (por defecto, uno nuevo)")
+    parser.add_argument('--nprocs', type=int, default=16, help="procesos de evaluación (en total con 'run')")
+    parser.add_argument('--evaluations', type=int, default=150, help="evaluaciones por isla")
+    parser.add_argument('--pop-size', type=int, default=15)
+    parser.add_argument('--jvm-server', action='store_true', help="evaluar en JVMs persistentes")
+    parser.add_argument('--game-backend', default=None, help="backend de partidas (p.ej. 'replay')")
+    options = parser.parse_args()
+
+    if options.role == 'run':
+        codes = run_islands(options.islands, options.nprocs, options.evaluations, options.pop_size,
+                            options.topology, options.interval, options.size, options.exchange_dir,
+                            options.jvm_server, options.game_backend)
+        sys.exit(max(codes))
+
+    from GAmicroRTS import run_experiment
+    spec = IslandSpec(options.index, options.islands, options.topology, options.interval, options.size,
+                      options.exchange_dir or f"./resultados/islands_{int(time())}_{options.index}")
+    best_individual, tiempo = run_experiment(mp_nprocs=options.nprocs, evaluations=options.evaluations,
+                                             pop_size=options.pop_size, use_jvm_server=options.jvm_server,
+                                             game_backend=options.game_backend, island=spec)
+    print(f"Isla {spec.index}: mejor {str(best_individual)}, tiempo {tiempo:.2f}s")
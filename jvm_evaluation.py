@@ -0,0 +1,215 @@
+"""
+Evaluación sobre JVMs persistentes.
+
+Cada EvaluationServer mantiene vivo un proceso ``java tournament.EvaluationServer``
+que recibe peticiones JSON por stdin y devuelve los registros del torneo por stdout
+(ver tournament_results),
+de modo que el arranque de la JVM, la carga de clases y el JIT se pagan una sola
+vez por proceso y no en cada evaluación de fitness.
+"""
+
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from threading import Timer
+
+from supervision import ExecutionTimeout
+
+CLASS_PATH = 'bin/' +\
+  ':lib/hamcrest-all-1.3.jar:' +\
+  'lib/jdom.jar:lib/junit-4.12.jar:' +\
+  'lib/minimal-json-0.9.4.jar:lib/weka.jar:' +\
+  'lib/MicroRTS.jar'
+
+
+def tournament_config(driver, class_path=CLASS_PATH):
+    """
+    Obtiene la configuración de un driver de torneo ejecutándolo con ``--config``.
+
+    Args:
+        driver (str): 'EvaluationTournament' o 'CoEvEvaluationGame'
+        class_path (str): classpath de Java
+
+    Returns:
+        dict: oponentes, mapas, iteraciones y parámetros de partida del driver
+    """
+    result = subprocess.run(['java', '-cp', class_path, f'tournament.{driver}', '--config'],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class EvaluationServerError(RuntimeError):
+    """Error de comunicación con la JVM (proceso caído o respuesta ilegible)."""
+
+
+class EvaluationTimeout(EvaluationServerError, ExecutionTimeout):
+    """La petición superó su límite de tiempo; la JVM se mató y se arrancará otra."""
+
+
+class EvaluationServer:
+    """
+    Cliente de una única JVM de evaluación.
+
+    Las peticiones se atienden de una en una; para evaluar en paralelo se usa
+    EvaluationServerPool, que reparte las peticiones entre varias JVM.
+    """
+
+    def __init__(self, class_path=CLASS_PATH):
+        self.class_path = class_path
+        self.process = None
+        self.next_id = 0
+        self.requests_served = 0
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """Arranca la JVM y espera al mensaje ``ready``."""
+        self.process = subprocess.Popen(['java', '-cp', self.class_path, 'tournament.EvaluationServer'],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        ready = self._read_message()
+        if ready.get('type') != 'ready':
+            self.close()
+            raise EvaluationServerError(f"Respuesta inesperada al arrancar el servidor: {ready}")
+
+    def request(self, payload, timeout=None):
+        """
+        Envía una petición y espera su respuesta.
+
+        Args:
+            payload (dict): petición (``{'type': 'evaluate', 'agent': [...]}`` o
+                ``{'type': 'match', 'agent1': [...], 'agent2': [...]}``)
+            timeout (float): segundos máximos; si se superan se mata la JVM (None sin límite)
+
+        Returns:
+            dict: respuesta del servidor; ``records`` contiene los registros de partida
+                y de resumen emitidos durante el torneo
+
+        Raises:
+            EvaluationTimeout: si se superó timeout
+            EvaluationServerError: si la JVM ha muerto o la respuesta no es válida
+            RuntimeError: si el torneo falló dentro de la JVM
+        """
+        if not self.is_alive():
+            self.start()
+
+        # Vigilante: si la petición se pasa de tiempo mata la JVM y la lectura termina con EOF
+        watchdog = None
+        expired = []
+        if timeout is not None:
+            process = self.process
+
+            def expire():
+                expired.append(True)
+                process.kill()
+            watchdog = Timer(timeout, expire)
+            watchdog.daemon = True
+            watchdog.start()
+        try:
+            return self._request(payload)
+        except EvaluationServerError:
+            if expired:
+                raise EvaluationTimeout(f"La petición superó {timeout}s")
+            raise
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+
+    def _request(self, payload):
+        """Envía la petición y lee registros hasta la respuesta final (ver request)."""
+        self.next_id += 1
+        message = dict(payload, id=self.next_id)
+        try:
+            self.process.stdin.write(json.dumps(message) + '\n')
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise EvaluationServerError(f"No se pudo enviar la petición a la JVM: {e}")
+
+        # Registros de partida/resumen hasta la respuesta final (la que lleva 'ok')
+        records = []
+        while True:
+            response = self._read_message()
+            if response.get('id') != self.next_id:
+                raise EvaluationServerError(f"Respuesta desincronizada: esperaba id {self.next_id}, recibido {response.get('id')}")
+            if 'ok' in response:
+                break
+            records.append(response)
+        if not response['ok']:
+            raise RuntimeError(response.get('error', 'Error desconocido en el servidor de evaluación'))
+
+        response['records'] = records
+
+        self.requests_served += 1
+        return response
+
+    def _read_message(self):
+        line = self.process.stdout.readline()
+        if not line:
+            raise EvaluationServerError("El servidor de evaluación terminó inesperadamente")
+        try:
+            return json.loads(line)
+        except ValueError:
+            raise EvaluationServerError(f"Línea no válida del servidor de evaluación: {line!r}")
+
+    def close(self):
+        """Pide a la JVM que termine y, si no lo hace, la mata."""
+        if self.process is None:
+            return
+        try:
+            if self.process.poll() is None:
+                self.process.stdin.write(json.dumps({'type': 'shutdown'}) + '\n')
+                self.process.stdin.flush()
+            self.process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+
+class EvaluationServerPool:
+    """
+    Conjunto de JVMs persistentes compartido durante todo el experimento.
+
+    Cada petición toma una JVM libre, la usa y la devuelve al conjunto. Si la JVM
+    se cae se cierra y se vuelve a arrancar en la siguiente petición que la use.
+    """
+
+    def __init__(self, size, class_path=CLASS_PATH):
+        self.size = size
+        self.servers = [EvaluationServer(class_path) for _ in range(size)]
+        self._idle = Queue()
+        for server in self.servers:
+            self._idle.put(server)
+        self._executor = ThreadPoolExecutor(max_workers=size)
+
+    def start(self):
+        """Arranca todas las JVM en paralelo (falla pronto si no se pueden lanzar)."""
+        list(self._executor.map(lambda server: server.start(), self.servers))
+
+    def request(self, payload, timeout=None):
+        server = self._idle.get()
+        try:
+            return server.request(payload, timeout)
+        except EvaluationServerError:
+            server.close()
+            raise
+        finally:
+            self._idle.put(server)
+
+    def map(self, function, items):
+        """Aplica function a cada elemento usando tantos hilos como JVMs (mantiene el orden)."""
+        return list(self._executor.map(function, items))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for server in self.servers:
+            server.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,109 @@
+"""
+Evaluador paralelo ligero para inspyred.
+
+evaluators.parallel_evaluation_mp crea un Pool en cada generación y envía a cada
+proceso, por cada candidato, todo el diccionario args que se pueda serializar
+(incluido el estado de la evolución). LeanEvaluator mantiene un Pool durante todo el
+experimento y solo envía el genoma, la función de evaluación (por referencia) y un
+contexto pequeño que no cambia. Registra el tamaño serializado de cada envío y la
+latencia hasta que un proceso empieza a evaluarlo.
+"""
+
+import csv
+import pickle
+from multiprocessing import Pool
+from time import time
+
+from inspyred_callables import InspyredCallable
+
+
+def _evaluate_payload(payload):
+    function, candidate, context, submitted = payload
+    started = time()
+    return function(candidate, context), started - submitted
+
+
+def inspyred_payload_size(candidate, args):
+    """Bytes que parallel_evaluation_mp serializaría para un candidato (args sin lo que no se puede serializar)."""
+    pickled_args = {}
+    for key, value in args.items():
+        try:
+            pickle.dumps(value)
+            pickled_args[key] = value
+        except Exception:  # lo que inspyred no puede serializar se queda fuera
+            pass
+    return len(pickle.dumps(([candidate], pickled_args)))
+
+
+class LeanEvaluator(InspyredCallable):
+    """
+    Evaluador de inspyred con Pool persistente.
+
+    Args:
+        function: función de nivel de módulo (candidate, context) -> fitness
+        processes (int): número de procesos
+        context (dict): contexto de evaluación pequeño, igual para todos los candidatos
+        log_path (str): CSV donde se añade una fila por generación con bytes enviados y
+            latencias (None para no registrarlo)
+        compare_inspyred (bool): registrar también lo que habría enviado parallel_evaluation_mp. Se mide
+            una sola vez, en la primera llamada: serializar cada entrada de args cuesta casi tanto
+            como el envío que se quiere evitar
+    """
+
+    inspyred_name = 'lean_evaluation'
+
+    def __init__(self, function, processes, context=None, log_path=None, compare_inspyred=False):
+        self.function = function
+        self.context = context if context is not None else {}
+        self.pool = Pool(processes=processes)
+        self.log_path = log_path
+        self.compare_inspyred = compare_inspyred
+        self.calls = 0
+        self.candidates = 0
+        self.payload_bytes = 0
+        self.dispatch_latency = 0.0
+        self.inspyred_bytes = None
+        if log_path is not None:
+            with open(log_path, 'w', newline='') as f:
+                csv.writer(f).writerow(['generation', 'candidates', 'mean_payload_bytes', 'inspyred_payload_bytes',
+                                        'mean_dispatch_latency_ms', 'max_dispatch_latency_ms'])
+
+    def __call__(self, candidates, args):
+        submitted = time()
+        payloads = [(self.function, candidate, self.context, submitted) for candidate in candidates]
+        sizes = [len(pickle.dumps(payload)) for payload in payloads]
+        results = self.pool.map(_evaluate_payload, payloads, chunksize=1)
+        fitness = [result for result, _ in results]
+        latencies = [latency for _, latency in results]
+
+        inspyred_bytes = ''   # solo en la fila de la generación en la que se mide
+        if self.compare_inspyred and self.inspyred_bytes is None and candidates:
+            self.inspyred_bytes = inspyred_bytes = inspyred_payload_size(candidates[0], args)
+        self.calls += 1
+        self.candidates += len(candidates)
+        self.payload_bytes += sum(sizes)
+        self.dispatch_latency += sum(latencies)
+
+        if self.log_path is not None and candidates:
+            with open(self.log_path, 'a', newline='') as f:
+                csv.writer(f).writerow([self.calls - 1, len(candidates), round(sum(sizes) / len(sizes), 1),
+                                        inspyred_bytes, round(1000 * sum(latencies) / len(latencies), 3),
+                                        round(1000 * max(latencies), 3)])
+        return fitness
+
+    def stats(self):
+        """
+        Medias por candidato de bytes enviados y latencia de envío; inspyred_bytes es lo que enviaría
+        parallel_evaluation_mp en la primera generación (None si no se comparó).
+        """
+        n = self.candidates or 1
+        return {
+            'candidates': self.candidates,
+            'payload_bytes': self.payload_bytes / n,
+            'inspyred_bytes': self.inspyred_bytes,
+            'dispatch_latency_ms': 1000 * self.dispatch_latency / n,
+        }
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
@@ -0,0 +1,171 @@
+"""
+Emparejamientos dispersos para los torneos de co-evolución.
+
+Un round-robin completo cuesta N(N-1)/2 enfrentamientos por generación. Estos esquemas
+eligen un subconjunto con un presupuesto de enfrentamientos lineal en N:
+
+- 'swiss': rondas de sistema suizo, emparejando agentes con rating parecido sin repetir parejas.
+- 'k_random': k oponentes aleatorios por agente.
+- 'active': los enfrentamientos con más información esperada: resultado incierto
+  (ratings parecidos) entre agentes con pocos enfrentamientos.
+
+Las parejas se devuelven como tuplas (i, j) con i < j, como en el round-robin.
+"""
+
+from math import exp
+from statistics import pstdev
+
+import numpy as np
+
+PAIRING_SCHEMES = ('round_robin', 'swiss', 'k_random', 'active')
+
+
+def round_robin_pairings(n):
+    """Todas las parejas (i, j) con i < j."""
+    return [(i, j) for i in range(n) for j in range(i + 1, n)]
+
+
+def _pair(i, j):
+    return (i, j) if i < j else (j, i)
+
+
+def swiss_pairings(ratings, rounds, random, exclude=()):
+    """
+    Rondas de sistema suizo.
+
+    En cada ronda los agentes se ordenan por rating (desempates aleatorios) y cada uno se
+    empareja con el siguiente con el que aún no haya jugado.
+
+    Args:
+        ratings (list): rating actual de cada agente
+        rounds (int): número de rondas (cada agente juega como mucho una vez por ronda)
+        random: generador aleatorio
+        exclude: parejas que no se deben programar (p. ej. ya jugadas)
+
+    Returns:
+        list: parejas (i, j)
+    """
+    n = len(ratings)
+    used = set(exclude)
+    pairs = []
+    for _ in range(rounds):
+        tie_break = [random.random() for _ in range(n)]
+        order = sorted(range(n), key=lambda i: (-ratings[i], tie_break[i]))
+        waiting = list(order)
+        while len(waiting) > 1:
+            i = waiting.pop(0)
+            for position, j in enumerate(waiting):
+                if _pair(i, j) not in used:
+                    waiting.pop(position)
+                    used.add(_pair(i, j))
+                    pairs.append(_pair(i, j))
+                    break
+    return pairs
+
+
+def k_random_pairings(n, k, random, exclude=()):
+    """
+    k oponentes aleatorios por agente (sin repetir parejas).
+
+    Returns:
+        list: parejas (i, j); cada agente aparece en al menos min(k, n - 1) parejas salvo
+              que las excluidas lo impidan
+    """
+    used = set(exclude)
+    pairs = []
+    degree = [0] * n
+    for i in random.sample(range(n), n):
+        opponents = [j for j in range(n) if j != i and _pair(i, j) not in used]
+        random.shuffle(opponents)
+        for j in opponents:
+            if degree[i] >= k:
+                break
+            used.add(_pair(i, j))
+            pairs.append(_pair(i, j))
+            degree[i] += 1
+            degree[j] += 1
+    return pairs
+
+
+def expected_score(rating_i, rating_j, scale):
+    """Probabilidad de que i gane a j con un modelo logístico (Elo si scale = 400 / ln 10)."""
+    return 1.0 / (1.0 + exp(-(rating_i - rating_j) / scale))
+
+
+def active_pairings(ratings, counts, budget, exclude=(), scale=None):
+    """
+    Selección voraz de los enfrentamientos más informativos.
+
+    La información esperada de (i, j) es la varianza del resultado, p(1 - p), ponderada
+    por la incertidumbre de ambos ratings (1 / (1 + enfrentamientos ya jugados)).
+
+    Args:
+        ratings (list): rating actual de cada agente
+        counts (list): enfrentamientos ya jugados por cada agente
+        budget (int): número de parejas a elegir
+        exclude: parejas que no se deben programar
+        scale (float): escala del modelo logístico (por defecto, la desviación típica de los ratings)
+
+    Returns:
+        list: parejas (i, j)
+    """
+    n = len(ratings)
+    if scale is None:
+        scale = pstdev(ratings) if n > 1 and pstdev(ratings) > 0 else 1.0
+    counts = np.array(counts, dtype=float)
+    # Todas las parejas candidatas en arrays (mismo orden que round_robin_pairings)
+    first, second = np.triu_indices(n, 1)
+    if exclude:
+        excluded = np.zeros((n, n), dtype=bool)
+        excluded_pairs = np.array(list(exclude), dtype=int).reshape(-1, 2)
+        excluded[excluded_pairs[:, 0], excluded_pairs[:, 1]] = True
+        keep = ~excluded[first, second] & ~excluded[second, first]
+        first, second = first[keep], second[keep]
+    rating = np.asarray(ratings, dtype=float)
+    p = 1.0 / (1.0 + np.exp(-(rating[first] - rating[second]) / scale))
+    variance = p * (1 - p)   # no cambia al elegir parejas: solo cambian los contadores
+    available = np.ones(len(first), dtype=bool)
+    pairs = []
+    for _ in range(min(budget, len(first))):
+        gain = np.where(available, variance * (1.0 / (1 + counts[first]) + 1.0 / (1 + counts[second])), -1.0)
+        best = int(np.argmax(gain))   # la primera de las mejores, como max() sobre la lista
+        available[best] = False
+        i, j = int(first[best]), int(second[best])
+        pairs.append((i, j))
+        counts[i] += 1
+        counts[j] += 1
+    return pairs
+
+
+def sparse_pairings(scheme, ratings, random, budget=None, k=4, counts=None, exclude=(), scale=None):
+    """
+    Parejas de una generación según el esquema elegido.
+
+    Args:
+        scheme (str): uno de PAIRING_SCHEMES
+        ratings (list): rating actual de cada agente (para 'swiss' y 'active')
+        random: generador aleatorio
+        budget (int): máximo de enfrentamientos nuevos (por defecto k * N / 2)
+        k (int): oponentes por agente en 'k_random' y rondas en 'swiss'
+        counts (list): enfrentamientos ya jugados por cada agente (para 'active')
+        exclude: parejas que no se deben programar
+        scale (float): escala del modelo logístico de 'active'
+
+    Returns:
+        list: parejas (i, j) nuevas, como mucho budget
+    """
+    n = len(ratings)
+    if budget is None:
+        budget = (k * n + 1) // 2
+    if scheme == 'round_robin':
+        excluded = set(exclude)
+        pairs = [pair for pair in round_robin_pairings(n) if pair not in excluded]
+    elif scheme == 'swiss':
+        pairs = swiss_pairings(ratings, k, random, exclude)
+    elif scheme == 'k_random':
+        pairs = k_random_pairings(n, k, random, exclude)
+    elif scheme == 'active':
+        pairs = active_pairings(ratings, counts if counts is not None else [0] * n, budget, exclude, scale)
+    else:
+        raise ValueError(f"Esquema de emparejamiento desconocido: {scheme}")
+    return pairs[:budget]
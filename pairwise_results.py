@@ -0,0 +1,96 @@
+"""
+Matriz de resultados por parejas de genomas para la co-evolución.
+
+En cada generación la población (padres + hijos) juega un round-robin completo, pero
+los enfrentamientos entre padres ya se jugaron en generaciones anteriores. Aquí se
+guardan los resultados por pareja de genomas canónicos para que solo se programen los
+enfrentamientos en los que interviene algún genoma nuevo y el fitness acumulado se
+recalcule a partir de la matriz.
+"""
+
+from fitness_cache import canonical_genome
+
+MATCH_FIELDS = ('wins', 'ties', 'victory_time', 'defeat_time')
+
+
+def swap_sides(result):
+    """Intercambia los campos _i/_j de un resultado de enfrentamiento (sin tocar i, j)."""
+    swapped = dict(result)
+    for field in MATCH_FIELDS:
+        swapped[f'{field}_i'], swapped[f'{field}_j'] = result[f'{field}_j'], result[f'{field}_i']
+    return swapped
+
+
+class PairwiseResults:
+    """
+    Resultados de enfrentamientos indexados por la pareja de genomas.
+
+    Cada resultado se guarda una sola vez, orientado según el orden canónico de los
+    genomas, y se devuelve orientado según el orden en que se pide.
+    """
+
+    def __init__(self):
+        self.results = {}
+        self.played = 0
+        self.reused = 0
+
+    @staticmethod
+    def _key(agent_i, agent_j):
+        genome_i, genome_j = canonical_genome(agent_i), canonical_genome(agent_j)
+        if genome_j < genome_i:
+            return (genome_j, genome_i), True
+        return (genome_i, genome_j), False
+
+    def __contains__(self, pair):
+        return self._key(*pair)[0] in self.results
+
+    def __len__(self):
+        return len(self.results)
+
+    def get(self, i, j, agent_i, agent_j):
+        """
+        Resultado guardado de agent_i contra agent_j.
+
+        Args:
+            i, j: índices de los agentes en la generación actual (se copian al resultado)
+            agent_i, agent_j: genomas
+
+        Returns:
+            dict: resultado orientado como (i, j), o None si la pareja no se ha jugado
+        """
+        key, swapped = self._key(agent_i, agent_j)
+        stored = self.results.get(key)
+        if stored is None:
+            return None
+        result = swap_sides(stored) if swapped else dict(stored)
+        result.update({'i': i, 'j': j, 'success': True})
+        return result
+
+    def put(self, agent_i, agent_j, result):
+        """Guarda un resultado correcto de agent_i contra agent_j (los fallidos no se guardan)."""
+        if not result['success']:
+            return
+        key, swapped = self._key(agent_i, agent_j)
+        stored = {name: value for name, value in result.items() if name not in ('i', 'j', 'success')}
+        self.results[key] = swap_sides(stored) if swapped else stored
+
+    def missing_pairs(self, agents, pairs):
+        """Parejas (i, j) de pairs cuyo enfrentamiento aún no está en la matriz (sin repetir genomas)."""
+        missing = []
+        seen = set()
+        for i, j in pairs:
+            key = self._key(agents[i], agents[j])[0]
+            if key in self.results or key in seen:
+                continue
+            seen.add(key)
+            missing.append((i, j))
+        return missing
+
+    def retain(self, agents):
+        """Elimina las parejas en las que algún genoma ya no está en la población."""
+        alive = {canonical_genome(agent) for agent in agents}
+        self.results = {key: value for key, value in self.results.items()
+                        if key[0] in alive and key[1] in alive}
+
+    def stats(self):
+        return {'played': self.played, 'reused': self.reused, 'pairs': len(self.results)}
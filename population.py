@@ -0,0 +1,159 @@
+"""
+Población en un array estructurado de NumPy con selección lexicográfica vectorizada.
+
+Ordenar una lista de Individual con LexicoFitness pasa por las comparaciones de Python
+de Individual y LexicoFitness (__gt__ -> __le__ -> __lt__ + __eq__) en cada par. Aquí la
+población se vuelca a un array con los genes y las tres claves del fitness (victorias,
+tiempo de victoria y tiempo de derrota) y se ordena de una vez con np.lexsort:
+
+- más victorias es mejor,
+- a igualdad, menor tiempo medio de victoria,
+- a igualdad, mayor tiempo medio de derrota.
+
+tournament_selection, rank_selection y plus_replacement tienen la firma de los operadores
+de inspyred (reciben y devuelven los Individual de siempre, así que los observadores no
+cambian), pero eligen con el array. to_individuals y save_population/load_population
+convierten en el otro sentido, p.ej. para leer una población final sin parsear el repr
+del fitness.
+
+Un fitness float sin las claves lexicográficas (el ELO de la co-evolución) se guarda como
+victorias con tiempos 0, así que se ordena por su valor.
+"""
+
+import numpy as np
+from inspyred.ec import Individual
+
+N_GENES = 10
+POPULATION_DTYPE = np.dtype([('genes', np.float64, (N_GENES,)), ('label', 'U16'), ('victorias', np.float64),
+                             ('tiempo_victoria', np.float64), ('tiempo_derrota', np.float64),
+                             ('birthdate', np.float64)])
+
+
+def to_array(individuals):
+    """
+    Vuelca una lista de Individual de inspyred a un array con POPULATION_DTYPE.
+
+    Los candidatos con etiqueta (las semillas llevan 'GABotsLit', 'CoEvELO', ...) la guardan en label.
+    """
+    population = np.zeros(len(individuals), dtype=POPULATION_DTYPE)
+    if not individuals:
+        return population
+    # Se rellena por columnas: una asignación por campo en lugar de una por individuo
+    population['genes'] = [ind.candidate[:N_GENES] for ind in individuals]
+    population['label'] = [str(ind.candidate[N_GENES]) if len(ind.candidate) > N_GENES else ''
+                           for ind in individuals]
+    population['victorias'] = [getattr(ind.fitness, 'victorias', ind.fitness) for ind in individuals]
+    population['tiempo_victoria'] = [getattr(ind.fitness, 'tiempo_victoria', 0.0) for ind in individuals]
+    population['tiempo_derrota'] = [getattr(ind.fitness, 'tiempo_derrota', 0.0) for ind in individuals]
+    population['birthdate'] = [ind.birthdate for ind in individuals]
+    return population
+
+
+def to_individuals(population, fitness_class=None, maximize=True):
+    """
+    Reconstruye los Individual de inspyred de un array con POPULATION_DTYPE.
+
+    Args:
+        population (np.ndarray): población
+        fitness_class: clase del fitness (p.ej. LexicoFitness); None para un float con las victorias
+        maximize (bool): si el fitness se maximiza
+
+    Returns:
+        list: Individual con los genes enteros (3 y 4) como int y la etiqueta, si la hay, al final
+    """
+    individuals = []
+    for row in population:
+        candidate = [float(gene) for gene in row['genes']]
+        candidate[3], candidate[4] = int(candidate[3]), int(candidate[4])
+        if row['label']:
+            candidate.append(str(row['label']))
+        ind = Individual(candidate, maximize=maximize)
+        if fitness_class is None:
+            ind.fitness = float(row['victorias'])
+        else:
+            ind.fitness = fitness_class(float(row['victorias']), float(row['tiempo_victoria']),
+                                        float(row['tiempo_derrota']))
+        ind.birthdate = float(row['birthdate'])
+        individuals.append(ind)
+    return individuals
+
+
+def lexico_order(population, maximize=True):
+    """
+    Índices de la población del mejor al peor según el orden lexicográfico de LexicoFitness.
+
+    Es estable: a igualdad de fitness se mantiene el orden de entrada (como list.sort).
+    """
+    if maximize:
+        keys = (-population['tiempo_derrota'], population['tiempo_victoria'], -population['victorias'])
+    else:
+        keys = (population['tiempo_derrota'], -population['tiempo_victoria'], population['victorias'])
+    return np.lexsort(keys)
+
+
+def lexico_ranks(population, maximize=True):
+    """Posición de cada individuo en el orden lexicográfico (0 el mejor)."""
+    ranks = np.empty(len(population), dtype=np.int64)
+    ranks[lexico_order(population, maximize)] = np.arange(len(population))
+    return ranks
+
+
+def _numpy_random(random):
+    """Generador de NumPy sembrado desde el random.Random del algoritmo (reproducible y checkpointable)."""
+    return np.random.default_rng(random.getrandbits(64))
+
+
+def _maximize(individuals):
+    return individuals[0].maximize if individuals else True
+
+
+def tournament_selection(random, population, args):
+    """
+    Como ec.selectors.tournament_selection (num_selected torneos de tournament_size
+    individuales distintos, gana el mejor) pero con los torneos sorteados y resueltos a la vez.
+    """
+    num_selected = args.setdefault('num_selected', 1)
+    tournament_size = min(args.setdefault('tournament_size', 2), len(population))
+    if not population or num_selected == 0:
+        return []
+    ranks = lexico_ranks(to_array(population), _maximize(population))
+    rng = _numpy_random(random)
+    # Muestreo sin reemplazo dentro de cada torneo: los tournament_size menores de una permutación aleatoria
+    entrants = np.argpartition(rng.random((num_selected, len(population))), tournament_size - 1,
+                               axis=1)[:, :tournament_size]
+    winners = entrants[np.arange(num_selected), ranks[entrants].argmin(axis=1)]
+    return [population[idx] for idx in winners]
+
+
+def rank_selection(random, population, args):
+    """
+    Como ec.selectors.rank_selection: probabilidad proporcional a la posición (el peor 1, el
+    mejor len(population)), con todas las selecciones sorteadas a la vez.
+    """
+    num_selected = args.setdefault('num_selected', 1)
+    if not population:
+        return []
+    n = len(population)
+    ranks = lexico_ranks(to_array(population), _maximize(population))
+    weights = (n - ranks).astype(float)
+    chosen = _numpy_random(random).choice(n, size=num_selected, p=weights / weights.sum())
+    return [population[idx] for idx in chosen]
+
+
+def plus_replacement(random, population, parents, offspring, args):
+    """Como ec.replacers.plus_replacement: los len(population) mejores de hijos + población."""
+    pool = list(offspring) + list(population)
+    if not pool:
+        return []
+    order = lexico_order(to_array(pool), _maximize(pool))
+    return [pool[idx] for idx in order[:len(population)]]
+
+
+def save_population(path, individuals):
+    """Guarda una población en un .npy con POPULATION_DTYPE (se lee con load_population)."""
+    np.save(path, to_array(individuals))
+
+
+def load_population(path, mmap_mode='r'):
+    """Lee un .npy de save_population (por defecto mapeado en memoria, sin copiarlo)."""
+    return np.load(path, mmap_mode=mmap_mode)
@@ -0,0 +1,116 @@
+"""
+Evaluación por carreras (racing) de los candidatos del GA.
+
+Las partidas de cada candidato se juegan por lotes (por defecto una iteración completa:
+todos los mapas contra todos los oponentes). Tras cada lote se descarta a los
+candidatos que ya no pueden alcanzar el peor fitness de la población actual:
+
+- 'exact': aunque ganaran todas las partidas restantes no llegarían a esas victorias.
+- 'hoeffding': la cota superior de Hoeffding (confianza 1 - delta) de su tasa de
+  victorias, extrapolada a todas las partidas, queda por debajo (estilo F-race).
+
+Con plus_replacement los supervivientes son al menos tan buenos como el peor padre,
+así que un candidato que no puede superarlo se descartaría igualmente.
+"""
+
+from math import log, sqrt
+from multiprocessing import Pool
+
+from jvm_evaluation import CLASS_PATH
+from game_units import game_units, merge_game_units, play_game_tasks, unit_task
+
+RACING_MODES = ('exact', 'hoeffding')
+
+
+def upper_bound(score, games_played, total_games, mode='exact', delta=0.05):
+    """
+    Mejor puntuación (victorias + 0.5 * empates) que puede alcanzar un candidato.
+
+    Args:
+        score (float): puntuación en las partidas jugadas
+        games_played (int): partidas jugadas
+        total_games (int): partidas del torneo completo
+        mode (str): 'exact' o 'hoeffding'
+        delta (float): probabilidad de error de la cota de Hoeffding
+
+    Returns:
+        float: cota superior de la puntuación final
+    """
+    if mode == 'exact' or games_played == 0:
+        return score + (total_games - games_played)
+    # Cada partida puntúa en [0, 1]: P(media real > media + r) <= delta con r = sqrt(ln(1/delta) / 2n)
+    radius = sqrt(log(1 / delta) / (2 * games_played))
+    return min(1.0, score / games_played + radius) * total_games
+
+
+def race_candidates(candidates, config, threshold=None, mode='exact', delta=0.05, batch_size=None,
+                    evaluation_server=None, processes=None, class_path=CLASS_PATH, policy=None, pool=None):
+    """
+    Juega las partidas de los candidatos por lotes, cortando a los que no pueden alcanzar threshold.
+
+    Args:
+        candidates (list): genomas a evaluar
+        config (dict): configuración de EvaluationTournament
+        threshold (float): puntuación (victorias + 0.5 * empates) a alcanzar; None no corta a nadie
+        mode (str): 'exact' o 'hoeffding'
+        delta (float): probabilidad de error del modo 'hoeffding'
+        batch_size (int): partidas por lote (por defecto mapas x oponentes, una iteración)
+        evaluation_server (EvaluationServerPool): JVMs persistentes; si es None se usa un multiprocessing.Pool
+        processes (int): procesos del Pool (ignorado con evaluation_server)
+        class_path (str): classpath de Java
+        policy (SupervisionPolicy): límites de tiempo y reintentos por partida (None sin supervisión)
+        pool (multiprocessing.Pool): procesos del experimento (ignorado con evaluation_server); si es
+            None se crea uno de processes procesos para esta llamada
+
+    Returns:
+        list: (partidas, resumen, partidas jugadas, truncado) de cada candidato; el resumen es None
+              si alguna partida falló
+    """
+    if mode not in RACING_MODES:
+        raise ValueError(f"Modo de racing desconocido: {mode}")
+
+    units = game_units(config)
+    n_opponents = len(config['opponents'])
+    total_games = len(units)
+    if batch_size is None:
+        batch_size = len(config['maps']) * n_opponents
+
+    played = [[] for _ in candidates]    # resultados por candidato
+    active = list(range(len(candidates)))
+    truncated = [False] * len(candidates)
+
+    own_pool = pool is None and evaluation_server is None
+    if own_pool:
+        pool = Pool(processes=processes)
+    try:
+        for start in range(0, total_games, batch_size):
+            if not active:
+                break
+            batch = units[start:start + batch_size]
+            tasks = [unit_task(candidates[idx], unit, class_path, policy, config) for idx in active for unit in batch]
+            results = play_game_tasks(tasks, evaluation_server=evaluation_server, pool=pool)
+
+            still_active = []
+            for position, idx in enumerate(active):
+                played[idx].extend(results[position * len(batch):(position + 1) * len(batch)])
+                games, summary = merge_game_units(units[:len(played[idx])], played[idx], n_opponents)
+                if summary is None:
+                    continue  # evaluación fallida: no se siguen jugando partidas
+                n_played = len(played[idx])
+                score = float(summary['wins'].sum()) + 0.5 * float(summary['ties'].sum())
+                if (threshold is not None and n_played < total_games and
+                        upper_bound(score, n_played, total_games, mode, delta) < threshold):
+                    truncated[idx] = True
+                    continue
+                still_active.append(idx)
+            active = still_active
+    finally:
+        if own_pool:
+            pool.close()
+            pool.join()
+
+    outcomes = []
+    for idx in range(len(candidates)):
+        games, summary = merge_game_units(units[:len(played[idx])], played[idx], n_opponents)
+        outcomes.append((games, summary, len(played[idx]), truncated[idx]))
+    return outcomes
@@ -0,0 +1,124 @@
+"""
+Ratings vectorizados a partir de la matriz de resultados de la co-evolución.
+
+- bradley_terry: ajuste de máxima verosimilitud (Bradley-Terry, que en escala Elo es el
+  modelo logístico de Elo) sobre todas las partidas de una vez, con errores estándar.
+- batched_elo_update: actualización Elo de un lote de enfrentamientos en la que todas las
+  puntuaciones esperadas se calculan con los ratings previos al lote, de modo que el
+  resultado no depende del orden de los enfrentamientos.
+
+Los empates cuentan como media victoria para cada agente.
+"""
+
+import numpy as np
+
+ELO_SCALE = 400 / np.log(10)   # un punto de theta en Bradley-Terry son ~173.7 puntos Elo
+RATING_SOLVERS = ('sequential', 'batched', 'bradley_terry')
+
+
+def score_matrices(n, results):
+    """
+    Matrices de puntuación y de partidas a partir de resultados de enfrentamientos.
+
+    Args:
+        n (int): número de agentes
+        results (list): resultados de play_match (dicts con i, j, wins_i, wins_j, ties_i, success)
+
+    Returns:
+        tuple: (score, games) de forma (n, n); score[i, j] son las victorias de i contra j
+               más la mitad de los empates y games[i, j] las partidas entre ambos
+    """
+    score = np.zeros((n, n))
+    games = np.zeros((n, n))
+    for result in results:
+        if not result['success']:
+            continue
+        i, j = result['i'], result['j']
+        played = result['wins_i'] + result['wins_j'] + result['ties_i']
+        score[i, j] += result['wins_i'] + 0.5 * result['ties_i']
+        score[j, i] += result['wins_j'] + 0.5 * result['ties_i']
+        games[i, j] += played
+        games[j, i] += played
+    return score, games
+
+
+def bradley_terry(score, games, base=1200.0, prior_games=1.0, iterations=50, tol=1e-8):
+    """
+    Ratings Bradley-Terry de máxima verosimilitud en escala Elo.
+
+    Se resuelve por Newton sobre theta (log-fuerza) con un prior gaussiano centrado en
+    base equivalente a prior_games partidas empatadas contra un rival medio, que mantiene
+    la solución finita para agentes invictos o sin partidas y para grafos de
+    enfrentamientos no conexos.
+
+    Sin prior (prior_games=0) la verosimilitud solo depende de las diferencias de theta, así
+    que se fija la suma de theta a 0; el ajuste exige entonces un grafo de enfrentamientos
+    conexo (y, para ser finito, que ningún agente gane o pierda todas sus partidas).
+
+    Args:
+        score (np.ndarray): matriz (n, n) de puntuación de i contra j
+        games (np.ndarray): matriz (n, n) simétrica de partidas
+        base (float): rating Elo medio
+        prior_games (float): fuerza del prior (0 para el ajuste sin regularizar)
+        iterations (int): máximo de iteraciones de Newton
+        tol (float): tolerancia en el paso de theta
+
+    Returns:
+        tuple: (ratings, errores estándar), ambos arrays de longitud n en puntos Elo
+
+    Raises:
+        ValueError: si prior_games es negativo, o si es 0 y el grafo no es conexo
+    """
+    if prior_games < 0:
+        raise ValueError(f"prior_games debe ser >= 0 (recibido {prior_games})")
+    n = score.shape[0]
+    theta = np.zeros(n)
+    precision = prior_games / 4.0   # curvatura de prior_games empates con p = 1/2
+    # Sin prior la hessiana es un laplaciano (singular en la dirección de theta constante): el
+    # término 1 1^T / n fija el gauge sum(theta) = 0 sin cambiar el paso en las demás direcciones
+    gauge = np.full((n, n), 1.0 / n) if precision == 0 else 0.0
+    if precision == 0:
+        linked = (games > 0).astype(float)
+        if np.linalg.matrix_rank(np.diag(linked.sum(axis=1)) - linked) != n - 1:
+            raise ValueError("Sin prior (prior_games=0) el grafo de enfrentamientos debe ser conexo")
+    for _ in range(iterations):
+        p = 1.0 / (1.0 + np.exp(theta[None, :] - theta[:, None]))   # p[i, j] = P(i gana a j)
+        gradient = (score - games * p).sum(axis=1) - precision * theta
+        weights = games * p * p.T
+        hessian = np.diag(weights.sum(axis=1) + precision) - weights + gauge   # menos la hessiana
+        step = np.linalg.solve(hessian, gradient - (theta.mean() if precision == 0 else 0.0))
+        theta += step
+        if np.max(np.abs(step)) < tol:
+            break
+    p = 1.0 / (1.0 + np.exp(theta[None, :] - theta[:, None]))
+    weights = games * p * p.T
+    information = np.diag(weights.sum(axis=1) + precision) - weights
+    # Sin prior, errores en el gauge sum(theta) = 0 (pseudoinversa del laplaciano)
+    covariance = np.linalg.pinv(information) if precision == 0 else np.linalg.inv(information)
+    errors = np.sqrt(np.clip(np.diag(covariance), 0.0, None))
+    return base + ELO_SCALE * (theta - theta.mean()), ELO_SCALE * errors
+
+
+def batched_elo_update(ratings, pairs, scores, k_factor=32):
+    """
+    Actualización Elo de un lote de enfrentamientos.
+
+    Args:
+        ratings (array-like): ratings antes del lote
+        pairs (array-like): parejas (i, j), forma (m, 2)
+        scores (array-like): puntuación de i en cada enfrentamiento (entre 0 y 1)
+        k_factor (int): factor K
+
+    Returns:
+        np.ndarray: ratings tras el lote
+    """
+    ratings = np.asarray(ratings, dtype=float)
+    pairs = np.asarray(pairs, dtype=int).reshape(-1, 2)
+    scores = np.asarray(scores, dtype=float)
+    i, j = pairs[:, 0], pairs[:, 1]
+    expected = 1.0 / (1.0 + 10 ** ((ratings[j] - ratings[i]) / 400))
+    delta = k_factor * (scores - expected)
+    updated = ratings.copy()
+    np.add.at(updated, i, delta)
+    np.add.at(updated, j, -delta)
+    return updated
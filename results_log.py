@@ -0,0 +1,165 @@
+"""
+Registro binario de resultados por generación (solo se añade al final).
+
+Los inspyred-individuals-file e inspyred-statistics-file guardan el LexicoFitness como
+una tupla en texto dentro de filas separadas por comas, así que cada script de análisis
+tiene que partirlas con expresiones regulares. ResultsLog es un observador de inspyred
+que añade en cada generación un registro de tipo fijo (RESULTS_DTYPE) por individuo:
+
+    generation, index, genes (10), label, victorias, tiempo_victoria, tiempo_derrota, wall_time
+
+wall_time son los segundos de reloj que tardó la evaluación del individuo (NaN si no se
+midió: resultados de la caché de fitness, inmigrantes de otra isla o co-evolución).
+
+El fichero es una cabecera de HEADER_SIZE bytes (MAGIC y el dtype en JSON) seguida de los
+registros, de modo que read_results_log lo abre con np.memmap sin copiarlo ni parsearlo:
+
+    records = read_results_log('resultados/GABotsLit_.../results-log-....bin')
+    records[records['generation'] == 3]['victorias']
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from inspyred_callables import InspyredCallable
+from population import N_GENES, to_array
+
+MAGIC = b'MRTSLOG1'
+HEADER_SIZE = 512
+RESULTS_DTYPE = np.dtype([('generation', np.int32), ('index', np.int32), ('genes', np.float64, (N_GENES,)),
+                          ('label', 'U16'), ('victorias', np.float64), ('tiempo_victoria', np.float64),
+                          ('tiempo_derrota', np.float64), ('wall_time', np.float64)])
+
+
+def _header():
+    descr = json.dumps(np.lib.format.dtype_to_descr(RESULTS_DTYPE)).encode()
+    header = MAGIC + descr
+    if len(header) >= HEADER_SIZE:
+        raise ValueError("El dtype del registro no cabe en la cabecera")
+    return header.ljust(HEADER_SIZE - 1) + b'\n'
+
+
+def _read_dtype(path):
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if not header.startswith(MAGIC) or len(header) < HEADER_SIZE:
+        raise ValueError(f"{path} no es un registro de resultados")
+    return np.dtype([tuple(field) for field in json.loads(header[len(MAGIC):].strip().decode())])
+
+
+def population_records(population, generation):
+    """
+    Registros de una población de inspyred.
+
+    El fitness float de la co-evolución (ELO) se guarda como victorias con tiempos 0 (como en to_array).
+    """
+    individuals = to_array(population)
+    records = np.zeros(len(population), dtype=RESULTS_DTYPE)
+    records['generation'] = generation
+    records['index'] = np.arange(len(population))
+    for field in ('genes', 'label', 'victorias', 'tiempo_victoria', 'tiempo_derrota'):
+        records[field] = individuals[field]
+    records['wall_time'] = [np.nan if getattr(ind.fitness, 'wall_time', None) is None else ind.fitness.wall_time
+                            for ind in population]
+    return records
+
+
+class ResultsLog(InspyredCallable):
+    """
+    Observador de inspyred que añade la población de cada generación a un registro binario.
+
+    Args:
+        path (str): fichero del registro (se crea con su cabecera si no existe)
+        after_generation (int): al reanudar, se descartan los registros de generaciones
+            posteriores a la del checkpoint (escritos antes de que se guardara)
+    """
+
+    inspyred_name = 'results_log_observer'
+
+    def __init__(self, path, after_generation=None):
+        self.path = path
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(_header())
+        elif _read_dtype(path) != RESULTS_DTYPE:
+            raise ValueError(f"{path} tiene un formato de registro distinto")
+        if after_generation is not None:
+            self.truncate(after_generation)
+        self.records = count_records(path)
+
+    def truncate(self, after_generation):
+        """Descarta los registros de generaciones posteriores a after_generation (y un registro incompleto final)."""
+        records = read_results_log(self.path)
+        keep = int(np.searchsorted(records['generation'], after_generation, side='right'))
+        del records
+        with open(self.path, 'r+b') as f:
+            f.truncate(HEADER_SIZE + keep * RESULTS_DTYPE.itemsize)
+
+    def __call__(self, population, num_generations, num_evaluations, args):
+        records = population_records(population, num_generations)
+        with open(self.path, 'ab') as f:
+            f.write(records.tobytes())
+        self.records += len(records)
+
+    def stats(self):
+        return {'records': self.records, 'bytes': os.path.getsize(self.path)}
+
+
+def count_records(path):
+    """Registros completos del fichero (un registro a medio escribir al final no cuenta)."""
+    return max(0, os.path.getsize(path) - HEADER_SIZE) // RESULTS_DTYPE.itemsize
+
+
+def read_results_log(path):
+    """
+    Abre un registro de resultados mapeado en memoria.
+
+    Returns:
+        np.memmap: registros con RESULTS_DTYPE (vacío si todavía no hay ninguno)
+    """
+    dtype = _read_dtype(path)
+    n_records = max(0, os.path.getsize(path) - HEADER_SIZE) // dtype.itemsize
+    if n_records == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=HEADER_SIZE, shape=(n_records,))
+
+
+def results_frame(records):
+    """Registros como DataFrame con una columna por gen (gene0 ... gene9)."""
+    frame = pd.DataFrame({name: records[name] for name in RESULTS_DTYPE.names if name != 'genes'})
+    genes = pd.DataFrame(np.asarray(records['genes']), columns=[f'gene{i}' for i in range(N_GENES)])
+    return pd.concat([frame[['generation', 'index']], genes, frame.drop(columns=['generation', 'index'])], axis=1)
+
+
+def generation_statistics(records):
+    """
+    Estadísticas de las victorias por generación, con las columnas que lee fitness_generaciones.py.
+
+    Returns:
+        pd.DataFrame: generation, population_size, worst/best_victories_fitness, fitness_median,
+                      fitness_mean, fitness_std, fitness_min y fitness_max
+    """
+    frame = pd.DataFrame({'generation': np.asarray(records['generation']),
+                          'victorias': np.asarray(records['victorias'])})
+    grouped = frame.groupby('generation')['victorias']
+    statistics = pd.DataFrame({
+        'population_size': grouped.size(),
+        'worst_victories_fitness': grouped.min(),
+        'best_victories_fitness': grouped.max(),
+        'fitness_median': grouped.median(),
+        'fitness_mean': grouped.mean(),
+        'fitness_std': grouped.std(ddof=0),
+    }).reset_index()
+    statistics['fitness_min'] = statistics['worst_victories_fitness']
+    statistics['fitness_max'] = statistics['best_victories_fitness']
+    return statistics
+
+
+def final_population(records):
+    """Registros de la última generación del registro."""
+    if len(records) == 0:
+        return records
+    return records[records['generation'] == records['generation'][-1]]
@@ -0,0 +1,63 @@
+"""
+Semillas deterministas de las partidas.
+
+MyAgent decide al azar algunos movimientos (moveRandomly, la colocación de unidades en
+meleeUnitBehavior y el reparto de tipos de unidad), así que sin semilla dos evaluaciones
+del mismo genoma no juegan las mismas partidas. Con una semilla base (game_seed de
+run_experiment y run_coev_experiment) cada petición a Java lleva una semilla derivada de:
+
+- partida suelta: (semilla base, genoma, mapa, oponente, iteración)
+- torneo completo: (semilla base, genoma); MyAgent deriva la de cada partida del orden
+  en que el torneo las juega, que es fijo
+- enfrentamiento de co-evolución: (semilla base, los dos genomas en orden canónico)
+
+Los drivers la reciben con ``--seed N`` al final de la línea de órdenes y EvaluationServer
+en el campo ``seed`` de la petición. La semilla base se añade a la configuración del
+torneo, de modo que la caché de fitness y el almacén de celdas no mezclan resultados con
+semillas distintas (ni con los de partidas sin semilla).
+"""
+
+import hashlib
+import json
+
+from fitness_cache import canonical_genome
+
+SEED_MASK = (1 << 63) - 1   # long positivo de Java
+
+
+def derive_seed(base_seed, *parts):
+    """Semilla de 63 bits a partir de la semilla base y de las partes que identifican la partida."""
+    key = json.dumps([base_seed] + list(parts)).encode()
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], 'big') & SEED_MASK
+
+
+def game_seed(base_seed, candidate, unit):
+    """Semilla de una partida suelta (mapa, oponente, iteración) de un genoma; None sin semilla base."""
+    if base_seed is None:
+        return None
+    map_idx, opponent, iteration = unit
+    return derive_seed(base_seed, canonical_genome(candidate), map_idx, opponent, iteration)
+
+
+def tournament_seed(base_seed, candidate):
+    """Semilla del torneo completo de un genoma; None sin semilla base."""
+    if base_seed is None:
+        return None
+    return derive_seed(base_seed, canonical_genome(candidate))
+
+
+def match_seed(base_seed, agent_i, agent_j):
+    """Semilla de un enfrentamiento (la misma para (i, j) y (j, i)); None sin semilla base."""
+    if base_seed is None:
+        return None
+    return derive_seed(base_seed, *sorted([canonical_genome(agent_i), canonical_genome(agent_j)]))
+
+
+def seed_arguments(seed):
+    """Argumentos de línea de órdenes de los drivers de Java para una semilla (ninguno si es None)."""
+    return [] if seed is None else ['--seed', str(seed)]
+
+
+def seeded_payload(payload, seed):
+    """Petición de EvaluationServer con su semilla (sin cambios si es None)."""
+    return payload if seed is None else dict(payload, seed=seed)
@@ -26,6 +26,11 @@ import rts.units.UnitTypeTable;
 
 public class MyAgent extends AbstractionLayerAI {
 
+  // Versión del comportamiento del agente. Se publica en el --config de los drivers, así que
+  // cambiarla invalida la caché de fitness y el almacén de celdas (sus claves incluyen la config).
+  // 2: clone() conserva los parámetros del genoma (antes devolvía un agente por defecto).
+  public static final int VERSION = 2;
+
   // Static counter for unique agent identification
   private static int agentCounter = 0;
   private int agentId;
@@ -33,6 +38,13 @@ public class MyAgent extends AbstractionLayerAI {
 
   UnitTypeTable m_utt = null;
   Random r = new Random();
+
+  // Semilla de las decisiones aleatorias (setSeed). Sin ella r no tiene semilla, como siempre;
+  // con ella cada partida usa una semilla derivada de la base y del número de partida.
+  private long seed = 0;
+  private boolean seeded = false;
+  private int gamesStarted = 0;
+  private int clonesMade = 0;
   UnitType workerType;
   UnitType baseType;
   UnitType barracksType;
@@ -161,8 +173,31 @@ public class MyAgent extends AbstractionLayerAI {
   }
 
   // This will be called by microRTS when it wants to create new instances of this bot (e.g., to play multiple games).
+  // La copia conserva los parámetros del genoma y, con semilla, recibe la de la siguiente partida.
   public AI clone() {
-    return new MyAgent(m_utt, pf);
+    MyAgent copy = new MyAgent(m_utt, dEnemyDanger, pUnits, pTime, nHarvestWorkers, nAttackWorkers,
+                               probLight, probRange, probHeavy, dBaseBarracks, dUnitBuilding, extraParam);
+    if (seeded) {
+      copy.setSeed(gameSeed(seed, clonesMade++));
+    }
+    return copy;
+  }
+
+  // Fija la semilla base del agente (la deriva Python de genoma, mapa, oponente e iteración: ver seeding.py)
+  public void setSeed(long seed) {
+    this.seed = seed;
+    this.seeded = true;
+    this.gamesStarted = 0;
+    this.clonesMade = 0;
+    this.r = new Random(seed);
+  }
+
+  // Semilla de la partida número game a partir de la semilla base (mezcla SplitMix64)
+  public static long gameSeed(long seed, int game) {
+    long z = seed + (game + 1) * 0x9E3779B97F4A7C15L;
+    z = (z ^ (z >>> 30)) * 0xBF58476D1CE4E5B9L;
+    z = (z ^ (z >>> 27)) * 0x94D049BB133111EBL;
+    return z ^ (z >>> 31);
   }
 
   @Override
@@ -174,6 +209,10 @@ public class MyAgent extends AbstractionLayerAI {
   // This will be called once at the beginning of each new game:    
   public void reset() {
     super.reset();
+    if (seeded) {
+      // El torneo juega sus partidas siempre en el mismo orden: la n-ésima partida usa la n-ésima semilla
+      r = new Random(gameSeed(seed, gamesStarted++));
+    }
   }
 
 
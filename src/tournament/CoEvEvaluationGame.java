@@ -2,11 +2,15 @@ package tournament;
 
 import java.io.File;
 import java.io.FileWriter;
+import java.io.PrintStream;
 import java.io.Writer;
 import java.util.ArrayList;
 import java.util.Arrays;
 import java.util.List;
 
+import com.eclipsesource.json.JsonArray;
+import com.eclipsesource.json.JsonObject;
+
 import ai.core.AI;
 import myAgent.MyAgent;
 import rts.units.UnitTypeTable;
@@ -18,6 +22,16 @@ public class CoEvEvaluationGame {
     List<AI> agents = new ArrayList<>();
     UnitTypeTable utt = new UnitTypeTable();
     
+  // --config: imprimir la configuración del enfrentamiento y salir
+  if (args.length == 1 && args[0].equals("--config")) {
+    System.out.println(describeConfig().toString());
+    return;
+  }
+
+  // "--seed N" opcional al final: semillas de los dos agentes (ver seedMatch)
+  Long seed = EvaluationTournament.parseSeed(args);
+  args = EvaluationTournament.withoutSeed(args);
+
   // Verificar que se reciban 22 o 23 parámetros (11 por agente + opcional nombre de archivo)
   if (args.length != 22 && args.length != 23) {
     System.err.println("Debe proporcionar 22 parámetros (11 para cada agente) o 23 (incluyendo nombre de archivo).");
@@ -30,47 +44,21 @@ public class CoEvEvaluationGame {
   // Crear primer agente con los primeros 11 parámetros
   String[] params1 = Arrays.copyOfRange(args, 0, 11);
     //System.out.println("DEBUG: Creando Agente 1 con parámetros: " + Arrays.toString(params1));
-    MyAgent agent1 = createMyAgentFromParams(params1, utt);
+    MyAgent agent1 = createMyAgentOrExit(params1, utt);
     agents.add(agent1);
     
   // Crear segundo agente con los siguientes 11 parámetros
   String[] params2 = Arrays.copyOfRange(args, 11, 22);
     //System.out.println("DEBUG: Creando Agente 2 con parámetros: " + Arrays.toString(params2));
-    MyAgent agent2 = createMyAgentFromParams(params2, utt);
+    MyAgent agent2 = createMyAgentOrExit(params2, utt);
     agents.add(agent2);
+    seedMatch(agent1, agent2, seed);
 
     //System.out.println("DEBUG: Agentes creados para el enfrentamiento:");
     //System.out.println("DEBUG: Agente 1: " + agent1.toString());
     //System.out.println("DEBUG: Agente 2: " + agent2.toString());
     //System.out.println("DEBUG: =====================================");
 
-    String [] mapsString = {
-        //"maps/melee14x12Mixed18.xml",
-        "maps/16x16/basesWorkers16x16A.xml",
-        ///"maps/basesWorkers32x32A.xml",
-        "maps/BWDistantResources32x32.xml",
-        ///"maps/barricades24x24.xml",
-        //"maps/8x8/FourBasesWorkers8x8.xml",
-        ///"maps/16x16/TwoBasesBarracks16x16.xml",
-        // "maps/NoWhereToRun9x8.xml",
-        ///"maps/chambers32x32.xml",
-        ///"maps/GardenOfWar64x64.xml",
-        "maps/DoubleGame24x24.xml",
-        "maps/BroodWar/(2)Benzene.scxA.xml",
-        "maps/BroodWar/(2)Destination.scxA.xml",
-        // "maps/BroodWar/(4)Andromeda.scxB.xml"
-    };
-    List<String> maps = Arrays.asList(mapsString);
-    int iterations = 2;
-    int maxGameLength = 14000;
-    int timeBudget = 100;
-    int iterationsBudget = -1;
-    int preAnalysisBudget = 0;
-    boolean fullObservability = true;
-    boolean timeOutCheck = true;
-    boolean gcCheck = true;
-    boolean selfMatches = false;
-    boolean preGameAnalysis = preAnalysisBudget > 0;
     // String folder = "./resultados/CoEvELO";
 
     // // Crear la carpeta si no existe
@@ -88,18 +76,29 @@ public class CoEvEvaluationGame {
     //String prefix = folder + "/" + tournamentName;
     //String fileName = prefix + ".csv";
     String fileName = tournamentName;
+
+    // Con "-" como fichero los resultados se emiten por stdout como registros JSON
+    // (StreamingResultWriter); los prints de las IAs se desvían a stderr.
+    if (fileName.equals("-")) {
+      PrintStream records = System.out;
+      System.setOut(System.err);
+      try {
+        StreamingResultWriter writer = new StreamingResultWriter(records);
+        runMatch(agents, utt, writer);
+        writer.close();
+      } catch (Exception e) {
+        e.printStackTrace();
+        System.exit(1);
+      }
+      return;
+    }
+
     File file = new File(fileName);
 
     try {
       System.out.print(file.getPath());
       Writer writer = new FileWriter(file);
-      new RoundRobinTournament(agents).runTournament(-1, maps,
-                                          iterations, maxGameLength, timeBudget, iterationsBudget, 
-                                          preAnalysisBudget, 1000, // 1000 is just to give 1 second to the AIs to load their read/write folder saved content
-                                          fullObservability, selfMatches, timeOutCheck, gcCheck, preGameAnalysis, 
-                                          utt, null,
-                                          writer, null,
-                                          null);
+      runMatch(agents, utt, writer);
 
       writer.flush(); // Asegurar que se escriba todo a la terminal
     } catch (Exception e) {
@@ -109,67 +108,133 @@ public class CoEvEvaluationGame {
     
   }
 
-  // Parsear los parámetros y crear el agente
-  private static MyAgent createMyAgentFromParams(String[] args, UnitTypeTable utt){
+  // Configuración del enfrentamiento (compartida por main, EvaluationServer y --config)
+  static final String [] MAPS = {
+      //"maps/melee14x12Mixed18.xml",
+      "maps/16x16/basesWorkers16x16A.xml",
+      ///"maps/basesWorkers32x32A.xml",
+      "maps/BWDistantResources32x32.xml",
+      ///"maps/barricades24x24.xml",
+      //"maps/8x8/FourBasesWorkers8x8.xml",
+      ///"maps/16x16/TwoBasesBarracks16x16.xml",
+      // "maps/NoWhereToRun9x8.xml",
+      ///"maps/chambers32x32.xml",
+      ///"maps/GardenOfWar64x64.xml",
+      "maps/DoubleGame24x24.xml",
+      "maps/BroodWar/(2)Benzene.scxA.xml",
+      "maps/BroodWar/(2)Destination.scxA.xml",
+      // "maps/BroodWar/(4)Andromeda.scxB.xml"
+  };
+  static final int ITERATIONS = 2;
+  static final int MAX_GAME_LENGTH = 14000;
+  static final int TIME_BUDGET = 100;
+  static final int ITERATIONS_BUDGET = -1;
+  static final int PRE_ANALYSIS_BUDGET = 0;
+  static final boolean FULL_OBSERVABILITY = true;
+  static final boolean TIMEOUT_CHECK = true;
+  static final boolean GC_CHECK = true;
+  static final boolean SELF_MATCHES = false;
+
+  // Describe la configuración del enfrentamiento en JSON (mapas, iteraciones y parámetros de partida)
+  public static JsonObject describeConfig() {
+    JsonArray maps = new JsonArray();
+    for (String map : MAPS) {
+      maps.add(map);
+    }
+    return new JsonObject()
+        .add("driver", "CoEvEvaluationGame")
+        .add("agentVersion", MyAgent.VERSION)
+        .add("maps", maps)
+        .add("iterations", ITERATIONS)
+        .add("maxGameLength", MAX_GAME_LENGTH)
+        .add("timeBudget", TIME_BUDGET)
+        .add("iterationsBudget", ITERATIONS_BUDGET)
+        .add("preAnalysisBudget", PRE_ANALYSIS_BUDGET)
+        .add("fullObservability", FULL_OBSERVABILITY)
+        .add("timeOutCheck", TIMEOUT_CHECK)
+        .add("gcCheck", GC_CHECK)
+        .add("selfMatches", SELF_MATCHES);
+  }
+
+  // Ejecuta el enfrentamiento round-robin entre los dos agentes y escribe el resultado en writer.
+  // Se usa tanto desde main como desde EvaluationServer (JVM persistente).
+  public static void runMatch(List<AI> agents, UnitTypeTable utt, Writer writer) throws Exception {
+    List<String> maps = Arrays.asList(MAPS);
+    boolean preGameAnalysis = PRE_ANALYSIS_BUDGET > 0;
+    new RoundRobinTournament(agents).runTournament(-1, maps,
+                                        ITERATIONS, MAX_GAME_LENGTH, TIME_BUDGET, ITERATIONS_BUDGET, 
+                                        PRE_ANALYSIS_BUDGET, 1000, // 1000 is just to give 1 second to the AIs to load their read/write folder saved content
+                                        FULL_OBSERVABILITY, SELF_MATCHES, TIMEOUT_CHECK, GC_CHECK, preGameAnalysis, 
+                                        utt, null,
+                                        writer, null,
+                                        null);
+  }
+
+  // Con semilla cada agente recibe la suya, derivada de la del enfrentamiento
+  public static void seedMatch(MyAgent agent1, MyAgent agent2, Long seed) {
+    if (seed != null) {
+      agent1.setSeed(MyAgent.gameSeed(seed, 0));
+      agent2.setSeed(MyAgent.gameSeed(seed, 1));
+    }
+  }
+
+  // Crear el agente terminando el proceso si los parámetros no son válidos (uso desde línea de comandos)
+  private static MyAgent createMyAgentOrExit(String[] args, UnitTypeTable utt) {
+    MyAgent agent = new MyAgent(utt);
+    try {
+      agent = createMyAgentFromParams(args, utt);
+    } catch (NumberFormatException e) {
+        System.err.println("Todos los parámetros deben ser números.");
+        System.exit(1);
+    } catch (IllegalArgumentException e) {
+        System.err.println(e.getMessage());
+        System.exit(1);
+    }
+    return agent;
+  }
+
+  // Parsear los parámetros y crear el agente.
+  // Lanza IllegalArgumentException (o NumberFormatException) si algún parámetro no es válido.
+  public static MyAgent createMyAgentFromParams(String[] args, UnitTypeTable utt){
     double[] doubleParams = new double[8]; // dEnemyDanger, pUnits, pTime, probLight, probRange, probHeavy, dBaseBarracks, dUnitBuilding
     int[] intParams = new int[2]; // nHarvestWorkers, nAttackWorkers
     String extraParam = ""; // parámetro string extra
-    MyAgent agent = new MyAgent(utt);
 
     if (args.length != 11) {
-      System.err.println("Debe proporcionar exactamente 11 parámetros (10 numéricos + 1 string).");
-      System.exit(1);
-      agent = new MyAgent(utt, 0.2, 0.82, 0.85, 3, 0, 0.7, 0.4, 0.3, 0.12, 0.25, "");
-    } else {
-      try {
-        // Verify and assign the first 3 doubles
-        for (int i = 0; i < 3; i++) {
-            doubleParams[i] = Double.parseDouble(args[i]);
-            if (doubleParams[i] < 0.0 || doubleParams[i] > 1.0) {
-                throw new IllegalArgumentException("Todos los parámetros double deben estar entre 0 y 1.");
-            }
-        }
+      throw new IllegalArgumentException("Debe proporcionar exactamente 11 parámetros (10 numéricos + 1 string).");
+    }
 
-        // Verify and assign 2 integers
-        for (int i = 0; i < 2; i++) {
-            intParams[i] = Integer.parseInt(args[i + 3]);
-            if (intParams[i] > 30 || intParams[i] < 0) {
-                throw new IllegalArgumentException("Todos los parámetros int deben estar entre 0 y 30.");
-            }
+    // Verify and assign the first 3 doubles
+    for (int i = 0; i < 3; i++) {
+        doubleParams[i] = Double.parseDouble(args[i]);
+        if (doubleParams[i] < 0.0 || doubleParams[i] > 1.0) {
+            throw new IllegalArgumentException("Todos los parámetros double deben estar entre 0 y 1.");
         }
+    }
 
-        // Verify and assign 5 last doubles
-        for (int i = 0; i < 5; i++) {
-            doubleParams[i + 3] = Double.parseDouble(args[i + 5]);
-            if (doubleParams[i + 3] < 0.0 || doubleParams[i + 3] > 1.0) {
-                throw new IllegalArgumentException("Todos los parámetros double deben estar entre 0 y 1.");
-            }
+    // Verify and assign 2 integers
+    for (int i = 0; i < 2; i++) {
+        intParams[i] = Integer.parseInt(args[i + 3]);
+        if (intParams[i] > 30 || intParams[i] < 0) {
+            throw new IllegalArgumentException("Todos los parámetros int deben estar entre 0 y 30.");
         }
+    }
 
-        // Extra string parameter (index 10)
-        extraParam = args[10];
-
-      } catch (NumberFormatException e) {
-          System.err.println("Todos los parámetros deben ser números.");
-          System.exit(1);
-      } catch (IllegalArgumentException e) {
-          System.err.println(e.getMessage());
-          System.exit(1);
-      }
-      
-      agent = new MyAgent(utt, doubleParams[0], doubleParams[1], doubleParams[2], 
-                intParams[0], intParams[1], 
-                doubleParams[3], doubleParams[4], doubleParams[5], 
-                doubleParams[6], doubleParams[7], extraParam);
-      
-      // System.out.println("DEBUG: Agente creado con parámetros parseados: [" + 
-      //                    doubleParams[0] + ", " + doubleParams[1] + ", " + doubleParams[2] + ", " +
-      //                    intParams[0] + ", " + intParams[1] + ", " +
-      //                    doubleParams[3] + ", " + doubleParams[4] + ", " + doubleParams[5] + ", " +
-      //                    doubleParams[6] + ", " + doubleParams[7] + "]");
+    // Verify and assign 5 last doubles
+    for (int i = 0; i < 5; i++) {
+        doubleParams[i + 3] = Double.parseDouble(args[i + 5]);
+        if (doubleParams[i + 3] < 0.0 || doubleParams[i + 3] > 1.0) {
+            throw new IllegalArgumentException("Todos los parámetros double deben estar entre 0 y 1.");
+        }
     }
 
-    return agent;
+    // Extra string parameter (index 10)
+    extraParam = args[10];
+
+    return new MyAgent(utt, doubleParams[0], doubleParams[1], doubleParams[2], 
+              intParams[0], intParams[1], 
+              doubleParams[3], doubleParams[4], doubleParams[5], 
+              doubleParams[6], doubleParams[7], extraParam);
   }
 
 }
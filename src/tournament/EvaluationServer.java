@@ -0,0 +1,110 @@
+package tournament;
+
+import java.io.BufferedReader;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.util.ArrayList;
+import java.util.List;
+
+import com.eclipsesource.json.Json;
+import com.eclipsesource.json.JsonArray;
+import com.eclipsesource.json.JsonObject;
+
+import ai.core.AI;
+import myAgent.MyAgent;
+import rts.units.UnitTypeTable;
+
+/*
+ * Servidor de evaluación persistente.
+ *
+ * Mantiene la JVM viva entre evaluaciones para no pagar en cada fitness el arranque
+ * de la JVM, la carga de clases de MicroRTS.jar/weka.jar y el JIT en frío.
+ * Protocolo: una petición JSON por línea en stdin y registros JSON por línea en stdout.
+ *
+ *   {"id": 1, "type": "evaluate", "agent": [10 genes + etiqueta]}       -> EvaluationTournament
+ *   {"id": 2, "type": "match", "agent1": [...], "agent2": [...]}        -> CoEvEvaluationGame
+ *   {"id": 3, "type": "game", "agent": [...], "map": 0, "opponent": 2}  -> una partida de EvaluationTournament
+ *   {"type": "shutdown"}
+ *
+ * Cualquier petición de juego admite además "seed" (long) para que MyAgent juegue con semilla.
+ *
+ * Durante el torneo se emiten los registros de StreamingResultWriter ({"type": "game", "id": 1, ...}
+ * por partida y {"type": "summary", "id": 1, ...} al final) y la petición se cierra con
+ * {"id": 1, "ok": true} o {"id": 1, "ok": false, "error": "..."}.
+ * Al arrancar se escribe {"type": "ready"} para que el cliente sepa que puede enviar peticiones.
+ */
+public class EvaluationServer {
+
+  public static void main(String[] args) throws Exception {
+    // El protocolo usa el stdout original; cualquier print de las IAs se desvía a stderr
+    PrintStream protocol = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+    System.setOut(System.err);
+
+    BufferedReader in = new BufferedReader(new InputStreamReader(System.in, "UTF-8"));
+    UnitTypeTable utt = new UnitTypeTable();
+
+    protocol.println(new JsonObject().add("type", "ready").toString());
+
+    String line;
+    while ((line = in.readLine()) != null) {
+      if (line.trim().isEmpty()) {
+        continue;
+      }
+
+      long id = -1;
+      JsonObject response;
+      try {
+        JsonObject request = Json.parse(line).asObject();
+        id = request.getLong("id", -1);
+        String type = request.getString("type", "");
+
+        if (type.equals("shutdown")) {
+          break;
+        }
+
+        StreamingResultWriter writer = new StreamingResultWriter(protocol, id);
+        Long seed = request.get("seed") != null ? request.get("seed").asLong() : null;
+        if (type.equals("evaluate")) {
+          AI agent = EvaluationTournament.seeded(
+              EvaluationTournament.createAgent(toParams(request.get("agent").asArray()), utt), seed);
+          EvaluationTournament.runTournament(agent, utt, writer);
+        } else if (type.equals("game")) {
+          AI agent = EvaluationTournament.seeded(
+              EvaluationTournament.createAgent(toParams(request.get("agent").asArray()), utt), seed);
+          EvaluationTournament.runGame(agent, utt, request.getInt("map", -1), request.getInt("opponent", -1), writer);
+        } else if (type.equals("match")) {
+          MyAgent agent1 = CoEvEvaluationGame.createMyAgentFromParams(toParams(request.get("agent1").asArray()), utt);
+          MyAgent agent2 = CoEvEvaluationGame.createMyAgentFromParams(toParams(request.get("agent2").asArray()), utt);
+          CoEvEvaluationGame.seedMatch(agent1, agent2, seed);
+          List<AI> agents = new ArrayList<>();
+          agents.add(agent1);
+          agents.add(agent2);
+          CoEvEvaluationGame.runMatch(agents, utt, writer);
+        } else {
+          throw new IllegalArgumentException("Tipo de petición desconocido: " + type);
+        }
+
+        writer.finish();
+        response = new JsonObject().add("id", id).add("ok", true);
+      } catch (Exception e) {
+        e.printStackTrace();
+        response = new JsonObject().add("id", id).add("ok", false).add("error", String.valueOf(e));
+      }
+
+      protocol.println(response.toString());
+    }
+
+    protocol.flush();
+  }
+
+  // Convierte el array JSON de parámetros del agente en los Strings que esperan los parsers de los torneos
+  private static String[] toParams(JsonArray values) {
+    String[] params = new String[values.size()];
+    for (int i = 0; i < values.size(); i++) {
+      params[i] = values.get(i).isString() ? values.get(i).asString() : values.get(i).toString();
+    }
+    return params;
+  }
+}
@@ -2,11 +2,15 @@ package tournament;
 
 import java.io.File;
 import java.io.FileWriter;
+import java.io.PrintStream;
 import java.io.Writer;
 import java.util.ArrayList;
 import java.util.Arrays;
 import java.util.List;
 
+import com.eclipsesource.json.JsonArray;
+import com.eclipsesource.json.JsonObject;
+
 import GNS.EconomyLightRush;
 import ai.RandomBiasedAI;
 import ai.abstraction.LightRush;
@@ -21,16 +25,24 @@ import mayariBot.mayari;
 public class EvaluationTournament {
 
   public static void main(String[] args) {
-    // Parsear los parámetros
-  double[] doubleParams = new double[8];
-  int[] intParams = new int[2];
     UnitTypeTable utt = new UnitTypeTable();    
     AI agent = new MyAgent(utt);
 
-  // Ahora aceptamos 11 parámetros (10 numéricos + 1 string del agente) o 12
-  // (11 del agente + nombre de fichero opcional)
-  if (args.length != 11 && args.length != 12) {
-    System.err.println("Debe proporcionar 11 parámetros (10 numéricos + etiqueta del agente) o 12 parámetros (añadiendo filename opcional).");
+  // --config: imprimir la configuración del torneo y salir
+  if (args.length == 1 && args[0].equals("--config")) {
+    System.out.println(describeConfig(utt).toString());
+    return;
+  }
+
+  // "--seed N" opcional al final: semilla de MyAgent para que las partidas sean reproducibles
+  Long seed = parseSeed(args);
+  args = withoutSeed(args);
+
+  // Ahora aceptamos 11 parámetros (10 numéricos + 1 string del agente), 12
+  // (11 del agente + nombre de fichero opcional) o 14 (añadiendo mapa y oponente
+  // para jugar una sola partida del torneo)
+  if (args.length != 11 && args.length != 12 && args.length != 14) {
+    System.err.println("Debe proporcionar 11 parámetros (10 numéricos + etiqueta del agente), 12 parámetros (añadiendo filename opcional) o 14 (añadiendo índice de mapa y de oponente).");
     System.exit(1);
     // Valor por defecto en caso de validación previa (no alcanzable tras exit):
     agent = new MyAgent(utt, 0.2, 0.82, 0.85, 3, 0, 0.7, 0.4, 0.3, 0.12, 0.25, "");
@@ -39,30 +51,7 @@ public class EvaluationTournament {
 
   } else {
       try {
-        // Verify and assign the first 3 doubles
-        for (int i = 0; i < 3; i++) {
-            doubleParams[i] = Double.parseDouble(args[i]);
-            if (doubleParams[i] < 0.0 || doubleParams[i] > 1.0) {
-                throw new IllegalArgumentException("Todos los parámetros double deben estar entre 0 y 1.");
-            }
-        }
-
-        // Verify and assign 2 integers
-        for (int i = 0; i < 2; i++) {
-            intParams[i] = Integer.parseInt(args[i + 3]);
-            if (intParams[i] > 30 || intParams[i] < 0) {
-                throw new IllegalArgumentException("Todos los parámetros int deben estar entre 0 y 30.");
-            }
-        }
-
-        // Verifify and assign 5 last doubles
-        for (int i = 0; i < 5; i++) {
-          doubleParams[i + 3] = Double.parseDouble(args[i + 5]);
-            if (doubleParams[i + 3] < 0.0 || doubleParams[i + 3] > 1.0) {
-                throw new IllegalArgumentException("Todos los parámetros double deben estar entre 0 y 1.");
-            }
-        }
-
+        agent = seeded(createAgent(Arrays.copyOfRange(args, 0, 11), utt), seed);
       } catch (NumberFormatException e) {
           System.err.println("Todos los parámetros deben ser números.");
           System.exit(1);
@@ -70,20 +59,157 @@ public class EvaluationTournament {
           System.err.println(e.getMessage());
           System.exit(1);
       }
- 
+    }
+
+    // String prefix = "./fitness/tournament_";
+    String timestamp = String.valueOf(System.currentTimeMillis());
+    String nanoTime = String.valueOf(System.nanoTime());
+    String fileName;
+    
+    // Verificar si se proporcionó filename como parámetro (posición 12)
+    if (args.length >= 12) {
+      fileName = args[11];
+    } else {
+      fileName = "./resultados/GABotsLit/tournament_" + timestamp + "_" + nanoTime + ".csv";
+    }
+    
+    // Con "-" como fichero los resultados se emiten por stdout como registros JSON
+    // (StreamingResultWriter); los prints de las IAs se desvían a stderr.
+    if (fileName.equals("-")) {
+      PrintStream records = System.out;
+      System.setOut(System.err);
+      try {
+        StreamingResultWriter writer = new StreamingResultWriter(records);
+        if (args.length == 14) {
+          runGame(agent, utt, Integer.parseInt(args[12]), Integer.parseInt(args[13]), writer);
+        } else {
+          runTournament(agent, utt, writer);
+        }
+        writer.close();
+      } catch (Exception e) {
+        e.printStackTrace();
+        System.exit(1);
+      }
+      return;
+    }
+
+    File file = new File(fileName);
+    // file.mkdir();
+    // String tournamentfolder = file.getPath();
+    // final File fileToUse = new File(tournamentfolder + "/tournament.csv");
+    //final String tracesFolder = (tournamentfolder + "/traces");
+
+    try {
+      //System.out.print(tournamentfolder + "/tournament.csv");
+      System.out.print(file.getPath());
+      Writer writer = new FileWriter(file);
+      if (args.length == 14) {
+        runGame(agent, utt, Integer.parseInt(args[12]), Integer.parseInt(args[13]), writer);
+      } else {
+        runTournament(agent, utt, writer);
+      }
+      writer.close();
+    } catch (Exception e) {
+      // TODO Auto-generated catch block
+      e.printStackTrace();
+    }
+    
+  }
+
+  // Parsear los 11 parámetros del agente (10 numéricos + etiqueta) y crear el agente.
+  // Lanza IllegalArgumentException (o NumberFormatException) si algún parámetro no es válido,
+  // para que tanto main como EvaluationServer decidan cómo reportar el error.
+  public static MyAgent createAgent(String[] args, UnitTypeTable utt) {
+    // Parsear los parámetros
+    double[] doubleParams = new double[8];
+    int[] intParams = new int[2];
+
+    if (args.length != 11) {
+      throw new IllegalArgumentException("Debe proporcionar exactamente 11 parámetros (10 numéricos + etiqueta del agente).");
+    }
+
+    // Verify and assign the first 3 doubles
+    for (int i = 0; i < 3; i++) {
+        doubleParams[i] = Double.parseDouble(args[i]);
+        if (doubleParams[i] < 0.0 || doubleParams[i] > 1.0) {
+            throw new IllegalArgumentException("Todos los parámetros double deben estar entre 0 y 1.");
+        }
+    }
+
+    // Verify and assign 2 integers
+    for (int i = 0; i < 2; i++) {
+        intParams[i] = Integer.parseInt(args[i + 3]);
+        if (intParams[i] > 30 || intParams[i] < 0) {
+            throw new IllegalArgumentException("Todos los parámetros int deben estar entre 0 y 30.");
+        }
+    }
+
+    // Verifify and assign 5 last doubles
+    for (int i = 0; i < 5; i++) {
+      doubleParams[i + 3] = Double.parseDouble(args[i + 5]);
+        if (doubleParams[i + 3] < 0.0 || doubleParams[i + 3] > 1.0) {
+            throw new IllegalArgumentException("Todos los parámetros double deben estar entre 0 y 1.");
+        }
+    }
+
     // El parámetro 11 (args[10]) es una etiqueta/string adicional para el agente
     String agentLabel = args[10];
 
-    agent = new MyAgent(utt, doubleParams[0], doubleParams[1], doubleParams[2], 
+    return new MyAgent(utt, doubleParams[0], doubleParams[1], doubleParams[2], 
         intParams[0], intParams[1], 
         doubleParams[3], doubleParams[4], doubleParams[5], 
         doubleParams[6], doubleParams[7], agentLabel);
+  }
+
+  // Semilla de "--seed N" al final de los argumentos (null si no está)
+  public static Long parseSeed(String[] args) {
+    if (args.length >= 2 && args[args.length - 2].equals("--seed")) {
+      return Long.parseLong(args[args.length - 1]);
     }
+    return null;
+  }
 
-    List<AI> selectedAIs = new ArrayList<>();
-    selectedAIs.add(agent);
-    // selectedAIs.add(new MyAgent(utt));
+  // Los argumentos sin el "--seed N" final
+  public static String[] withoutSeed(String[] args) {
+    return parseSeed(args) != null ? Arrays.copyOfRange(args, 0, args.length - 2) : args;
+  }
 
+  // Fija la semilla del agente si se ha indicado (sin ella MyAgent juega sin semilla)
+  public static MyAgent seeded(MyAgent agent, Long seed) {
+    if (seed != null) {
+      agent.setSeed(seed);
+    }
+    return agent;
+  }
+
+  // Configuración del torneo de evaluación (compartida por main, EvaluationServer y --config)
+  static final String [] MAPS = {
+      //"maps/melee14x12Mixed18.xml",
+      "maps/16x16/basesWorkers16x16A.xml",
+      ///"maps/basesWorkers32x32A.xml",
+      "maps/BWDistantResources32x32.xml",
+      ///"maps/barricades24x24.xml",
+      //"maps/8x8/FourBasesWorkers8x8.xml",
+      ///"maps/16x16/TwoBasesBarracks16x16.xml",
+      // "maps/NoWhereToRun9x8.xml",
+      ///"maps/chambers32x32.xml",
+      ///"maps/GardenOfWar64x64.xml",
+      "maps/DoubleGame24x24.xml",
+      "maps/BroodWar/(2)Benzene.scxA.xml",
+      "maps/BroodWar/(2)Destination.scxA.xml",
+      // "maps/BroodWar/(4)Andromeda.scxB.xml"
+  };
+  static final int ITERATIONS = 4;
+  static final int MAX_GAME_LENGTH = 14000;
+  static final int TIME_BUDGET = 1000;
+  static final int ITERATIONS_BUDGET = -1;
+  static final int PRE_ANALYSIS_BUDGET = 0;
+  static final boolean FULL_OBSERVABILITY = true;
+  static final boolean TIMEOUT_CHECK = true;
+  static final boolean GC_CHECK = true;
+
+  // Oponentes fijos contra los que se evalúa el agente
+  static List<AI> createOpponents(UnitTypeTable utt) {
     List<AI> opponentAIs = new ArrayList<>();
     opponentAIs.add(new WorkerRush(utt));
     // opponentAIs.add(new EconomyLightRush(utt));
@@ -112,67 +238,65 @@ public class EvaluationTournament {
     // ai2 = new MLPSMCTS(utt);
     // ai2 = new UCTFirstPlayUrgency(utt);
 
-    String [] mapsString = {
-        //"maps/melee14x12Mixed18.xml",
-        "maps/16x16/basesWorkers16x16A.xml",
-        ///"maps/basesWorkers32x32A.xml",
-        "maps/BWDistantResources32x32.xml",
-        ///"maps/barricades24x24.xml",
-        //"maps/8x8/FourBasesWorkers8x8.xml",
-        ///"maps/16x16/TwoBasesBarracks16x16.xml",
-        // "maps/NoWhereToRun9x8.xml",
-        ///"maps/chambers32x32.xml",
-        ///"maps/GardenOfWar64x64.xml",
-        "maps/DoubleGame24x24.xml",
-        "maps/BroodWar/(2)Benzene.scxA.xml",
-        "maps/BroodWar/(2)Destination.scxA.xml",
-        // "maps/BroodWar/(4)Andromeda.scxB.xml"
-    };
-    List<String> maps = Arrays.asList(mapsString);
-    int iterations = 4;
-    int maxGameLength = 14000;
-    int timeBudget = 1000;
-    int iterationsBudget = -1;
-    int preAnalysisBudget = 0;
-    boolean fullObservability = true;
-    boolean timeOutCheck = true;
-    boolean gcCheck = true;
-    boolean preGameAnalysis = preAnalysisBudget > 0;
-    // String prefix = "./fitness/tournament_";
-    String timestamp = String.valueOf(System.currentTimeMillis());
-    String nanoTime = String.valueOf(System.nanoTime());
-    String fileName;
-    
-    // Verificar si se proporcionó filename como parámetro (posición 12)
-    if (args.length == 12) {
-      fileName = args[11];
-    } else {
-      fileName = "./resultados/GABotsLit/tournament_" + timestamp + "_" + nanoTime + ".csv";
+    return opponentAIs;
+  }
+
+  // Describe la configuración del torneo en JSON (oponentes, mapas, iteraciones y parámetros de partida).
+  // Python la usa como contexto de la caché de fitness para no mezclar resultados de configuraciones distintas.
+  public static JsonObject describeConfig(UnitTypeTable utt) {
+    JsonArray opponents = new JsonArray();
+    for (AI opponent : createOpponents(utt)) {
+      opponents.add(opponent.getClass().getSimpleName());
     }
-    
-    File file = new File(fileName);
-    // file.mkdir();
-    // String tournamentfolder = file.getPath();
-    // final File fileToUse = new File(tournamentfolder + "/tournament.csv");
-    //final String tracesFolder = (tournamentfolder + "/traces");
+    JsonArray maps = new JsonArray();
+    for (String map : MAPS) {
+      maps.add(map);
+    }
+    return new JsonObject()
+        .add("driver", "EvaluationTournament")
+        .add("agentVersion", MyAgent.VERSION)
+        .add("opponents", opponents)
+        .add("maps", maps)
+        .add("iterations", ITERATIONS)
+        .add("maxGameLength", MAX_GAME_LENGTH)
+        .add("timeBudget", TIME_BUDGET)
+        .add("iterationsBudget", ITERATIONS_BUDGET)
+        .add("preAnalysisBudget", PRE_ANALYSIS_BUDGET)
+        .add("fullObservability", FULL_OBSERVABILITY)
+        .add("timeOutCheck", TIMEOUT_CHECK)
+        .add("gcCheck", GC_CHECK);
+  }
 
-    try {
-      //System.out.print(tournamentfolder + "/tournament.csv");
-      System.out.print(file.getPath());
-      Writer writer = new FileWriter(file);
-      new FixedOpponentsTournament(selectedAIs, opponentAIs).runTournament(maps,
-                                          iterations, maxGameLength, timeBudget, iterationsBudget, 
-                                          preAnalysisBudget, 1000, // 1000 is just to give 1 second to the AIs to load their read/write folder saved content
-                                          fullObservability, timeOutCheck, gcCheck, preGameAnalysis, 
-                                          utt, null,
-                                          writer, null, // tracesFolder
-                                          null);
+  // Ejecuta el torneo del agente contra los oponentes fijos y escribe el resultado en writer.
+  // Los oponentes se crean en cada llamada para que las partidas no compartan estado
+  // cuando se invoca repetidamente desde la misma JVM (EvaluationServer).
+  public static void runTournament(AI agent, UnitTypeTable utt, Writer writer) throws Exception {
+    runGames(agent, utt, Arrays.asList(MAPS), createOpponents(utt), ITERATIONS, writer);
+  }
 
-      writer.close();
-    } catch (Exception e) {
-      // TODO Auto-generated catch block
-      e.printStackTrace();
+  // Ejecuta una única partida del torneo (mapa, oponente) para repartir una evaluación entre varios
+  // procesos. En la salida el mapa y el oponente aparecen con índice 0: quien la pide ya sabe cuáles son.
+  public static void runGame(AI agent, UnitTypeTable utt, int map, int opponent, Writer writer) throws Exception {
+    List<AI> opponents = createOpponents(utt);
+    if (map < 0 || map >= MAPS.length || opponent < 0 || opponent >= opponents.size()) {
+      throw new IllegalArgumentException("Partida fuera de rango: mapa " + map + ", oponente " + opponent);
     }
-    
+    runGames(agent, utt, Arrays.asList(MAPS[map]), opponents.subList(opponent, opponent + 1), 1, writer);
+  }
+
+  private static void runGames(AI agent, UnitTypeTable utt, List<String> maps, List<AI> opponentAIs,
+                               int iterations, Writer writer) throws Exception {
+    List<AI> selectedAIs = new ArrayList<>();
+    selectedAIs.add(agent);
+    // selectedAIs.add(new MyAgent(utt));
+
+    boolean preGameAnalysis = PRE_ANALYSIS_BUDGET > 0;
+    new FixedOpponentsTournament(selectedAIs, new ArrayList<>(opponentAIs)).runTournament(maps,
+                                        iterations, MAX_GAME_LENGTH, TIME_BUDGET, ITERATIONS_BUDGET, 
+                                        PRE_ANALYSIS_BUDGET, 1000, // 1000 is just to give 1 second to the AIs to load their read/write folder saved content
+                                        FULL_OBSERVABILITY, TIMEOUT_CHECK, GC_CHECK, preGameAnalysis, 
+                                        utt, null,
+                                        writer, null, // tracesFolder
+                                        null);
   }
 }
@@ -0,0 +1,167 @@
+package tournament;
+
+import java.io.PrintStream;
+import java.io.Writer;
+import java.lang.management.ManagementFactory;
+
+import com.eclipsesource.json.Json;
+import com.eclipsesource.json.JsonArray;
+import com.eclipsesource.json.JsonObject;
+import com.eclipsesource.json.JsonValue;
+
+/*
+ * Writer que convierte la salida de texto de los torneos de MicroRTS en registros JSON
+ * (uno por línea) a medida que se escribe.
+ *
+ *   {"type": "game", "iteration": 0, "map": 1, "ai1": 0, "ai2": 2, "time": 1535, "winner": 0, "crashed": -1, "timedout": -1}
+ *   {"type": "summary", "games": 60, "wins": [[...]], "ties": [[...]], ...}
+ *
+ * Las columnas de cada partida se toman de la cabecera que escribe el propio torneo
+ * y el resumen incluye todos los bloques finales ("Wins:", "Ties:", ...) como matrices.
+ * Así Python no necesita ficheros temporales ni conocer la posición de cada fila.
+ *
+ * Para la traza de tiempos de Python cada partida lleva además "wall_ms" (milisegundos de
+ * reloj que tardó en jugarse; el torneo las juega en serie y escribe cada fila al terminarla)
+ * y el resumen "startup_ms" (desde el origen hasta la cabecera de la tabla de partidas: el
+ * arranque de la JVM y la preparación del torneo).
+ */
+public class StreamingResultWriter extends Writer {
+
+  private final PrintStream out;
+  private final long requestId;
+  private final StringBuilder line = new StringBuilder();
+
+  private String[] columns = null;   // cabecera de la tabla de partidas
+  private boolean inSummary = false;
+  private JsonArray blockRows = null;
+  private final JsonObject summary = new JsonObject();
+  private int games = 0;
+  private boolean finished = false;
+  private final long originMillis;   // desde aquí se mide startup_ms
+  private long startupMillis = -1;
+  private long lastGameMillis;
+
+  // Drivers de línea de comandos: el arranque se mide desde el inicio de la JVM
+  public StreamingResultWriter(PrintStream out) {
+    this(out, -1, ManagementFactory.getRuntimeMXBean().getStartTime());
+  }
+
+  // requestId >= 0 se añade a cada registro (lo usa EvaluationServer para asociarlos a la petición)
+  public StreamingResultWriter(PrintStream out, long requestId) {
+    this(out, requestId, System.currentTimeMillis());
+  }
+
+  public StreamingResultWriter(PrintStream out, long requestId, long originMillis) {
+    this.out = out;
+    this.requestId = requestId;
+    this.originMillis = originMillis;
+  }
+
+  @Override
+  public void write(char[] cbuf, int off, int len) {
+    for (int i = off; i < off + len; i++) {
+      char c = cbuf[i];
+      if (c == '\n') {
+        processLine(line.toString());
+        line.setLength(0);
+      } else if (c != '\r') {
+        line.append(c);
+      }
+    }
+  }
+
+  @Override
+  public void flush() {
+    out.flush();
+  }
+
+  @Override
+  public void close() {
+    finish();
+  }
+
+  // Emite el registro de resumen (una sola vez)
+  public void finish() {
+    if (finished) {
+      return;
+    }
+    if (line.length() > 0) {
+      processLine(line.toString());
+      line.setLength(0);
+    }
+    summary.set("type", "summary");
+    summary.set("games", games);
+    if (startupMillis >= 0) {
+      summary.set("startup_ms", startupMillis);
+    }
+    emit(summary);
+    finished = true;
+  }
+
+  private void processLine(String text) {
+    String trimmed = text.trim();
+    if (trimmed.isEmpty()) {
+      return;
+    }
+
+    // Preámbulo: se ignora hasta la cabecera de la tabla de partidas
+    if (columns == null) {
+      if (trimmed.startsWith("iteration\t")) {
+        columns = trimmed.split("\t");
+        lastGameMillis = System.currentTimeMillis();
+        startupMillis = lastGameMillis - originMillis;
+      }
+      return;
+    }
+
+    // Los bloques de resumen empiezan con una etiqueta terminada en ':' ("Wins:", "Ties:", ...)
+    if (trimmed.endsWith(":")) {
+      inSummary = true;
+      String name = trimmed.substring(0, trimmed.length() - 1).trim().toLowerCase().replace(' ', '_');
+      blockRows = new JsonArray();
+      summary.set(name, blockRows);
+      return;
+    }
+
+    String[] values = trimmed.split("\t");
+    if (!inSummary) {
+      JsonObject game = new JsonObject().add("type", "game");
+      for (int i = 0; i < columns.length && i < values.length; i++) {
+        game.add(columns[i], toJson(values[i]));
+      }
+      long now = System.currentTimeMillis();
+      game.add("wall_ms", now - lastGameMillis);
+      lastGameMillis = now;
+      games++;
+      emit(game);
+    } else if (blockRows != null) {
+      JsonArray row = new JsonArray();
+      for (String value : values) {
+        row.add(toJson(value));
+      }
+      blockRows.add(row);
+    }
+  }
+
+  private void emit(JsonObject record) {
+    if (requestId >= 0) {
+      record.set("id", requestId);
+    }
+    out.println(record.toString());
+    out.flush();
+  }
+
+  private static JsonValue toJson(String value) {
+    String v = value.trim();
+    try {
+      return Json.value(Long.parseLong(v));
+    } catch (NumberFormatException e) {
+      // no es entero
+    }
+    try {
+      return Json.value(Double.parseDouble(v));
+    } catch (NumberFormatException e) {
+      return Json.value(v);
+    }
+  }
+}
@@ -0,0 +1,138 @@
+"""
+Evolución asíncrona en estado estacionario (steady-state) sin barrera de generación.
+
+En cuanto un trabajador queda libre se cría un nuevo hijo a partir de la población
+actual y se envía a evaluar; cuando llega un resultado el hijo compite con la población
+(reemplazo plus: se descarta al peor). Los operadores son los de inspyred (selector,
+variadores, observadores), y cada pop_size evaluaciones completadas se llama a los
+observadores como si fuera una generación, de modo que file_observer sigue escribiendo
+los ficheros de estadísticas e individuos con el mismo formato.
+"""
+
+import collections.abc
+import copy
+from concurrent.futures import FIRST_COMPLETED, wait
+from time import time
+
+from inspyred.ec import Individual
+
+
+class SteadyStateEC:
+    """
+    Motor steady-state con evaluaciones en paralelo mediante futures.
+
+    Args:
+        random: generador aleatorio (random.Random)
+        selector: selector de inspyred (p. ej. ec.selectors.tournament_selection)
+        variator: variador o lista de variadores de inspyred
+        observer: observador o lista de observadores de inspyred
+    """
+
+    def __init__(self, random, selector, variator, observer=None):
+        self._random = random
+        self.selector = selector
+        self.variator = variator if isinstance(variator, collections.abc.Sequence) else [variator]
+        if observer is None:
+            observer = []
+        self.observer = observer if isinstance(observer, collections.abc.Sequence) else [observer]
+        self.population = []
+        self.num_evaluations = 0
+        self.num_generations = 0
+        self.termination_cause = None
+
+    def evolve(self, generator, submit, concurrency, pop_size=100, seeds=None, maximize=True,
+               bounder=None, max_evaluations=None, max_time=None, on_evaluated=None, **args):
+        """
+        Ejecuta la evolución.
+
+        Args:
+            generator: generador de candidatos de inspyred
+            submit: función candidate -> concurrent.futures.Future con su fitness (None si falla)
+            concurrency (int): evaluaciones en vuelo a la vez (normalmente, número de trabajadores)
+            pop_size (int): tamaño de la población (como en inspyred, las semillas sobrantes se añaden)
+            seeds (list): candidatos iniciales
+            maximize (bool): si el fitness se maximiza
+            bounder: Bounder de inspyred aplicado a cada hijo
+            max_evaluations (int): evaluaciones completadas tras las que se para
+            max_time (float): segundos tras los que se para
+            on_evaluated: función (candidate, fitness) llamada en este hilo con cada resultado nuevo
+            args: argumentos para los operadores y observadores (p. ej. num_selected, mutation_rate)
+
+        Returns:
+            list: población final de Individual
+        """
+        self._kwargs = args
+        args['_ec'] = self
+        args.setdefault('num_selected', 2)
+        start_time = time()
+        args['start_time'] = start_time
+
+        initial = list(copy.copy(seeds)) if seeds else []
+        while len(initial) < pop_size:
+            initial.append(generator(random=self._random, args=args))
+        capacity = len(initial)
+
+        pending = {}     # future -> candidate
+        bred = []        # hijos ya criados esperando un trabajador libre
+        dispatched = 0
+
+        def can_dispatch():
+            if max_evaluations is not None and dispatched >= max_evaluations:
+                return False
+            if max_time is not None and time() - start_time >= max_time:
+                return False
+            return True
+
+        def next_candidate():
+            if initial:
+                return initial.pop(0)
+            if not self.population:
+                return None
+            if not bred:
+                parents = self.selector(random=self._random, population=list(self.population), args=args)
+                offspring = [copy.deepcopy(ind.candidate) for ind in parents]
+                for op in self.variator:
+                    offspring = op(random=self._random, candidates=offspring, args=args)
+                bred.extend(offspring)
+            candidate = bred.pop(0)
+            return bounder(candidate, args) if bounder is not None else candidate
+
+        while True:
+            while len(pending) < concurrency and can_dispatch():
+                candidate = next_candidate()
+                if candidate is None:
+                    break
+                pending[submit(candidate)] = candidate
+                dispatched += 1
+
+            if not pending:
+                break
+
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                candidate = pending.pop(future)
+                fitness = future.result()
+                self.num_evaluations += 1
+                if on_evaluated is not None and fitness is not None:
+                    on_evaluated(candidate, fitness)
+                if fitness is not None:
+                    ind = Individual(candidate, maximize=maximize)
+                    ind.fitness = fitness
+                    self.population.append(ind)
+                    # Reemplazo plus de un hijo: se elimina al peor si se supera la capacidad
+                    if len(self.population) > capacity:
+                        self.population.remove(min(self.population))
+
+                # Cada pop_size evaluaciones (y al completar la población inicial) se observa una "generación"
+                if self.num_evaluations >= capacity and (self.num_evaluations - capacity) % pop_size == 0:
+                    for obs in self.observer:
+                        obs(population=list(self.population), num_generations=self.num_generations,
+                            num_evaluations=self.num_evaluations, args=args)
+                    self.num_generations += 1
+
+        if max_evaluations is not None and self.num_evaluations >= max_evaluations:
+            self.termination_cause = 'evaluation_termination'
+        elif max_time is not None and time() - start_time >= max_time:
+            self.termination_cause = 'time_termination'
+
+        return self.population
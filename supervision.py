@@ -0,0 +1,199 @@
+"""
+Ejecución supervisada de partidas y evaluaciones.
+
+Sin supervisión, una JVM colgada bloquea el Pool durante toda la generación y los
+fallos se convierten en silencio en fitness 0. Aquí:
+
+- run_java lanza java en su propio grupo de procesos con un límite de tiempo y, si lo
+  supera, mata el grupo entero (la JVM y lo que haya lanzado).
+- supervised_call reintenta una ejecución fallida o agotada con espera exponencial y
+  devuelve, junto al resultado, cuántos intentos, timeouts y fallos hubo.
+- FailureTracker acumula esos contadores, pone en cuarentena los genomas que fallan
+  en buena parte de sus ejecuciones (no se vuelven a ejecutar) y, como observador de
+  inspyred, escribe una fila por generación en el informe de fallos.
+"""
+
+import csv
+import os
+import signal
+import subprocess
+from collections import Counter, namedtuple
+from threading import Lock
+from time import sleep
+
+from fitness_cache import canonical_genome
+from inspyred_callables import InspyredCallable
+
+SupervisionPolicy = namedtuple('SupervisionPolicy',
+                               ['game_timeout', 'evaluation_timeout', 'retries', 'backoff', 'quarantine_after'])
+SupervisionPolicy.__new__.__defaults__ = (None, None, 2, 1.0, 3)
+SupervisionPolicy.__doc__ = """
+Parámetros de supervisión (pequeño y serializable: viaja a los procesos con cada tarea).
+
+    game_timeout (float): segundos máximos de una partida suelta (None sin límite)
+    evaluation_timeout (float): segundos máximos de un torneo completo o enfrentamiento
+    retries (int): reintentos tras el primer intento fallido
+    backoff (float): espera antes del primer reintento; se duplica en cada uno
+    quarantine_after (int): fallos definitivos tras los que un genoma puede quedar en cuarentena
+"""
+
+REPORT_COLUMNS = ['generation', 'tasks', 'attempts', 'retries', 'timeouts', 'crashes', 'failed', 'skipped',
+                  'quarantined_new', 'quarantined_total']
+
+
+class ExecutionTimeout(RuntimeError):
+    """Una ejecución superó su límite de tiempo y se mató."""
+
+
+def run_java(command, timeout=None):
+    """
+    Ejecuta un comando (java) y devuelve su stdout.
+
+    Args:
+        command (list): comando y argumentos
+        timeout (float): segundos máximos (None sin límite)
+
+    Raises:
+        ExecutionTimeout: si se supera el límite; el grupo de procesos se mata antes
+    """
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+                               start_new_session=True)
+    try:
+        stdout, _ = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.communicate()
+        raise ExecutionTimeout(f"{command[3] if len(command) > 3 else command[0]} superó {timeout}s")
+    return stdout
+
+
+def supervised_call(attempt, accept, retries=2, backoff=1.0):
+    """
+    Ejecuta attempt() hasta que devuelva un resultado aceptable o se agoten los reintentos.
+
+    Args:
+        attempt: función sin argumentos que ejecuta la tarea
+        accept: función resultado -> bool que indica si la ejecución fue correcta
+        retries (int): reintentos tras el primer intento
+        backoff (float): espera antes del primer reintento (se duplica en cada uno)
+
+    Returns:
+        tuple: (resultado o None si todos los intentos fallaron,
+                {'attempts', 'timeouts', 'crashes'})
+    """
+    outcome = {'attempts': 0, 'timeouts': 0, 'crashes': 0}
+    for n in range(retries + 1):
+        if n:
+            sleep(backoff * 2 ** (n - 1))
+        outcome['attempts'] += 1
+        try:
+            result = attempt()
+        except ExecutionTimeout:
+            outcome['timeouts'] += 1
+            continue
+        except Exception:
+            outcome['crashes'] += 1
+            continue
+        if accept(result):
+            return result, outcome
+        outcome['crashes'] += 1
+    return None, outcome
+
+
+class FailureTracker(InspyredCallable):
+    """
+    Contabilidad de fallos y cuarentena de genomas.
+
+    Al final de cada generación entra en cuarentena todo genoma con al menos
+    quarantine_after fallos definitivos (tras los reintentos) que además fallan en al menos
+    quarantine_rate de sus ejecuciones. En la co-evolución un fallo cuenta para los dos
+    genomas del enfrentamiento; la proporción evita culpar a los rivales de un genoma que
+    falla contra todos.
+
+    Se registra como observador de inspyred: en cada generación añade una fila con los
+    contadores de la generación a report_path (si no es None) y los pone a cero.
+
+    Args:
+        quarantine_after (int): fallos mínimos para poner un genoma en cuarentena
+        report_path (str): CSV del informe de fallos por generación
+        quarantine_rate (float): proporción mínima de ejecuciones fallidas
+    """
+
+    inspyred_name = 'failure_report_observer'
+
+    def __init__(self, quarantine_after=3, report_path=None, quarantine_rate=0.5):
+        self.quarantine_after = quarantine_after
+        self.quarantine_rate = quarantine_rate
+        self.report_path = report_path
+        self.genome_tasks = Counter()
+        self.genome_failures = Counter()
+        self.quarantined = set()
+        self.current = Counter()
+        self.totals = Counter()
+        self._lock = Lock()   # steady-state registra desde los hilos de los futures
+        if report_path is not None:
+            with open(report_path, 'w', newline='') as f:
+                csv.writer(f).writerow(REPORT_COLUMNS)
+
+    def is_quarantined(self, *agents):
+        return any(canonical_genome(agent) in self.quarantined for agent in agents)
+
+    def skip(self):
+        """Registra una tarea no ejecutada por afectar a un genoma en cuarentena."""
+        with self._lock:
+            self.current['skipped'] += 1
+
+    def record(self, agents, outcome, failed):
+        """
+        Registra una tarea terminada.
+
+        Args:
+            agents (list): genomas que intervienen (uno en el GA, dos en un enfrentamiento)
+            outcome (dict): contadores de supervised_call (None si la tarea no estaba supervisada)
+            failed (bool): si la tarea falló definitivamente
+        """
+        with self._lock:
+            self.current['tasks'] += 1
+            genomes = {canonical_genome(agent) for agent in agents}
+            self.genome_tasks.update(genomes)
+            if outcome is not None:
+                self.current['attempts'] += outcome['attempts']
+                self.current['retries'] += outcome['attempts'] - 1
+                self.current['timeouts'] += outcome['timeouts']
+                self.current['crashes'] += outcome['crashes']
+            if failed:
+                self.current['failed'] += 1
+                self.genome_failures.update(genomes)
+
+    def __call__(self, population, num_generations, num_evaluations, args):
+        with self._lock:
+            for genome, failures in self.genome_failures.items():
+                if (genome not in self.quarantined and failures >= self.quarantine_after and
+                        failures >= self.quarantine_rate * self.genome_tasks[genome]):
+                    self.quarantined.add(genome)
+                    self.current['quarantined_new'] += 1
+            row = dict(self.current, generation=num_generations, quarantined_total=len(self.quarantined))
+            self.totals.update(self.current)
+            self.current = Counter()
+        if self.report_path is not None:
+            with open(self.report_path, 'a', newline='') as f:
+                csv.writer(f).writerow([row.get(column, 0) for column in REPORT_COLUMNS])
+
+    def stats(self):
+        """Totales de la ejecución (incluida la generación en curso)."""
+        with self._lock:
+            totals = self.totals + self.current
+        return {column: totals.get(column, 0) for column in REPORT_COLUMNS[1:-2]} | \
+            {'quarantined': len(self.quarantined)}
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
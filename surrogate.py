@@ -0,0 +1,243 @@
+"""
+Preselección de descendientes con un modelo sustituto (surrogate) del fitness.
+
+Cada ejecución deja en resultados/GABotsLit_*/inspyred-individuals-file-*.csv miles de
+pares (genoma, fitness). Un proceso gaussiano sobre los 10 genes, entrenado con esas
+ejecuciones anteriores más las evaluaciones reales de la ejecución en curso, predice las
+victorias de cada descendiente con su incertidumbre. En cada generación solo juegan el
+EvaluationTournament real los descendientes con mayor cota superior (media + kappa *
+desviación), es decir, los más prometedores o los más inciertos; el resto se descarta sin
+jugar ninguna partida.
+
+SurrogateScreen se registra además como observador de inspyred: en cada generación
+añade al informe una fila con las evaluaciones reales evitadas y la correlación de rangos
+(Spearman) entre la predicción y las victorias reales de los candidatos evaluados.
+"""
+
+import csv
+import glob
+from math import ceil
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+
+from fitness_cache import canonical_genome
+from game_backend import GENE_LOWER, GENE_UPPER, INDIVIDUALS_PATTERN, load_individuals
+from inspyred_callables import InspyredCallable
+
+REPORT_COLUMNS = ['generation', 'candidates', 'evaluated', 'avoided', 'rank_correlation', 'training_points']
+
+
+def normalize_genomes(genomes):
+    """Genomas (n, 10) escalados a [0, 1] con los límites del Bounder del GA."""
+    return (np.asarray(genomes, dtype=float) - GENE_LOWER) / (GENE_UPPER - GENE_LOWER)
+
+
+def rank_correlation(predicted, actual):
+    """Correlación de Spearman (NaN con menos de 3 valores o si alguno es constante)."""
+    if len(predicted) < 3:
+        return float('nan')
+    # Pearson sobre los rangos (con empates promediados): la de pandas con 'spearman' necesita scipy
+    return float(pd.Series(predicted).rank().corr(pd.Series(actual).rank()))
+
+
+class GaussianProcess:
+    """
+    Regresión con proceso gaussiano en NumPy: núcleo RBF isótropo más ruido.
+
+    La escala de longitud y el ruido se eligen en una rejilla maximizando la verosimilitud
+    marginal; las victorias se estandarizan antes de ajustar.
+    """
+
+    LENGTH_SCALES = (0.1, 0.2, 0.3, 0.5, 0.8, 1.2)
+    NOISES = (0.01, 0.05, 0.2, 0.5)
+
+    def fit(self, points, targets):
+        self.points = points
+        self.offset = float(targets.mean())
+        self.scale = float(targets.std()) or 1.0
+        z = (targets - self.offset) / self.scale
+        distances = self._square_distances(points, points)
+        best = None
+        for length_scale in self.LENGTH_SCALES:
+            kernel = np.exp(-distances / (2 * length_scale ** 2))
+            for noise in self.NOISES:
+                try:
+                    cholesky = np.linalg.cholesky(kernel + noise * np.eye(len(points)))
+                except np.linalg.LinAlgError:
+                    continue
+                alpha = np.linalg.solve(cholesky.T, np.linalg.solve(cholesky, z))
+                likelihood = -0.5 * z @ alpha - np.log(np.diag(cholesky)).sum()
+                if best is None or likelihood > best[0]:
+                    best = (likelihood, length_scale, noise, cholesky, alpha)
+        _, self.length_scale, self.noise, self.cholesky, self.alpha = best
+        return self
+
+    @staticmethod
+    def _square_distances(a, b):
+        return np.maximum((a ** 2).sum(axis=1)[:, None] + (b ** 2).sum(axis=1)[None, :] - 2 * a @ b.T, 0.0)
+
+    def predict(self, points):
+        """
+        Returns:
+            tuple: (media, desviación típica) de las victorias de cada punto
+        """
+        kernel = np.exp(-self._square_distances(points, self.points) / (2 * self.length_scale ** 2))
+        mean = kernel @ self.alpha
+        v = np.linalg.solve(self.cholesky, kernel.T)
+        variance = np.maximum(1.0 - (v ** 2).sum(axis=0), 0.0)
+        return self.offset + self.scale * mean, self.scale * np.sqrt(variance)
+
+
+class SurrogateScreen(InspyredCallable):
+    """
+    Modelo sustituto y contabilidad de la preselección.
+
+    Los genomas repetidos se agregan por su media (en los ficheros de individuos cada
+    superviviente aparece una vez por generación). Si hay más de max_points genomas
+    distintos se entrena con todos los de la ejecución en curso y una muestra de los
+    anteriores.
+
+    Args:
+        genomes (np.ndarray): genomas de ejecuciones anteriores (n, 10)
+        victories (np.ndarray): sus victorias (n,)
+        fraction (float): proporción de descendientes de cada generación que se evalúan de verdad
+        kappa (float): peso de la incertidumbre en la cota superior con la que se ordenan
+        min_points (int): genomas distintos necesarios para empezar a descartar
+        max_points (int): genomas distintos máximos en el entrenamiento
+        report_path (str): CSV del informe por generación (None para no escribirlo)
+        seed (int): semilla de la muestra de entrenamiento
+    """
+
+    inspyred_name = 'surrogate_report_observer'
+
+    def __init__(self, genomes, victories, fraction=0.5, kappa=1.0, min_points=30, max_points=800, report_path=None,
+                 seed=0):
+        self.fraction = fraction
+        self.kappa = kappa
+        self.min_points = min_points
+        self.max_points = max_points
+        self.report_path = report_path
+        self.seed = seed
+        self.history = self._aggregate(genomes, victories)
+        self.observed = {}   # genoma canónico -> (genes normalizados, victorias) de la ejecución en curso
+        self.model = None
+        self.training_points = 0
+        self.current = self._empty_row()
+        self.totals = {'evaluated': 0, 'avoided': 0}
+        self._lock = Lock()
+        if report_path is not None:
+            with open(report_path, 'w', newline='') as f:
+                csv.writer(f).writerow(REPORT_COLUMNS)
+
+    @classmethod
+    def from_results(cls, pattern=INDIVIDUALS_PATTERN, **kwargs):
+        """SurrogateScreen entrenado con los inspyred-individuals-file que encuentre pattern."""
+        genomes, fitness = load_individuals(sorted(glob.glob(pattern)))
+        return cls(genomes, fitness[:, 0], **kwargs)
+
+    @staticmethod
+    def _aggregate(genomes, victories):
+        points = normalize_genomes(genomes).reshape(-1, len(GENE_LOWER))
+        if len(points) == 0:
+            return points, np.zeros(0)
+        unique, inverse = np.unique(points, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        return unique, np.bincount(inverse, weights=victories) / np.bincount(inverse)
+
+    @staticmethod
+    def _empty_row():
+        return {'candidates': 0, 'evaluated': 0, 'predicted': [], 'actual': []}
+
+    def _training_set(self):
+        points, targets = self.history
+        if self.observed:
+            current = list(self.observed.values())
+            current_points = np.array([point for point, _ in current])
+            current_targets = np.array([target for _, target in current])
+            budget = max(self.max_points - len(current_points), 0)
+            if len(points) > budget:
+                chosen = np.random.default_rng(self.seed).choice(len(points), budget, replace=False)
+                points, targets = points[chosen], targets[chosen]
+            return np.vstack([current_points[-self.max_points:], points]), \
+                np.concatenate([current_targets[-self.max_points:], targets])
+        if len(points) > self.max_points:
+            chosen = np.random.default_rng(self.seed).choice(len(points), self.max_points, replace=False)
+            return points[chosen], targets[chosen]
+        return points, targets
+
+    def _fit(self):
+        points, targets = self._training_set()
+        self.training_points = len(points)
+        self.model = GaussianProcess().fit(points, targets) if len(points) >= self.min_points else None
+
+    def screen(self, candidates, discard=True):
+        """
+        Elige los candidatos que se evalúan de verdad.
+
+        Args:
+            candidates (list): genomas de la generación
+            discard (bool): si es False se evalúan todos (solo se predice, p.ej. la población inicial)
+
+        Returns:
+            tuple: (índices a evaluar, victorias predichas de cada candidato o None sin modelo)
+        """
+        if self.model is None:
+            self._fit()
+        if self.model is None:
+            return list(range(len(candidates))), None
+        mean, deviation = self.model.predict(normalize_genomes([candidate[:10] for candidate in candidates]))
+        n_evaluated = len(candidates) if not discard else min(len(candidates), max(1, ceil(self.fraction * len(candidates))))
+        upper = mean + self.kappa * deviation
+        selected = sorted(np.argsort(-upper, kind='stable')[:n_evaluated].tolist())
+        return selected, mean.tolist()
+
+    def record(self, candidates, predicted, fitness, n_candidates):
+        """
+        Registra las evaluaciones reales de una generación y las añade al entrenamiento.
+
+        Args:
+            candidates (list): genomas evaluados de verdad
+            predicted (list): victorias predichas de esos genomas (None sin modelo)
+            fitness (list): sus LexicoFitness (None si la evaluación falló)
+            n_candidates (int): candidatos de la generación (evaluados más descartados)
+        """
+        with self._lock:
+            self.current['candidates'] += n_candidates
+            self.current['evaluated'] += len(candidates)
+            for idx, (candidate, result) in enumerate(zip(candidates, fitness)):
+                if result is None:
+                    continue
+                self.observed[canonical_genome(candidate)] = (normalize_genomes(candidate[:10]), result.victorias)
+                if predicted is not None:
+                    self.current['predicted'].append(predicted[idx])
+                    self.current['actual'].append(result.victorias)
+            self.model = None   # se reajusta con los nuevos datos en la próxima preselección
+
+    def __call__(self, population, num_generations, num_evaluations, args):
+        with self._lock:
+            row = self.current
+            self.current = self._empty_row()
+            avoided = row['candidates'] - row['evaluated']
+            self.totals['evaluated'] += row['evaluated']
+            self.totals['avoided'] += avoided
+        if self.report_path is not None:
+            with open(self.report_path, 'a', newline='') as f:
+                csv.writer(f).writerow([num_generations, row['candidates'], row['evaluated'], avoided,
+                                        rank_correlation(row['predicted'], row['actual']), self.training_points])
+
+    def stats(self):
+        """Totales de la ejecución: evaluaciones reales, evitadas y genomas de entrenamiento."""
+        with self._lock:
+            return dict(self.totals, training_points=self.training_points)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['_lock']
+        state['model'] = None   # se reajusta al reanudar
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
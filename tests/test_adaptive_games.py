@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from adaptive_games import AdaptivePolicy, adaptive_victories, cell_decided, sprt_decision, wilson_interval
+
+
+def games_table(rows):
+    """Partidas en columnas a partir de (mapa, oponente, ganador); ganador 0 es el candidato y -1 empate."""
+    maps, opponents, winners = zip(*rows)
+    return {'map': np.array(maps, dtype=np.int64), 'ai2': np.array(opponents, dtype=np.int64),
+            'winner': np.array(winners, dtype=np.int64)}
+
+
+def test_sprt_decides_after_two_equal_results():
+    # Con p0 = 0.25 y p1 = 0.75 cada partida mueve la razón de verosimilitudes log(3) y los
+    # umbrales con alpha = beta = 0.1 son +-log(9): hacen falta dos resultados netos
+    assert sprt_decision(2, 2) == 1
+    assert sprt_decision(0, 2) == -1
+    assert sprt_decision(1, 2) == 0
+    assert sprt_decision(1.5, 2) == 0
+    assert sprt_decision(3, 4) == 0
+    assert sprt_decision(4, 6) == 1
+
+
+def test_wilson_interval_known_values():
+    low, high = wilson_interval(0, 10)
+    assert low == 0.0
+    assert high == pytest.approx(1.96 ** 2 / (10 + 1.96 ** 2))
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    low, high = wilson_interval(3, 10)
+    mirror_low, mirror_high = wilson_interval(7, 10)
+    assert (low, high) == pytest.approx((1 - mirror_high, 1 - mirror_low))
+
+
+def test_cell_decided_respects_min_and_max_games():
+    sprt = AdaptivePolicy(test='sprt', min_games=3)
+    assert not cell_decided(2, 2, sprt, max_games=6)     # el SPRT ya decidiría, pero faltan partidas
+    assert cell_decided(3, 3, sprt, max_games=6)
+    assert not cell_decided(2.5, 5, sprt, max_games=6)
+    assert cell_decided(3, 6, sprt, max_games=6)         # sin decidir, pero en el máximo
+
+    wilson = AdaptivePolicy(test='wilson', min_games=1, width=0.5)
+    assert not cell_decided(1, 2, wilson, max_games=100)
+    assert cell_decided(10, 20, wilson, max_games=100)
+
+
+def test_adaptive_victories_rescales_each_cell_to_the_tournament():
+    # Mapa 0: 4 victorias de 4; mapa 1: un empate y una derrota en 2 partidas
+    games = games_table([(0, 0, 0)] * 4 + [(1, 0, -1), (1, 0, 1)])
+    cell_games = np.array([[4], [2]])
+    assert adaptive_victories(games, cell_games, iterations=3) == pytest.approx((1.0 + 0.25) * 3)
+
+
+def test_adaptive_victories_matches_full_tournament_score():
+    rows = [(m, o, w) for m in range(2) for o in range(3) for w in (0, -1, 1)]
+    games = games_table(rows)
+    cell_games = np.full((2, 3), 3)
+    wins = sum(w == 0 for _, _, w in rows)
+    ties = sum(w == -1 for _, _, w in rows)
+    assert adaptive_victories(games, cell_games, iterations=3) == pytest.approx(wins + 0.5 * ties)
+
+
+def test_adaptive_victories_ignores_cells_without_games():
+    games = games_table([(0, 0, 0)])
+    assert adaptive_victories(games, np.array([[1, 0]]), iterations=5) == pytest.approx(5.0)
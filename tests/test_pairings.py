@@ -0,0 +1,45 @@
+from random import Random
+
+import pytest
+
+from pairings import PAIRING_SCHEMES, expected_score, sparse_pairings
+from rating import ELO_SCALE
+
+
+def check_pairs(pairs, n, budget, exclude):
+    assert len(pairs) <= budget
+    assert len(set(pairs)) == len(pairs)
+    for i, j in pairs:
+        assert 0 <= i < j < n
+        assert (i, j) not in exclude
+
+
+@pytest.mark.parametrize('scheme', PAIRING_SCHEMES)
+@pytest.mark.parametrize('budget', [None, 1, 7, 1000])
+def test_sparse_pairings_within_budget_and_exclude(scheme, budget):
+    rand = Random(3)
+    n, k = 12, 3
+    ratings = [rand.gauss(1200, 100) for _ in range(n)]
+    counts = [rand.randrange(5) for _ in range(n)]
+    exclude = {(i, j) for i in range(n) for j in range(i + 1, n) if rand.random() < 0.3}
+    pairs = sparse_pairings(scheme, ratings, rand, budget=budget, k=k, counts=counts, exclude=exclude,
+                            scale=ELO_SCALE)
+    check_pairs(pairs, n, (k * n + 1) // 2 if budget is None else budget, exclude)
+    assert pairs
+
+
+@pytest.mark.parametrize('scheme', PAIRING_SCHEMES)
+def test_sparse_pairings_when_everything_is_excluded(scheme):
+    n = 5
+    exclude = {(i, j) for i in range(n) for j in range(i + 1, n)}
+    assert sparse_pairings(scheme, [1200.0] * n, Random(0), counts=[0] * n, exclude=exclude) == []
+
+
+def test_sparse_pairings_rejects_unknown_scheme():
+    with pytest.raises(ValueError):
+        sparse_pairings('elimination', [1200.0] * 4, Random(0))
+
+
+def test_expected_score_elo_scale():
+    assert expected_score(1200, 1200, ELO_SCALE) == pytest.approx(0.5)
+    assert expected_score(1600, 1200, ELO_SCALE) == pytest.approx(10 / 11)
@@ -0,0 +1,54 @@
+from itertools import product
+from random import Random
+
+import pytest
+
+from racing import upper_bound
+
+
+@pytest.mark.parametrize('total_games', [1, 4, 9])
+def test_exact_bound_covers_every_possible_outcome(total_games):
+    # Ningún resultado de las partidas restantes supera la cota: no se corta a quien aún llega
+    outcomes = (0.0, 0.5, 1.0)
+    for played in range(total_games + 1):
+        for history in product(outcomes, repeat=played):
+            score = sum(history)
+            bound = upper_bound(score, played, total_games, 'exact')
+            best = score + (total_games - played)
+            assert bound >= best
+            # El racing corta con bound < threshold: un candidato que llega justo no se corta
+            assert not bound < best
+
+
+def test_exact_bound_is_tight():
+    assert upper_bound(3.5, 5, 12, 'exact') == 10.5
+    assert upper_bound(0, 12, 12, 'exact') == 0
+
+
+def test_hoeffding_bound_never_below_current_pace():
+    for played in range(1, 30):
+        for wins in range(played + 1):
+            bound = upper_bound(wins, played, 30, 'hoeffding', delta=0.05)
+            assert bound >= wins / played * 30
+            assert bound <= 30
+
+
+def test_hoeffding_bound_without_games_is_exact():
+    assert upper_bound(0, 0, 30, 'hoeffding') == upper_bound(0, 0, 30, 'exact') == 30
+
+
+def test_hoeffding_rarely_truncates_a_candidate_that_reaches_the_threshold():
+    # Candidatos con tasa real 0.6 en 60 partidas (por lotes de 6) y umbral 0.6 * 60: la cota
+    # de Hoeffding solo puede cortarlos con probabilidad <= delta en cada comprobación
+    rand = Random(1)
+    total_games, batch, delta, rate = 60, 6, 0.05, 0.6
+    threshold = rate * total_games
+    runs, truncated = 2000, 0
+    for _ in range(runs):
+        score = 0
+        for played in range(batch, total_games, batch):
+            score += sum(rand.random() < rate for _ in range(batch))
+            if upper_bound(score, played, total_games, 'hoeffding', delta) < threshold:
+                truncated += 1
+                break
+    assert truncated / runs <= delta
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from rating import ELO_SCALE, batched_elo_update, bradley_terry, score_matrices
+
+
+def two_players(wins, losses):
+    score = np.array([[0.0, wins], [losses, 0.0]])
+    games = np.array([[0.0, wins + losses], [wins + losses, 0.0]])
+    return score, games
+
+
+def test_bradley_terry_without_prior_recovers_log_odds():
+    # 3 victorias y 1 derrota: la diferencia de log-fuerzas de máxima verosimilitud es log(3)
+    ratings, errors = bradley_terry(*two_players(3, 1), prior_games=0)
+    assert (ratings[0] - ratings[1]) / ELO_SCALE == pytest.approx(np.log(3))
+    assert ratings.mean() == pytest.approx(1200.0)
+    assert np.all(np.isfinite(errors))
+
+
+def test_bradley_terry_prior_shrinks_towards_base():
+    free, _ = bradley_terry(*two_players(3, 1), prior_games=0)
+    shrunk, _ = bradley_terry(*two_players(3, 1), prior_games=4)
+    assert 0 < shrunk[0] - shrunk[1] < free[0] - free[1]
+
+
+def test_bradley_terry_prior_keeps_unbeaten_agents_finite():
+    ratings, errors = bradley_terry(*two_players(4, 0))
+    assert np.all(np.isfinite(ratings)) and np.all(np.isfinite(errors))
+    assert ratings[0] > ratings[1]
+
+
+def test_bradley_terry_rejects_disconnected_graph_without_prior():
+    score = np.zeros((3, 3))
+    games = np.zeros((3, 3))
+    score[0, 1] = score[1, 0] = 1.0
+    games[0, 1] = games[1, 0] = 2.0
+    with pytest.raises(ValueError):
+        bradley_terry(score, games, prior_games=0)
+    with pytest.raises(ValueError):
+        bradley_terry(score, games, prior_games=-1)
+
+
+def test_bradley_terry_balanced_cycle_gives_equal_ratings():
+    # 0 gana a 1, 1 a 2 y 2 a 0 con el mismo marcador: nadie es más fuerte
+    score = np.array([[0.0, 3.0, 1.0], [1.0, 0.0, 3.0], [3.0, 1.0, 0.0]])
+    games = np.where(np.eye(3) > 0, 0.0, 4.0)
+    ratings, _ = bradley_terry(score, games, prior_games=0)
+    assert ratings == pytest.approx([1200.0] * 3)
+
+
+def test_score_matrices_counts_ties_and_skips_failures():
+    results = [{'i': 0, 'j': 1, 'wins_i': 2, 'wins_j': 1, 'ties_i': 1, 'success': True},
+               {'i': 1, 'j': 2, 'wins_i': 5, 'wins_j': 0, 'ties_i': 0, 'success': False}]
+    score, games = score_matrices(3, results)
+    assert score[0, 1] == 2.5 and score[1, 0] == 1.5
+    assert games[0, 1] == games[1, 0] == 4
+    assert not games[1:, 2].any() and not games[2, 1:].any()
+
+
+def test_elo_update_known_values():
+    from CoEvGAmicroRTS import update_elo_ratings
+    assert update_elo_ratings(1200, 1200, 1.0) == pytest.approx((1216, 1184))
+    assert update_elo_ratings(1200, 1200, 0.5) == pytest.approx((1200, 1200))
+    # 200 puntos de ventaja: puntuación esperada 1 / (1 + 10^-0.5) = 0.7597
+    new_1, new_2 = update_elo_ratings(1400, 1200, 1.0)
+    assert new_1 == pytest.approx(1400 + 32 * (1 - 0.759747), abs=1e-3)
+    assert new_1 + new_2 == pytest.approx(2600)
+
+
+def test_batched_elo_update_matches_sequential_for_disjoint_pairs():
+    from CoEvGAmicroRTS import update_elo_ratings
+    ratings = [1200.0, 1300.0, 1150.0, 1250.0]
+    batched = batched_elo_update(ratings, [(0, 1), (2, 3)], [1.0, 0.5])
+    sequential = list(update_elo_ratings(1200.0, 1300.0, 1.0)) + list(update_elo_ratings(1150.0, 1250.0, 0.5))
+    assert batched == pytest.approx(sequential)
+    assert batched.sum() == pytest.approx(sum(ratings))
+
+
+def test_batched_elo_update_uses_ratings_before_the_batch():
+    # Dos enfrentamientos del agente 0 en el mismo lote: ambos con el rating inicial
+    updated = batched_elo_update([1200.0, 1200.0, 1200.0], [(0, 1), (0, 2)], [1.0, 1.0])
+    assert updated == pytest.approx([1232.0, 1184.0, 1184.0])
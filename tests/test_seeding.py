@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+import seeding
+from fitness_cache import canonical_genome
+from seeding import SEED_MASK, derive_seed, game_seed, match_seed, tournament_seed
+
+GENOME = [0.5, 0.25, 0.75, 3, 2, 0.1, 0.2, 0.3, 0.4, 0.6, 'etiqueta']
+
+
+def test_derive_seed_known_values():
+    # Cambiar estos valores cambia todas las partidas con semilla de los experimentos ya hechos
+    assert derive_seed(42) == 4065376765926183791
+    assert derive_seed(42, (0.5, 1), 3, 1, 2) == 8150332596435832955
+    assert game_seed(42, GENOME, (1, 2, 3)) == 2714840489704791497
+    assert tournament_seed(42, GENOME) == 5769067563113442912
+
+
+def test_derive_seed_is_stable_across_processes():
+    code = "from seeding import derive_seed; print(derive_seed(7, 'mapa', 1))"
+    outputs = {subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                              env=dict(os.environ, PYTHONHASHSEED=str(hash_seed)),
+                              cwd=os.path.dirname(os.path.abspath(seeding.__file__))).stdout
+               for hash_seed in (0, 1)}
+    assert outputs == {f"{derive_seed(7, 'mapa', 1)}\n"}
+
+
+def test_derive_seed_range_and_sensitivity():
+    seeds = {derive_seed(1, i) for i in range(100)}
+    assert len(seeds) == 100
+    assert all(0 <= seed <= SEED_MASK for seed in seeds)
+    assert derive_seed(1, 2) != derive_seed(2, 1)
+
+
+def test_seeds_without_base_seed():
+    assert game_seed(None, GENOME, (0, 0, 0)) is None
+    assert tournament_seed(None, GENOME) is None
+    assert match_seed(None, GENOME, GENOME) is None
+
+
+def test_match_seed_is_symmetric():
+    other = [0.1] * 3 + [1, 1] + [0.9] * 5 + ['otro']
+    assert match_seed(5, GENOME, other) == match_seed(5, other, GENOME)
+
+
+def test_canonical_genome_normalises_types_and_drops_label():
+    as_text = [str(gene) for gene in GENOME[:10]] + ['otra etiqueta']
+    assert canonical_genome(GENOME) == canonical_genome(as_text)
+    canonical = canonical_genome(GENOME)
+    assert canonical == (0.5, 0.25, 0.75, 3, 2, 0.1, 0.2, 0.3, 0.4, 0.6)
+    assert [type(gene) for gene in canonical] == [float] * 3 + [int] * 2 + [float] * 5
+    assert tournament_seed(3, GENOME) == tournament_seed(3, as_text)
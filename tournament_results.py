@@ -0,0 +1,151 @@
+"""
+Lectura de los resultados de torneo emitidos en streaming por los drivers de Java.
+
+Con ``-`` como nombre de fichero, EvaluationTournament y CoEvEvaluationGame (y también
+EvaluationServer) escriben por stdout un registro JSON por partida y un resumen final:
+
+    {"type": "game", "iteration": 0, "map": 1, "ai1": 0, "ai2": 2, "time": 1535, "winner": 0, "crashed": -1, "timedout": -1, "wall_ms": 812}
+    {"type": "summary", "games": 60, "wins": [[...]], "ties": [[...]], "startup_ms": 940, ...}
+
+Así se evita el fichero CSV temporal y no hace falta conocer en qué fila del
+fichero está cada bloque del resumen. parse_tournament_output lee tanto estos
+registros como el texto original de los torneos y devuelve las partidas en
+columnas de NumPy.
+"""
+
+import json
+
+import numpy as np
+
+GAME_COLUMNS = ['iteration', 'map', 'ai1', 'ai2', 'time', 'winner', 'crashed', 'timedout']
+# Columnas opcionales de los registros JSON: milisegundos de reloj de cada partida (ver tracing.py)
+TIMING_COLUMNS = ['wall_ms']
+
+
+def parse_record(line):
+    """
+    Decodifica una línea del canal de resultados.
+
+    Args:
+        line (str): línea de stdout del driver
+
+    Returns:
+        dict: el registro, o None si la línea no es un registro JSON (p. ej. trazas de las IAs)
+    """
+    line = line.strip()
+    if not line.startswith('{'):
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def parse_tournament_output(lines):
+    """
+    Lee la salida de un torneo en una sola pasada.
+
+    Acepta tanto el texto de FixedOpponentsTournament/RoundRobinTournament (preámbulo,
+    cabecera ``iteration\tmap\t...``, una fila por partida y bloques ``Wins:``, ``Ties:``...)
+    como los registros JSON del canal de streaming.
+
+    Args:
+        lines: texto completo, iterable de líneas (p. ej. un fichero abierto) o de registros ya decodificados
+
+    Returns:
+        tuple: (dict columna -> np.ndarray de enteros con una posición por partida,
+                dict bloque -> np.ndarray 2D del resumen, o None si el torneo no llegó a terminar)
+    """
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+
+    columns = None
+    rows = []          # filas de partidas en texto
+    records = []       # registros JSON de partidas
+    blocks = {}
+    block_rows = None
+    stream_summary = None
+
+    for line in lines:
+        if isinstance(line, dict):
+            record = line
+        else:
+            text = line.strip()
+            if not text:
+                continue
+            if text[0] != '{':
+                # Formato de texto del torneo
+                if columns is None:
+                    if text.startswith('iteration\t'):
+                        columns = text.split('\t')
+                elif text[-1] == ':':
+                    block_rows = blocks.setdefault(text[:-1].strip().lower().replace(' ', '_'), [])
+                elif block_rows is None:
+                    rows.append(text.split('\t'))
+                else:
+                    block_rows.append(text.split('\t'))
+                continue
+            record = parse_record(text)
+            if record is None:
+                continue
+
+        kind = record.get('type')
+        if kind == 'game':
+            records.append(record)
+        elif kind == 'summary':
+            stream_summary = record
+
+    if records:
+        record_columns = GAME_COLUMNS + [column for column in TIMING_COLUMNS if column in records[0]]
+        games = {column: np.fromiter((record.get(column, -1) for record in records), dtype=np.int64, count=len(records))
+                 for column in record_columns}
+    elif rows:
+        # Una fila incompleta al final (fichero truncado) no se tiene en cuenta
+        rows = [row for row in rows if len(row) == len(columns)]
+        table = np.array(rows, dtype=np.int64).reshape(len(rows), len(columns))
+        games = {column: table[:, idx] for idx, column in enumerate(columns)}
+    else:
+        games = {column: np.empty(0, dtype=np.int64) for column in GAME_COLUMNS}
+
+    if stream_summary is not None:
+        summary = {name: _block_array(value) if isinstance(value, list) else value
+                   for name, value in stream_summary.items() if name != 'type'}
+    elif blocks:
+        summary = {name: _block_array(value) for name, value in blocks.items()}
+        summary['games'] = len(games['time'])
+    else:
+        summary = None
+
+    return games, summary
+
+
+def parse_tournament_file(path):
+    """Lee un fichero de torneo (texto o registros JSON) con parse_tournament_output."""
+    with open(path) as f:
+        return parse_tournament_output(f)
+
+
+def _block_array(rows):
+    """Convierte las filas de un bloque del resumen en una matriz numérica (o la deja como lista si no lo es)."""
+    for dtype in (np.int64, np.float64):
+        try:
+            return np.array(rows, dtype=dtype)
+        except (ValueError, TypeError):
+            continue
+    return rows
+
+
+def summary_total(summary, block, row=0):
+    """
+    Suma una fila de un bloque del resumen (p. ej. las victorias del agente 0 contra todos los oponentes).
+
+    Args:
+        summary (dict): resumen del torneo
+        block (str): nombre del bloque ('wins', 'ties', ...)
+        row (int): fila del bloque (índice del agente)
+
+    Returns:
+        float: suma de la fila
+    """
+    return float(np.sum(summary[block][row]))
@@ -0,0 +1,346 @@
+"""
+Traza de tiempos por evaluación.
+
+Cada ejecución java (un torneo completo o, con shard_games, una partida suelta) mide en
+el proceso que la lanza en qué se fue su tiempo de reloj, y la traza la escribe el
+proceso principal con una fila o evento por fase:
+
+- queue: desde que el evaluador recibe el lote hasta que un proceso empieza la ejecución
+- retry: intentos fallidos y esperas de la supervisión antes del intento que cuenta
+- spawn: arranque de la JVM y preparación del torneo hasta la primera partida (en las JVM
+  persistentes, solo la preparación de la petición)
+- game: cada partida, con mapa, oponente, iteración, ciclos de juego y ganador
+- io: resto de la ejecución java (salida de la JVM y envío de los registros por la
+  tubería o el socket)
+- parse: lectura de los registros y cálculo del fitness en Python
+
+Los tiempos de spawn y de cada partida los emite StreamingResultWriter ("startup_ms" y
+"wall_ms"); con un MicroRTS anterior sin esos campos todo el tiempo de la JVM cuenta como
+partidas sin desglosar.
+
+Formatos: 'json' (Chrome trace, se abre en chrome://tracing o Perfetto; se escribe sin
+el corchete final para poder seguir añadiendo eventos, cosa que ambos admiten) o 'csv'.
+Resumen por generación y por trabajador:
+
+    python tracing.py resultados/GABotsLit_<timestamp>/evaluation-trace-<timestamp>.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import socket
+import threading
+from time import time
+
+import pandas as pd
+
+from inspyred_callables import InspyredCallable
+
+PHASES = ('queue', 'retry', 'spawn', 'game', 'io', 'parse')
+TRACE_FORMATS = ('json', 'csv')
+CSV_COLUMNS = ['generation', 'evaluation', 'worker', 'phase', 'start', 'duration', 'map', 'opponent', 'iteration',
+               'cycles', 'winner']
+
+
+def worker_name():
+    """Proceso (y hilo, si no es el principal) que ejecuta la evaluación: host:pid[/hilo]."""
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    thread = threading.current_thread()
+    return name if thread is threading.main_thread() else f"{name}/{thread.name}"
+
+
+class ExecutionTimer:
+    """
+    Marca los instantes de una ejecución java en el proceso que la lanza.
+
+    Se crea al empezar a atender la tarea; run marca cada intento (con reintentos
+    cuenta el último) y record se llama después de calcular el fitness.
+    """
+
+    def __init__(self):
+        self.created = time()
+        self.started = self.created
+        self.executed = None
+
+    def run(self, execute):
+        """Ejecuta execute() (lanza java y devuelve su salida) marcando el inicio y el final del intento."""
+        self.started = time()
+        output = execute()
+        self.executed = time()
+        return output
+
+    def record(self, parsed):
+        """
+        Desglose de la ejecución.
+
+        Args:
+            parsed: (partidas, resumen) de parse_tournament_output
+
+        Returns:
+            dict: worker, created, start, spawn, io, parse, end (segundos) y games, una
+                  lista [mapa, oponente, iteración, ciclos, ganador, segundos o None] por partida
+        """
+        finished = time()
+        games, summary = parsed
+        executed = self.executed if self.executed is not None else finished
+        elapsed = executed - self.started
+        startup = summary.get('startup_ms') if summary else None
+        spawn = min(elapsed, startup / 1000.0) if startup is not None else 0.0
+        if 'wall_ms' in games:
+            seconds = [wall / 1000.0 for wall in games['wall_ms'].tolist()]
+            simulate = sum(seconds)
+        else:
+            seconds = [None] * len(games['time'])
+            simulate = max(0.0, elapsed - spawn)
+        return {
+            'worker': worker_name(),
+            'created': self.created,
+            'start': self.started,
+            'spawn': spawn,
+            'io': max(0.0, elapsed - spawn - simulate),
+            'parse': finished - executed,
+            'end': finished,
+            'games': [[m, o, it, cycles, winner, s] for m, o, it, cycles, winner, s in
+                      zip(games['map'].tolist(), games['ai2'].tolist(), games['iteration'].tolist(),
+                          games['time'].tolist(), games['winner'].tolist(), seconds)],
+        }
+
+
+def wall_time(timings):
+    """Segundos de reloj desde que empezó la primera ejecución hasta que terminó la última (None sin ejecuciones)."""
+    if not timings:
+        return None
+    return max(timing['end'] for timing in timings) - min(timing['start'] for timing in timings)
+
+
+def timing_rows(timing, submitted):
+    """
+    Filas de la traza de una ejecución (un dict de ExecutionTimer.record).
+
+    Las partidas sin duración propia reparten a partes iguales el tiempo de la JVM.
+    """
+    rows = [('queue', submitted, timing['created'] - submitted, None),
+            ('retry', timing['created'], timing['start'] - timing['created'], None),
+            ('spawn', timing['start'], timing['spawn'], None)]
+    cursor = timing['start'] + timing['spawn']
+    unknown = [game for game in timing['games'] if game[5] is None]
+    if unknown:
+        known = sum(game[5] for game in timing['games'] if game[5] is not None)
+        share = max(0.0, timing['end'] - timing['parse'] - timing['io'] - cursor - known) / len(unknown)
+    for game in timing['games']:
+        duration = game[5] if game[5] is not None else share
+        rows.append(('game', cursor, duration, game[:5]))
+        cursor += duration
+    rows.append(('io', cursor, timing['io'], None))
+    rows.append(('parse', timing['end'] - timing['parse'], timing['parse'], None))
+    return rows
+
+
+class TraceWriter(InspyredCallable):
+    """
+    Escribe la traza de tiempos de un experimento.
+
+    Se registra también como observador de inspyred para saber a qué generación
+    pertenecen las evaluaciones siguientes. Si el fichero ya existe (al reanudar) se
+    sigue añadiendo a él.
+
+    Args:
+        path (str): fichero de la traza
+        trace_format (str): 'json' (Chrome trace) o 'csv'
+    """
+
+    inspyred_name = 'trace_observer'
+
+    def __init__(self, path, trace_format='json'):
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(f"Formato de traza desconocido: {trace_format} (opciones: {TRACE_FORMATS})")
+        self.path = path
+        self.format = trace_format
+        self.generation = 0
+        self.evaluations = 0
+        self.workers = {}
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self._lock = threading.Lock()   # steady-state registra desde los hilos de los futures
+        if os.path.exists(path):
+            self._restore()
+        else:
+            with open(path, 'w', newline='') as f:
+                if trace_format == 'json':
+                    f.write("[\n")
+                else:
+                    csv.writer(f).writerow(CSV_COLUMNS)
+
+    def _restore(self):
+        """Recupera los identificadores de trabajadores y evaluaciones de una traza existente."""
+        if self.format == 'json':
+            for event in _read_events(self.path):
+                if event.get('ph') == 'M':
+                    self.workers[event['args']['name']] = event['pid']
+                elif 'evaluation' in event.get('args', {}):
+                    self.evaluations = max(self.evaluations, event['args']['evaluation'] + 1)
+        else:
+            rows = pd.read_csv(self.path)
+            if len(rows):
+                self.evaluations = int(rows['evaluation'].max()) + 1
+
+    def record(self, candidate, submitted, timings, fitness=None):
+        """
+        Añade a la traza una evaluación.
+
+        Args:
+            candidate: genoma evaluado
+            submitted (float): instante en que el evaluador recibió el lote
+            timings (list): dicts de ExecutionTimer.record (uno por torneo o por partida suelta)
+            fitness: fitness obtenido (solo se anota en la traza json)
+        """
+        with self._lock:
+            evaluation = self.evaluations
+            self.evaluations += 1
+            if self.format == 'json':
+                lines = self._events(candidate, evaluation, submitted, timings, fitness)
+            else:
+                lines = None
+                rows = [[self.generation, evaluation, timing['worker'], phase, round(start, 6), round(duration, 6)] +
+                        (game if game is not None else [''] * 5)
+                        for timing in timings for phase, start, duration, game in timing_rows(timing, submitted)]
+            for timing in timings:
+                for phase, _, duration, _ in timing_rows(timing, submitted):
+                    self.totals[phase] += duration
+            with open(self.path, 'a', newline='') as f:
+                if lines is not None:
+                    f.writelines(lines)
+                else:
+                    csv.writer(f).writerows(rows)
+
+    def _events(self, candidate, evaluation, submitted, timings, fitness):
+        lines = []
+
+        def emit(event):
+            lines.append(json.dumps(event) + ",\n")
+
+        for timing in timings:
+            if timing['worker'] not in self.workers:
+                self.workers[timing['worker']] = len(self.workers) + 1
+                emit({'name': 'process_name', 'ph': 'M', 'pid': self.workers[timing['worker']], 'tid': 0,
+                      'args': {'name': timing['worker']}})
+            pid = self.workers[timing['worker']]
+            rows = timing_rows(timing, submitted)
+            emit({'name': 'evaluation', 'ph': 'X', 'pid': pid, 'tid': 0, 'ts': timing['created'] * 1e6,
+                  'dur': (timing['end'] - timing['created']) * 1e6,
+                  'args': {'generation': self.generation, 'evaluation': evaluation, 'queue': rows[0][2],
+                           'genome': [str(c) for c in candidate],
+                           'fitness': repr(fitness) if fitness is not None else None}})
+            for phase, start, duration, game in rows[1:]:
+                args = {'phase': phase, 'generation': self.generation, 'evaluation': evaluation}
+                name = phase
+                if game is not None:
+                    name = f"map {game[0]} vs {game[1]}"
+                    args.update(zip(CSV_COLUMNS[6:], game))
+                emit({'name': name, 'ph': 'X', 'pid': pid, 'tid': 0, 'ts': start * 1e6, 'dur': duration * 1e6,
+                      'args': args})
+        return lines
+
+    def __call__(self, population, num_generations, num_evaluations, args):
+        # Las evaluaciones que vienen a continuación son las de la generación siguiente
+        self.generation = num_generations + 1
+
+    def stats(self):
+        """Evaluaciones trazadas y segundos acumulados por fase."""
+        with self._lock:
+            return {'evaluations': self.evaluations, **self.totals}
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+def _read_events(path):
+    with open(path) as f:
+        text = f.read().strip()
+    if not text.endswith(']'):
+        text = text.rstrip(',') + ']'
+    return json.loads(text)
+
+
+def load_trace(path):
+    """
+    Lee una traza (json o csv) como un DataFrame con las columnas de CSV_COLUMNS.
+
+    De la traza json la cola de cada ejecución sale del evento 'evaluation' y los
+    nombres de los trabajadores de los eventos de metadatos.
+    """
+    if not path.endswith('.json'):
+        return pd.read_csv(path)
+    events = _read_events(path)
+    names = {event['pid']: event['args']['name'] for event in events if event.get('ph') == 'M'}
+    rows = []
+    for event in events:
+        if event.get('ph') != 'X':
+            continue
+        args = event['args']
+        worker = names.get(event['pid'], str(event['pid']))
+        if event['name'] == 'evaluation':
+            rows.append({'generation': args['generation'], 'evaluation': args['evaluation'], 'worker': worker,
+                         'phase': 'queue', 'start': event['ts'] / 1e6 - args['queue'], 'duration': args['queue']})
+        else:
+            rows.append({'generation': args['generation'], 'evaluation': args['evaluation'], 'worker': worker,
+                         'phase': args['phase'], 'start': event['ts'] / 1e6, 'duration': event['dur'] / 1e6,
+                         **{column: args.get(column) for column in CSV_COLUMNS[6:]}})
+    return pd.DataFrame(rows, columns=CSV_COLUMNS)
+
+
+def summarize_trace(trace):
+    """
+    Reparto del tiempo de reloj por generación y por trabajador.
+
+    Args:
+        trace (pd.DataFrame): traza de load_trace
+
+    Returns:
+        tuple: (DataFrame por generación, DataFrame por trabajador) con segundos por fase;
+               por generación también el tiempo de reloj, las evaluaciones y la espera media
+               en cola (la cola se solapa con el trabajo de otras ejecuciones, así que no se
+               suma), y por trabajador el tiempo ocupado y su ocupación sobre el total
+    """
+    trace = trace.assign(end=trace['start'] + trace['duration'])
+    busy = trace[trace['phase'] != 'queue']
+    queue = trace[trace['phase'] == 'queue']
+    by_phase = busy.pivot_table(index='generation', columns='phase', values='duration', aggfunc='sum', fill_value=0.0)
+    generations = pd.DataFrame({
+        'evaluations': trace.groupby('generation')['evaluation'].nunique(),
+        'wall': trace.groupby('generation')['end'].max() - trace.groupby('generation')['start'].min(),
+        'queue_mean': queue.groupby('generation')['duration'].mean(),
+    }).join(by_phase.reindex(columns=PHASES[1:], fill_value=0.0))
+
+    workers = busy.pivot_table(index='worker', columns='phase', values='duration', aggfunc='sum', fill_value=0.0)
+    workers = workers.reindex(columns=PHASES[1:], fill_value=0.0)
+    workers.insert(0, 'busy', workers.sum(axis=1))
+    workers.insert(0, 'executions', busy[busy['phase'] == 'spawn'].groupby('worker').size())
+    total = trace['end'].max() - trace['start'].min()
+    workers['utilization'] = workers['busy'] / total if total > 0 else 0.0
+    return generations, workers
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resumen de una traza de tiempos de evaluación")
+    parser.add_argument('trace', help="fichero evaluation-trace-*.json o .csv")
+    options = parser.parse_args()
+
+    generations, workers = summarize_trace(load_trace(options.trace))
+    with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 200,
+                           'display.float_format', '{:.2f}'.format):
+        print("Segundos por generación")
+        print(generations)
+        print()
+        print("Segundos por trabajador")
+        print(workers)
+        totals = generations[list(PHASES[1:])].sum()
+        print()
+        print("Reparto del tiempo ocupado: " + ", ".join(f"{phase} {100 * seconds / totals.sum():.1f}%"
+                                                         for phase, seconds in totals.items()))
@@ -15,6 +15,7 @@ import fitness_generaciones as fg
 def find_statistics_files(base_dir='../resultados', folder_prefix='GABotsLit'):
     """
     Busca todos los archivos inspyred-statistics-file-*.csv en carpetas que coincidan con el prefijo.
+    Si la carpeta tiene un registro binario (results-log-*.bin) se usa ese en su lugar.
     
     Args:
         base_dir: Directorio base donde buscar
@@ -36,8 +37,10 @@ def find_statistics_files(base_dir='../resultados', folder_prefix='GABotsLit'):
     for folder in matching_folders:
         if os.path.isdir(folder):
             # Buscar archivos de estadísticas dentro de la carpeta
-            stats_pattern = os.path.join(folder, 'inspyred-statistics-file-*.csv')
-            stats_files = glob.glob(stats_pattern)
+            stats_files = glob.glob(os.path.join(folder, 'results-log-*.bin'))
+            if not stats_files:
+                stats_pattern = os.path.join(folder, 'inspyred-statistics-file-*.csv')
+                stats_files = glob.glob(stats_pattern)
             
             for stats_file in stats_files:
                 folder_name = os.path.basename(folder)
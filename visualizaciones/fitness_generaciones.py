@@ -5,6 +5,9 @@ Muestra en una misma gráfica: min, max, mediana, media y desviación típica.
 
 El fitness se calcula como: número de victorias + 0.5 * número de empates
 Los tiempos medios (para ganar/perder) se ignoran en esta visualización.
+
+Acepta un inspyred-statistics-file-*.csv o un results-log-*.bin (ver results_log.py), del
+que las estadísticas se calculan directamente sobre los registros mapeados en memoria.
 """
 
 import pandas as pd
@@ -17,6 +20,9 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from results_log import generation_statistics, read_results_log
+
 # Configuración de estilo
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
@@ -86,15 +92,31 @@ def parse_tuple_column(tuple_str):
     except:
         return [np.nan, np.nan, np.nan]
 
+def load_results_log(file_path):
+    """
+    Carga las estadísticas por generación de un registro binario de resultados (results-log-*.bin).
+    
+    Las columnas son las mismas que las de load_statistics_data; los fitness lexicográficos
+    se reducen a las victorias, como con parse_tuples.
+    """
+    df = generation_statistics(read_results_log(file_path))
+    df['worst_lexical_fitness'] = df['worst_victories_fitness']
+    df['best_lexical_fitness'] = df['best_victories_fitness']
+    return df
+
 def load_statistics_data(file_path, parse_tuples=False):
     """
     Carga y procesa los datos de estadísticas del algoritmo genético.
     
     Args:
-        file_path: Ruta al archivo CSV de estadísticas
+        file_path: Ruta al archivo CSV de estadísticas (o a un results-log-*.bin)
         parse_tuples: Si True, parsea las columnas como tuplas (para datos lexicográficos).
                      Si False, trata las columnas como valores numéricos simples.
+                     Se ignora con un registro binario.
     """
+    if file_path.endswith('.bin'):
+        return load_results_log(file_path)
+
     # Definir nombres de columnas basados en la estructura observada
     column_names = [
         'generation',
@@ -368,6 +390,7 @@ def main(file_path=None, parse_tuples=False):
             print(f"  python {sys.argv[0]} <ruta_al_archivo_csv> [--no-tuples]")
             print("\nEjemplo:")
             print(f"  python {sys.argv[0]} /ruta/a/inspyred-statistics-file-20241024-123456.csv")
+            print(f"  python {sys.argv[0]} /ruta/a/results-log-10242024-123456.bin  # Registro binario")
             print(f"  python {sys.argv[0]} /ruta/a/stats.csv --no-tuples  # Para datos numéricos simples")
             return
         file_path = sys.argv[1]
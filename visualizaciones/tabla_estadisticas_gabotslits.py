@@ -14,8 +14,12 @@ import re
 import glob
 import pandas as pd
 import numpy as np
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from results_log import generation_statistics, read_results_log
+
 def parse_stats_file(filepath):
     """
     Extrae información del archivo stats_ga_*.txt
@@ -47,6 +51,16 @@ def parse_stats_file(filepath):
     
     return seed, tiempo, evals, pop_size, mp_nprocs, fitness_mejor
 
+def parse_results_log(filepath):
+    """
+    Extrae información del registro binario results-log-*.bin (ver results_log.py)
+    Retorna: media y std de los mejores fitness de todas las generaciones
+    """
+    best_fitness_per_gen = generation_statistics(read_results_log(filepath))['best_victories_fitness']
+    if len(best_fitness_per_gen) == 0:
+        return None, None
+    return np.mean(best_fitness_per_gen), np.std(best_fitness_per_gen)
+
 def parse_statistics_csv(filepath):
     """
     Extrae información del archivo inspyred-statistics-file-*.csv
@@ -129,6 +143,7 @@ def analyze_gabotslit_runs():
         # Buscar archivos relevantes
         stats_file = glob.glob(os.path.join(dir_path, 'stats_ga_*.txt'))
         csv_stats_file = glob.glob(os.path.join(dir_path, 'inspyred-statistics-file-*.csv'))
+        results_log_file = glob.glob(os.path.join(dir_path, 'results-log-*.bin'))
         final_pop_file = glob.glob(os.path.join(dir_path, 'Final_population_*.csv'))
         
         if not stats_file:
@@ -139,8 +154,11 @@ def analyze_gabotslit_runs():
         seed, tiempo, evals, pop_size, mp_nprocs, fitness_mejor_stats = parse_stats_file(stats_file[0])
         
         # Parsear statistics CSV si existe (media y std de mejores individuos por generación)
+        # (el registro binario, si existe, tiene la población completa de cada generación)
         mean_best_gen, std_best_gen = None, None
-        if csv_stats_file:
+        if results_log_file:
+            mean_best_gen, std_best_gen = parse_results_log(results_log_file[0])
+        elif csv_stats_file:
             mean_best_gen, std_best_gen = parse_statistics_csv(csv_stats_file[0])
         
         # Parsear población final si existe
@@ -0,0 +1,179 @@
+"""
+Pool de procesos reutilizable con reparto ordenado por coste.
+
+El Pool vive durante todo el experimento (no se crea uno por generación) y reparte
+las tareas con imap_unordered empezando por las que se espera que tarden más, de
+modo que las más largas no queden para el final y dejen a los demás procesos
+ociosos. El coste esperado de cada enfrentamiento lo da MatchCostModel a partir del
+tamaño de los mapas y de la duración de los enfrentamientos anteriores de cada genoma.
+"""
+
+import csv
+import os
+import re
+from collections import defaultdict
+from multiprocessing import Pool
+from time import time
+
+from fitness_cache import canonical_genome
+
+DEFAULT_MAP_AREA = 64 * 64
+
+
+def map_area(path):
+    """
+    Número de casillas de un mapa de MicroRTS.
+
+    Se lee del XML del mapa si está disponible; si no, del nombre (``16x16``) y, en
+    último caso, se usa DEFAULT_MAP_AREA.
+    """
+    if os.path.exists(path):
+        with open(path) as f:
+            header = f.read(2048)
+        width = re.search(r'width="(\d+)"', header)
+        height = re.search(r'height="(\d+)"', header)
+        if width and height:
+            return int(width.group(1)) * int(height.group(1))
+    size = re.search(r'(\d+)x(\d+)', os.path.basename(path))
+    if size:
+        return int(size.group(1)) * int(size.group(2))
+    return DEFAULT_MAP_AREA
+
+
+class MatchCostModel:
+    """
+    Estimación de la duración de un enfrentamiento.
+
+    A priori la duración es proporcional al área total de los mapas que se juegan; con
+    cada enfrentamiento terminado se actualiza una media móvil exponencial de la
+    duración de los enfrentamientos de cada genoma, y la estimación de una pareja es
+    la media de las de sus dos genomas.
+
+    Args:
+        maps (list): mapas que se juegan en cada enfrentamiento
+        games_per_map (int): partidas por mapa en cada enfrentamiento
+        alpha (float): peso de la última duración en la media móvil
+    """
+
+    def __init__(self, maps, games_per_map=1, alpha=0.3):
+        self.prior_cells = sum(map_area(m) for m in maps) * games_per_map
+        self.alpha = alpha
+        self.seconds_per_cell = None
+        self.genome_cost = {}
+
+    def prior(self):
+        if self.seconds_per_cell is None:
+            return float(self.prior_cells)
+        return self.prior_cells * self.seconds_per_cell
+
+    def estimate(self, agent_i, agent_j):
+        """Duración esperada (en segundos, o en casillas mientras no haya datos) de agent_i contra agent_j."""
+        prior = self.prior()
+        cost_i = self.genome_cost.get(canonical_genome(agent_i), prior)
+        cost_j = self.genome_cost.get(canonical_genome(agent_j), prior)
+        return (cost_i + cost_j) / 2
+
+    def update(self, agent_i, agent_j, duration):
+        """Registra la duración real de un enfrentamiento."""
+        rate = duration / self.prior_cells if self.prior_cells else duration
+        if self.seconds_per_cell is None:
+            self.seconds_per_cell = rate
+        else:
+            self.seconds_per_cell += self.alpha * (rate - self.seconds_per_cell)
+        for agent in (agent_i, agent_j):
+            genome = canonical_genome(agent)
+            previous = self.genome_cost.get(genome)
+            self.genome_cost[genome] = duration if previous is None else previous + self.alpha * (duration - previous)
+
+    def retain(self, agents):
+        """Olvida los genomas que ya no están en la población."""
+        alive = {canonical_genome(agent) for agent in agents}
+        self.genome_cost = {genome: cost for genome, cost in self.genome_cost.items() if genome in alive}
+
+
+def _timed_call(payload):
+    index, function, task = payload
+    start = time()
+    result = function(task)
+    return index, result, os.getpid(), time() - start
+
+
+class WorkerPool:
+    """
+    multiprocessing.Pool compartido por todas las generaciones.
+
+    Args:
+        processes (int): número de procesos
+        log_path (str): CSV donde se añade, por cada llamada a map, el tiempo ocupado y
+            ocioso de cada proceso (None para no registrarlo)
+    """
+
+    def __init__(self, processes, log_path=None):
+        self.processes = processes
+        self.pool = Pool(processes=processes)
+        self.log_path = log_path
+        self.calls = 0
+        self.wall_time = 0.0
+        self.busy_time = defaultdict(float)
+        self.tasks_done = defaultdict(int)
+        if log_path is not None:
+            with open(log_path, 'w', newline='') as f:
+                csv.writer(f).writerow(['call', 'worker', 'tasks', 'busy', 'idle'])
+
+    def map(self, function, tasks, costs=None):
+        """
+        Ejecuta function sobre cada tarea, las de mayor coste primero.
+
+        Args:
+            function: función de nivel de módulo (se envía a los procesos)
+            tasks (list): argumentos de cada llamada
+            costs (list): coste esperado de cada tarea (None mantiene el orden)
+
+        Returns:
+            tuple: (resultados en el orden de tasks, duración en segundos de cada tarea)
+        """
+        order = list(range(len(tasks)))
+        if costs is not None:
+            order.sort(key=lambda idx: costs[idx], reverse=True)
+
+        results = [None] * len(tasks)
+        durations = [0.0] * len(tasks)
+        call_busy = defaultdict(float)
+        call_tasks = defaultdict(int)
+        start = time()
+        for idx, result, worker, duration in self.pool.imap_unordered(
+                _timed_call, [(idx, function, tasks[idx]) for idx in order]):
+            results[idx] = result
+            durations[idx] = duration
+            call_busy[worker] += duration
+            call_tasks[worker] += 1
+        wall = time() - start
+
+        self.calls += 1
+        self.wall_time += wall
+        for worker, busy in call_busy.items():
+            self.busy_time[worker] += busy
+            self.tasks_done[worker] += call_tasks[worker]
+        if self.log_path is not None:
+            with open(self.log_path, 'a', newline='') as f:
+                writer = csv.writer(f)
+                for worker in sorted(call_busy):
+                    writer.writerow([self.calls, worker, call_tasks[worker],
+                                     round(call_busy[worker], 3), round(max(wall - call_busy[worker], 0.0), 3)])
+
+        return results, durations
+
+    def stats(self):
+        """Tiempo total ocupado y ocioso de los procesos y utilización del pool."""
+        busy = sum(self.busy_time.values())
+        capacity = self.wall_time * self.processes
+        return {
+            'calls': self.calls,
+            'busy': busy,
+            'idle': max(capacity - busy, 0.0),
+            'utilization': busy / capacity if capacity else 0.0,
+        }
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()